@@ -0,0 +1,14 @@
+"""End-to-end benchmarks of the orchestration workflow.
+
+Each benchmark generates a synthetic repository of a given size, runs the
+full graph against it with a fake chat model and fake Scaffold, Repomix and
+Harness MCP servers, and records per-phase timings and throughput, token
+counts, checkpoint size and peak RSS.
+
+Run from the repository root::
+
+    python -m benchmarks.run --files 1000 10000 --output bench-results.json
+    python -m benchmarks.run --files 1000 10000 --baseline previous.json
+
+See :mod:`benchmarks.run` for the options.
+"""
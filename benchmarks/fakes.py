@@ -0,0 +1,199 @@
+"""Fake chat model and MCP servers for the benchmarks.
+
+The fakes stand in for the Anthropic API and the Scaffold, Repomix and
+Harness MCP servers so a benchmark measures the orchestrator itself. The
+repository tools really walk and read the synthetic repository, as the MCP
+servers would, so scanning cost grows with the repository; Harness calls
+answer immediately with a successful execution.
+"""
+
+import functools
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+
+from orchestrator.metrics import record_mcp_call
+
+# Directories of vendored dependencies, skipped like the real MCP servers do
+VENDORED_DIRS = frozenset({".git", "node_modules", "vendor", ".venv", "target"})
+
+MANIFESTS = frozenset({"requirements.txt", "package.json", "go.mod", "pom.xml"})
+
+# Upper bounds on tool output, mirroring the servers' response limits
+MAX_LISTED_PATHS = 2000
+MAX_PACKED_BYTES = 256 * 1024
+
+# Characters per token used for the fake usage figures
+CHARS_PER_TOKEN = 4
+
+
+def scan_repository(repo_path: str) -> dict[str, Any]:
+    """Walk a repository and classify the files worth analysing.
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        File counts per category and the first listed paths
+    """
+    counts = {"files": 0, "vendored_dirs": 0, "manifests": 0, "dockerfiles": 0, "kubernetes": 0}
+    paths: list[str] = []
+    for directory, subdirs, files in os.walk(repo_path):
+        vendored = [name for name in subdirs if name in VENDORED_DIRS]
+        counts["vendored_dirs"] += len(vendored)
+        subdirs[:] = [name for name in subdirs if name not in VENDORED_DIRS]
+        for name in files:
+            path = os.path.join(directory, name)
+            counts["files"] += 1
+            if len(paths) < MAX_LISTED_PATHS:
+                paths.append(os.path.relpath(path, repo_path))
+            if name in MANIFESTS:
+                counts["manifests"] += 1
+            elif name == "Dockerfile":
+                counts["dockerfiles"] += 1
+            elif name.endswith((".yaml", ".yml")):
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    if "apiVersion:" in f.read(4096):
+                        counts["kubernetes"] += 1
+    return {"counts": counts, "paths": paths}
+
+
+def pack_repository(repo_path: str) -> str:
+    """Concatenate the repository's build files, up to the packing limit."""
+    parts: list[str] = []
+    size = 0
+    for directory, subdirs, files in os.walk(repo_path):
+        subdirs[:] = [name for name in subdirs if name not in VENDORED_DIRS]
+        for name in files:
+            if name not in MANIFESTS and name != "Dockerfile":
+                continue
+            path = os.path.join(directory, name)
+            content = Path(path).read_text(encoding="utf-8", errors="replace")
+            parts.append(f"=== {os.path.relpath(path, repo_path)} ===\n{content}")
+            size += len(content)
+            if size >= MAX_PACKED_BYTES:
+                return "\n".join(parts)
+    return "\n".join(parts)
+
+
+def _mcp_tool(func: Callable[..., str]) -> StructuredTool:
+    """Build a tool whose calls are accounted like pooled MCP calls."""
+
+    @functools.wraps(func)
+    def call(*args: Any, **kwargs: Any) -> str:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_mcp_call(time.perf_counter() - started)
+
+    return StructuredTool.from_function(call)
+
+
+def _harness_tools() -> list[StructuredTool]:
+    def execute_pipeline(
+        org_id: str, project_id: str, pipeline_id: str, environment: str
+    ) -> str:
+        """Execute a pipeline."""
+        return json.dumps(
+            {
+                "execution_id": f"exec_{environment}_{uuid.uuid4().hex[:8]}",
+                "status": "Success",
+                "stages_completed": ["build", "test", "deploy"],
+                "artifacts": [f"docker_image:{pipeline_id}"],
+            }
+        )
+
+    def get_execution(org_id: str, project_id: str, execution_id: str) -> str:
+        """Get an execution's status."""
+        return json.dumps({"execution_id": execution_id, "status": "Success"})
+
+    def abort_execution(org_id: str, project_id: str, execution_id: str) -> str:
+        """Abort an execution."""
+        return json.dumps({"execution_id": execution_id, "status": "Aborted"})
+
+    return [
+        _mcp_tool(execute_pipeline),
+        _mcp_tool(get_execution),
+        _mcp_tool(abort_execution),
+    ]
+
+
+def fake_mcp_tools(repo_path: str) -> dict[str, list[StructuredTool]]:
+    """Build the fake MCP tools for one repository, keyed by server name."""
+
+    def get_repository_structure() -> str:
+        """Get the repository structure and file listing."""
+        return json.dumps(scan_repository(repo_path))
+
+    def pack_repository_content() -> str:
+        """Get the combined build files of the repository."""
+        return pack_repository(repo_path)
+
+    return {
+        "scaffold": [_mcp_tool(get_repository_structure)],
+        "repomix": [_mcp_tool(pack_repository_content)],
+        "github": [],
+        "harness": _harness_tools(),
+    }
+
+
+class BenchmarkChatModel(BaseChatModel):
+    """Chat model stand-in with the ``ChatAnthropic`` constructor signature.
+
+    When tools are bound and the conversation has no tool results yet, it
+    calls every bound tool once; otherwise it answers with a summary of the
+    tool results. Responses carry usage metadata estimated from the prompt
+    size, so token and cost metrics are exercised.
+    """
+
+    model: str = "claude-sonnet-4-5-20250929"
+    temperature: float = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "benchmark-chat-model"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> Any:
+        return self.bind(tools=[tool.name for tool in tools], **kwargs)
+
+    def _generate(
+        self,
+        messages: list[Any],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        tools: Optional[list[str]] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tool_results = [m for m in messages if isinstance(m, ToolMessage)]
+        if tools and not tool_results:
+            content = ""
+            tool_calls = [
+                {"name": name, "args": {}, "id": f"call_{index}"} for index, name in enumerate(tools)
+            ]
+        else:
+            content = "Analysis summary\n" + "\n".join(
+                f"- {m.name}: {m.content[:200]}" for m in tool_results
+            )
+            tool_calls = []
+
+        input_tokens = sum(len(str(m.content)) for m in messages) // CHARS_PER_TOKEN
+        output_tokens = max(len(content) // CHARS_PER_TOKEN, 1)
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
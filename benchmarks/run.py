@@ -0,0 +1,268 @@
+"""Run the end-to-end benchmarks and compare them with a baseline.
+
+Every repository size runs in a fresh interpreter so peak RSS is measured
+per size. Results are written as JSON; with ``--baseline`` the run fails
+when a size got slower or bigger than the baseline by more than the
+tolerance, so CI can keep the previous results as an artifact and compare.
+
+Usage::
+
+    python -m benchmarks.run                       # 1k and 10k files
+    python -m benchmarks.run --files 100000 1000000 --output large.json
+    python -m benchmarks.run --baseline main.json --tolerance 0.25
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from .synthetic import generate_repository
+
+DEFAULT_SIZES = [1_000, 10_000]
+
+# Changes below these floors are treated as noise, whatever the tolerance
+MIN_REGRESSION_SECONDS = 0.05
+MIN_REGRESSION_BYTES = 1024 * 1024
+
+
+def _install_fakes(repo_path: str) -> None:
+    """Route the chat model and MCP tools of this process to the benchmark fakes.
+
+    Must run before the node modules are imported (the graph imports them on
+    first use).
+    """
+    import langchain_anthropic
+
+    from orchestrator import tools
+    from orchestrator.tools import mcp_registry
+
+    from .fakes import BenchmarkChatModel, fake_mcp_tools
+
+    servers = fake_mcp_tools(repo_path)
+
+    def get_mcp_tools(server_names: list[str], cache_scope: Optional[str] = None) -> list[Any]:
+        return [tool for name in server_names for tool in servers[name]]
+
+    langchain_anthropic.ChatAnthropic = BenchmarkChatModel
+    mcp_registry.get_mcp_tools = get_mcp_tools
+    tools.get_mcp_tools = get_mcp_tools
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_size(file_count: int, workdir: Path, seed: int = 0) -> dict[str, Any]:
+    """Generate a repository and run the workflow on it in this process.
+
+    Args:
+        file_count: Repository size in files
+        workdir: Scratch directory for the repository, cache and checkpoints
+        seed: Repository generation seed
+
+    Returns:
+        Benchmark result for the size
+    """
+    os.environ["ORCHESTRATOR_CACHE_DIR"] = str(workdir / "cache")
+    os.environ["ORCHESTRATOR_MEMOIZE"] = "0"
+    os.environ.pop("ORCHESTRATOR_REPLAY_MODE", None)
+
+    started = time.perf_counter()
+    repo_path = str(generate_repository(workdir / "repo", file_count, seed))
+    generate_seconds = time.perf_counter() - started
+
+    _install_fakes(repo_path)
+
+    from orchestrator.checkpoint import open_checkpointer
+    from orchestrator.graph import build_graph
+    from orchestrator.state import create_initial_state
+
+    database = workdir / "checkpoints.sqlite"
+    checkpointer = open_checkpointer(str(database))
+    workflow_id = str(uuid.uuid4())
+    try:
+        graph = build_graph(checkpointer)
+        config = {"configurable": {"thread_id": workflow_id}}
+        started = time.perf_counter()
+        final = graph.invoke(
+            create_initial_state(repo_path, "bench", "bench", workflow_id=workflow_id), config
+        )
+        if graph.get_state(config).next:
+            # Approve the generated templates, as `resume --approve` does
+            graph.update_state(config, {"hitl_approved": True})
+            final = graph.invoke(None, config)
+        workflow_seconds = time.perf_counter() - started
+    finally:
+        checkpointer.close()
+
+    phases = {}
+    for node, metrics in final.get("metrics", {}).items():
+        wall_seconds = metrics.get("wall_seconds", 0.0)
+        phases[node] = {
+            "wall_seconds": round(wall_seconds, 6),
+            "cpu_seconds": round(metrics.get("cpu_seconds", 0.0), 6),
+            "files_per_second": round(file_count / wall_seconds, 1) if wall_seconds else None,
+            "llm_calls": metrics.get("llm_calls", 0),
+            "input_tokens": metrics.get("input_tokens", 0),
+            "output_tokens": metrics.get("output_tokens", 0),
+            "mcp_calls": metrics.get("mcp_calls", 0),
+        }
+
+    return {
+        "files": file_count,
+        "seed": seed,
+        "status": final.get("current_phase"),
+        "errors": list(final.get("errors") or []),
+        "generate_seconds": round(generate_seconds, 3),
+        "workflow_seconds": round(workflow_seconds, 6),
+        "files_per_second": round(file_count / workflow_seconds, 1),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "checkpoint_bytes": sum(
+            path.stat().st_size for path in workdir.glob("checkpoints.sqlite*")
+        ),
+        "phases": phases,
+    }
+
+
+def run_isolated(file_count: int, seed: int = 0, workdir: Optional[Path] = None) -> dict[str, Any]:
+    """Run one size in a fresh interpreter.
+
+    Args:
+        file_count: Repository size in files
+        seed: Repository generation seed
+        workdir: Scratch directory (a temporary directory, removed afterwards, if None)
+
+    Returns:
+        Benchmark result for the size
+    """
+    with tempfile.TemporaryDirectory(prefix="orchestrator-bench-") as scratch:
+        workdir = workdir or Path(scratch)
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+        completed = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.run",
+                "--single", str(file_count), "--seed", str(seed), "--workdir", str(workdir),
+            ],
+            cwd=Path(__file__).resolve().parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Benchmark for {file_count} files failed:\n{completed.stderr.strip()}"
+        )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float
+) -> list[str]:
+    """Find regressions against a baseline run.
+
+    Args:
+        results: Results of this run
+        baseline: Results of the baseline run
+        tolerance: Allowed relative increase (e.g. 0.25 for 25%)
+
+    Returns:
+        One description per regression; sizes missing from either run are ignored
+    """
+    previous = {result["files"]: result for result in baseline}
+    regressions = []
+
+    def check(label: str, old: Optional[float], new: Optional[float], floor: float) -> None:
+        if old is None or new is None:
+            return
+        if new > old * (1 + tolerance) and new - old > floor:
+            regressions.append(f"{label}: {old:g} -> {new:g} (+{(new - old) / old:.0%})")
+
+    for result in results:
+        old = previous.get(result["files"])
+        if old is None:
+            continue
+        size = f"{result['files']} files"
+        check(f"{size} workflow_seconds", old["workflow_seconds"], result["workflow_seconds"], MIN_REGRESSION_SECONDS)
+        check(f"{size} peak_rss_bytes", old["peak_rss_bytes"], result["peak_rss_bytes"], MIN_REGRESSION_BYTES)
+        check(f"{size} checkpoint_bytes", old["checkpoint_bytes"], result["checkpoint_bytes"], MIN_REGRESSION_BYTES)
+        for node, phase in result["phases"].items():
+            old_phase = old["phases"].get(node, {})
+            check(
+                f"{size} {node} wall_seconds",
+                old_phase.get("wall_seconds"),
+                phase["wall_seconds"],
+                MIN_REGRESSION_SECONDS,
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=DEFAULT_SIZES, help="Repository sizes")
+    parser.add_argument("--seed", type=int, default=0, help="Repository generation seed")
+    parser.add_argument("--output", default="bench-results.json", help="Results file")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        # Child process: run one size and print its result
+        print(json.dumps(run_size(args.single, Path(args.workdir), args.seed)))
+        return 0
+
+    results = []
+    for file_count in args.files:
+        result = run_isolated(file_count, args.seed)
+        results.append(result)
+        print(
+            f"{file_count:>9} files  {result['workflow_seconds']:8.2f}s  "
+            f"{result['files_per_second']:>10.0f} files/s  "
+            f"peak RSS {result['peak_rss_bytes'] / 2**20:7.1f} MiB  {result['status']}",
+            file=sys.stderr,
+        )
+
+    Path(args.output).write_text(
+        json.dumps(
+            {
+                "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    failed = [r for r in results if r["status"] != "complete"]
+    for result in failed:
+        print(f"{result['files']} files: workflow ended in {result['status']}: {result['errors']}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""Synthetic repositories for the benchmarks.
+
+Repositories are monorepos of services in several languages. Each service
+has a Dockerfile, a package manifest, Kubernetes manifests, sources, tests
+and a vendored dependency directory, so scanning sees a realistic mix of
+files worth reading and directories that should be skipped.
+"""
+
+import itertools
+import random
+import subprocess
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+# Files per service before its vendored dependencies
+SOURCES_PER_SERVICE = 12
+TESTS_PER_SERVICE = 2
+VENDORED_PER_SERVICE = 12
+
+
+class Language(NamedTuple):
+    name: str
+    extension: str
+    manifest: str
+    vendor_dir: str
+    base_image: str
+
+
+LANGUAGES = [
+    Language("python", "py", "requirements.txt", ".venv/lib/python3.12/site-packages", "python:3.12-slim"),
+    Language("node", "js", "package.json", "node_modules", "node:20-alpine"),
+    Language("go", "go", "go.mod", "vendor/github.com", "golang:1.22"),
+    Language("java", "java", "pom.xml", "target/dependency", "eclipse-temurin:21"),
+]
+
+ROOT_FILES = {
+    "README.md": "# Synthetic monorepo\n\nGenerated for orchestrator benchmarks.\n",
+    ".gitignore": "node_modules/\n.venv/\ntarget/\n",
+    "docker-compose.yml": "services:\n  gateway:\n    build: services/python-00000\n    ports: ['8080:8080']\n",
+    ".github/workflows/ci.yml": (
+        "name: ci\non: [push]\njobs:\n  build:\n    runs-on: ubuntu-latest\n"
+        "    steps:\n      - uses: actions/checkout@v4\n      - run: make test\n"
+    ),
+}
+
+
+def _manifest(language: Language, service: str, rng: random.Random) -> str:
+    dependencies = [f"dep-{rng.randrange(500):03d}" for _ in range(rng.randint(3, 15))]
+    if language.manifest == "package.json":
+        deps = ",\n".join(f'    "{dep}": "^1.{rng.randrange(20)}.0"' for dep in dependencies)
+        return f'{{\n  "name": "{service}",\n  "scripts": {{"test": "jest"}},\n  "dependencies": {{\n{deps}\n  }}\n}}\n'
+    if language.manifest == "go.mod":
+        deps = "\n".join(f"\texample.com/{dep} v1.{rng.randrange(20)}.0" for dep in dependencies)
+        return f"module example.com/{service}\n\ngo 1.22\n\nrequire (\n{deps}\n)\n"
+    if language.manifest == "pom.xml":
+        deps = "\n".join(
+            f"    <dependency><groupId>com.example</groupId><artifactId>{dep}</artifactId></dependency>"
+            for dep in dependencies
+        )
+        return f"<project>\n  <artifactId>{service}</artifactId>\n  <dependencies>\n{deps}\n  </dependencies>\n</project>\n"
+    return "".join(f"{dep}=={rng.randrange(5)}.{rng.randrange(20)}.0\n" for dep in dependencies)
+
+
+def _dockerfile(language: Language, service: str) -> str:
+    return (
+        f"FROM {language.base_image}\nWORKDIR /app\nCOPY {language.manifest} .\n"
+        f"COPY . .\nEXPOSE 8080\nCMD [\"./run\", \"{service}\"]\n"
+    )
+
+
+def _kubernetes(kind: str, service: str, rng: random.Random) -> str:
+    if kind == "Service":
+        spec = f"  selector:\n    app: {service}\n  ports:\n    - port: 80\n      targetPort: 8080\n"
+    else:
+        spec = (
+            f"  replicas: {rng.randint(1, 5)}\n  selector:\n    matchLabels:\n      app: {service}\n"
+            f"  template:\n    spec:\n      containers:\n        - name: {service}\n"
+            f"          image: registry.example.com/{service}:latest\n"
+        )
+    api_version = "v1" if kind == "Service" else "apps/v1"
+    return f"apiVersion: {api_version}\nkind: {kind}\nmetadata:\n  name: {service}\nspec:\n{spec}"
+
+
+def _source(language: Language, index: int, rng: random.Random) -> str:
+    lines = [f"// {language.name} module {index}"] + [
+        f"value_{line} = compute({rng.randrange(10_000)})" for line in range(rng.randint(5, 60))
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _service_files(service_index: int, rng: random.Random) -> Iterator[tuple[str, str]]:
+    language = LANGUAGES[service_index % len(LANGUAGES)]
+    service = f"{language.name}-{service_index:05d}"
+    base = f"services/{service}"
+
+    yield f"{base}/Dockerfile", _dockerfile(language, service)
+    yield f"{base}/{language.manifest}", _manifest(language, service, rng)
+    yield f"{base}/k8s/deployment.yaml", _kubernetes("Deployment", service, rng)
+    yield f"{base}/k8s/service.yaml", _kubernetes("Service", service, rng)
+    for index in range(SOURCES_PER_SERVICE):
+        yield f"{base}/src/module_{index}.{language.extension}", _source(language, index, rng)
+    for index in range(TESTS_PER_SERVICE):
+        yield f"{base}/tests/test_module_{index}.{language.extension}", _source(language, index, rng)
+    for index in range(VENDORED_PER_SERVICE):
+        package = f"dep-{rng.randrange(500):03d}"
+        yield (
+            f"{base}/{language.vendor_dir}/{package}/file_{index}.{language.extension}",
+            _source(language, index, rng),
+        )
+
+
+def synthetic_files(file_count: int, seed: int = 0) -> Iterator[tuple[str, str]]:
+    """Generate the files of a synthetic repository.
+
+    Args:
+        file_count: Number of files
+        seed: Random seed; the same seed always yields the same repository
+
+    Yields:
+        Relative path and content of each file
+    """
+    rng = random.Random(seed)
+    root_files = list(ROOT_FILES.items())[:file_count]
+    yield from root_files
+    services = itertools.chain.from_iterable(
+        _service_files(index, rng) for index in itertools.count()
+    )
+    yield from itertools.islice(services, file_count - len(root_files))
+
+
+def generate_repository(root: Path, file_count: int, seed: int = 0, git: bool = True) -> Path:
+    """Write a synthetic repository to disk.
+
+    Args:
+        root: Directory to create the repository in
+        file_count: Number of files
+        seed: Random seed
+        git: Commit the files to a new git repository, as a real checkout would be
+
+    Returns:
+        Repository root
+    """
+    created: set[Path] = set()
+    for relative, content in synthetic_files(file_count, seed):
+        path = root / relative
+        if path.parent not in created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            created.add(path.parent)
+        path.write_text(content, encoding="utf-8")
+
+    if git:
+        def run(*args: str) -> None:
+            subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+        run("init", "-q")
+        # Vendored directories are checked in, as in repositories that vendor dependencies
+        run("add", "-A", "-f")
+        run(
+            "-c", "user.name=bench", "-c", "user.email=bench@example.com",
+            "commit", "-q", "-m", "Synthetic repository",
+        )
+    return root
@@ -4,26 +4,49 @@ This package provides a LangGraph-based orchestration system for
 automated repository analysis and Harness CI/CD setup.
 
 The workflow can be visualized and debugged in LangGraph Studio.
+
+Exports are imported on first access so that light entry points (such as
+``ai-template-engine version``) do not pay for loading LangGraph and the
+LLM/MCP client libraries.
 """
 
-from .graph import graph
-from .state import (
-    OrchestratorState,
-    RepositoryAnalysis,
-    ExtractedPatterns,
-    GeneratedTemplates,
-    HarnessSetupResult,
-    DeploymentVerification,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .graph import graph
+    from .state import (
+        OrchestratorState,
+        RepositoryAnalysis,
+        ExtractedPatterns,
+        GeneratedTemplates,
+        HarnessSetupResult,
+        DeploymentVerification,
+        EnvironmentVerification,
+        NodeMetrics,
+    )
 
 __version__ = "0.1.0"
 
-__all__ = [
-    "graph",
-    "OrchestratorState",
-    "RepositoryAnalysis",
-    "ExtractedPatterns",
-    "GeneratedTemplates",
-    "HarnessSetupResult",
-    "DeploymentVerification",
-]
+# Public name -> defining module
+_EXPORTS = {
+    "graph": "graph",
+    "OrchestratorState": "state",
+    "RepositoryAnalysis": "state",
+    "ExtractedPatterns": "state",
+    "GeneratedTemplates": "state",
+    "HarnessSetupResult": "state",
+    "DeploymentVerification": "state",
+    "EnvironmentVerification": "state",
+    "NodeMetrics": "state",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,45 @@
+"""Local repository analysis.
+
+Scanners that inspect the target repository directly (without the LLM or
+MCP servers), sharing a single walk of the tree. See
+:mod:`orchestrator.analysis.walker`.
+
+Submodules are imported on first attribute access.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ci import PipelineIR, translate_ci_files
+    from .complexity import MetricsScanner, RepositoryMetrics
+    from .manifests import ManifestIndex, ManifestScanner
+    from .scan import RepositoryScan, scan_repository
+    from .secrets import SecretScan, SecretScanner
+    from .walker import Scanner, walk_repository
+
+# Public name -> defining module
+_EXPORTS = {
+    "ManifestIndex": "manifests",
+    "ManifestScanner": "manifests",
+    "MetricsScanner": "complexity",
+    "PipelineIR": "ci",
+    "RepositoryMetrics": "complexity",
+    "RepositoryScan": "scan",
+    "Scanner": "walker",
+    "SecretScan": "secrets",
+    "SecretScanner": "secrets",
+    "scan_repository": "scan",
+    "translate_ci_files": "ci",
+    "walk_repository": "walker",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,654 @@
+"""Translation of existing CI configurations into a pipeline IR.
+
+GitHub Actions workflows, GitLab CI files and declarative Jenkinsfiles are
+parsed into the same small intermediate representation: ordered stages of
+shell steps with their environment and run conditions, plus triggers and
+variables. Template generation turns the IR into Harness stages and steps
+directly, so repositories that already have CI keep their exact build and
+test commands. GitHub expressions with a Harness equivalent (secrets, env,
+matrix, inputs and common ``github`` properties) are rewritten, and run
+conditions become Harness ``when`` conditions where they have one. Steps,
+jobs and settings that cannot be translated (actions, other conditions,
+services, ``after_script``) are listed in the IR instead of being dropped
+silently, as are expressions kept as written, so they can be reported.
+
+Translations are cached under the orchestrator cache directory, keyed by a
+hash of the file content and :data:`IR_VERSION`.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Optional, TypedDict
+
+import yaml
+
+from ..paths import cache_dir
+from .secrets import harness_identifier
+
+# libyaml's C loader is much faster; PyYAML without it still works
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
+# Bump to invalidate cached translations
+IR_VERSION = "3"
+
+
+class CICondition(TypedDict, total=False):
+    """When a step or stage runs."""
+
+    status: str  # Success, Failure or All: outcome of the earlier steps or stages
+    condition: str  # Harness (JEXL) expression that must also hold
+
+
+class CIStep(TypedDict):
+    """One shell step."""
+
+    name: str
+    command: str
+    image: Optional[str]  # Container image the step runs in, if the config pins one
+    env: dict[str, str]  # Environment variables, including the file-level ones
+    when: Optional[CICondition]  # None: runs if the earlier steps succeeded
+
+
+class CIStage(TypedDict, total=False):
+    """A job (GitHub, Jenkins) or stage (GitLab) and its steps."""
+
+    name: str
+    steps: list[CIStep]
+    matrix: dict[str, Any]  # GitHub ``strategy.matrix`` axes (and ``exclude``), if any
+    when: CICondition  # GitHub job ``if:``, if any
+
+
+class PipelineIR(TypedDict):
+    """System-neutral view of one CI configuration file."""
+
+    source: str  # Path of the CI file, relative to the repository
+    system: str  # github, gitlab, jenkins
+    stages: list[CIStage]  # In execution order
+    triggers: list[str]  # push, pull_request, schedule, manual
+    variables: dict[str, str]
+    skipped: list[str]  # Steps, jobs and settings without a Harness equivalent
+    unresolved: list[str]  # Expressions kept as written, without a Harness equivalent
+
+
+# GitHub events -> IR triggers
+_GITHUB_TRIGGERS = {
+    "push": "push",
+    "pull_request": "pull_request",
+    "pull_request_target": "pull_request",
+    "schedule": "schedule",
+    "workflow_dispatch": "manual",
+}
+# Actions the Harness stage already covers (codebase clone, caching)
+_IMPLICIT_ACTIONS = ("actions/checkout", "actions/cache")
+_GITHUB_EXPRESSION = re.compile(r"\$\{\{\s*(.*?)\s*\}\}")
+_GITHUB_CONTEXT = re.compile(r"([a-z]+)\.([A-Za-z0-9_-]+)")
+# ``github`` context properties -> Harness expressions
+_GITHUB_PROPERTIES = {
+    "sha": "<+codebase.commitSha>",
+    "ref_name": "<+codebase.branch>",
+    "head_ref": "<+codebase.sourceBranch>",
+    "base_ref": "<+codebase.targetBranch>",
+    "event_name": "<+trigger.event>",
+    "repository": "<+codebase.repoUrl>",
+    "actor": "<+codebase.gitUserId>",
+    "run_id": "<+pipeline.executionId>",
+    "run_number": "<+pipeline.sequenceId>",
+    "workspace": "/harness",
+}
+# GitHub ``if:`` status functions -> condition statuses
+_GITHUB_STATUSES = {"success()": "Success", "failure()": "Failure", "always()": "All"}
+# Tokens of the GitHub conditions that are translated: contexts, string and
+# boolean literals, comparisons and logical operators (function calls other
+# than the status functions are not)
+_GITHUB_CONDITION_TOKEN = re.compile(
+    r"""'[^']*'|[A-Za-z_][\w.-]*\(?|[=!<>]=|&&|\|\||[!()<>]|\s+"""
+)
+
+# Top-level GitLab keys that are not jobs
+_GITLAB_RESERVED = {
+    "stages",
+    "variables",
+    "image",
+    "services",
+    "include",
+    "default",
+    "workflow",
+    "before_script",
+    "after_script",
+    "cache",
+    "pages",
+}
+_GITLAB_DEFAULT_STAGES = [".pre", "build", "test", "deploy", ".post"]
+# ``$CI_PIPELINE_SOURCE`` values and ``only``/``except`` keywords -> IR triggers
+_GITLAB_SOURCES = {
+    "push": "push",
+    "pushes": "push",
+    "merge_request_event": "pull_request",
+    "merge_requests": "pull_request",
+    "external_pull_request_event": "pull_request",
+    "external_pull_requests": "pull_request",
+    "schedule": "schedule",
+    "schedules": "schedule",
+    "web": "manual",
+}
+_GITLAB_SOURCE_RULE = re.compile(r"""\$CI_PIPELINE_SOURCE\s*==\s*["']?(\w+)""")
+# Job ``when:`` values that are translated -> conditions; ``manual`` and
+# ``delayed`` jobs are not translated
+_GITLAB_WHEN: dict[str, Optional[CICondition]] = {
+    "on_success": None,
+    "on_failure": {"status": "Failure"},
+    "always": {"status": "All"},
+}
+# Levels of ``extends`` GitLab resolves
+_GITLAB_MAX_EXTENDS = 11
+
+_JENKINS_STAGE = re.compile(r"""\bstage\s*\(\s*['"]([^'"]+)['"]\s*\)\s*\{""")
+_JENKINS_SH = re.compile(
+    r"""\b(?:sh|bat)\s*(?:\(\s*(?:script\s*:\s*)?)?"""
+    r"""('''[\s\S]*?'''|\"\"\"[\s\S]*?\"\"\"|'[^'\n]*'|"[^"\n]*")"""
+)
+_JENKINS_IMAGE = re.compile(r"""\bdocker\s*\{[^}]*?\bimage\s+['"]([^'"]+)['"]""")
+_JENKINS_ENVIRONMENT = re.compile(r"\benvironment\s*\{([^}]*)\}")
+_JENKINS_VARIABLE = re.compile(
+    r"""^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*['"]([^'"]*)['"]\s*$""", re.MULTILINE
+)
+_JENKINS_WHEN = re.compile(r"\bwhen\s*\{")
+# Groovy interpolation in double-quoted strings
+_JENKINS_INTERPOLATION = re.compile(r"(?<!\\)\$\{\s*([^}]*?)\s*\}")
+
+
+def _lines(value: Any) -> list[str]:
+    """Normalise a script given as a string or a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(line) for line in value]
+    return [str(value)]
+
+
+def _github_command(command: str, unresolved: list[str]) -> str:
+    """Rewrite GitHub expressions that have a Harness equivalent.
+
+    ``secrets``, ``env``, ``matrix``, ``inputs`` and the common ``github``
+    properties are translated; any other expression is kept as written and
+    added to ``unresolved``.
+    """
+
+    def replace(match: re.Match) -> str:
+        context = _GITHUB_CONTEXT.fullmatch(match.group(1))
+        kind, name = context.groups() if context else ("", "")
+        if kind == "secrets":
+            return f'<+secrets.getValue("{harness_identifier(name)}")>'
+        if kind == "env":
+            return f"${name}"
+        if kind == "matrix":
+            return f"<+matrix.{name}>"
+        if kind == "inputs":
+            return f"<+pipeline.variables.{name}>"
+        if kind == "github" and name in _GITHUB_PROPERTIES:
+            return _GITHUB_PROPERTIES[name]
+        if match.group(0) not in unresolved:
+            unresolved.append(match.group(0))
+        return match.group(0)
+
+    return _GITHUB_EXPRESSION.sub(replace, command)
+
+
+def _github_env(env: Any, unresolved: list[str]) -> dict[str, str]:
+    """Read a workflow, job or step ``env`` map, rewriting its expressions."""
+    if not isinstance(env, dict):
+        return {}
+    return {str(name): _github_command(str(value), unresolved) for name, value in env.items()}
+
+
+def _github_condition(condition: Any) -> Optional[CICondition]:
+    """Translate a GitHub ``if:`` condition.
+
+    The status functions become condition statuses; comparisons of string
+    literals and contexts with a Harness expression (``github.ref_name``,
+    ``inputs``, ``matrix`` ...) become a JEXL condition.
+
+    Returns:
+        The condition, or None if it cannot be translated
+    """
+    expression = str(condition).strip()
+    wrapped = _GITHUB_EXPRESSION.fullmatch(expression)
+    if wrapped:
+        expression = wrapped.group(1)
+    if expression in _GITHUB_STATUSES:
+        return {"status": _GITHUB_STATUSES[expression]}
+
+    parts: list[str] = []
+    position = 0
+    for token in _GITHUB_CONDITION_TOKEN.finditer(expression):
+        text = token.group()
+        if token.start() != position or text.endswith("("):
+            return None
+        position = token.end()
+        if text in ("true", "false"):
+            parts.append(text)
+        elif text[0].isalpha() or text[0] == "_":
+            unresolved: list[str] = []
+            translated = _github_command(f"${{{{ {text} }}}}", unresolved)
+            if unresolved or not translated.startswith("<+"):
+                return None
+            parts.append(translated)
+        elif text[0] == "'":
+            parts.append(f'"{text[1:-1]}"')
+        else:
+            parts.append(text)
+    if position != len(expression) or not parts:
+        return None
+    return {"status": "Success", "condition": "".join(parts).strip()}
+
+
+def _working_directory(config: dict) -> Optional[str]:
+    """Read the ``defaults.run.working-directory`` of a workflow or job."""
+    defaults = config.get("defaults")
+    run = defaults.get("run") if isinstance(defaults, dict) else None
+    return run.get("working-directory") if isinstance(run, dict) else None
+
+
+def _github_matrix(job: dict) -> Optional[dict[str, Any]]:
+    """Read the axes (and exclusions) of a job's ``strategy.matrix``."""
+    matrix = (job.get("strategy") or {}).get("matrix")
+    if not isinstance(matrix, dict):
+        return None
+    axes: dict[str, Any] = {
+        str(key): [str(value) for value in values]
+        for key, values in matrix.items()
+        if key not in ("include", "exclude") and isinstance(values, list)
+    }
+    if axes and isinstance(matrix.get("exclude"), list):
+        axes["exclude"] = [
+            {str(key): str(value) for key, value in combination.items()}
+            for combination in matrix["exclude"]
+            if isinstance(combination, dict)
+        ]
+    return axes or None
+
+
+def _ordered(jobs: dict[str, list[str]]) -> list[str]:
+    """Order job names so every job comes after the jobs it needs."""
+    ordered: list[str] = []
+    remaining = dict(jobs)
+    while remaining:
+        ready = [job for job, needs in remaining.items() if not set(needs) - set(ordered)]
+        if not ready:
+            # Unknown or cyclic dependencies: keep the file order
+            ready = list(remaining)
+        for job in ready:
+            ordered.append(job)
+            del remaining[job]
+    return ordered
+
+
+def parse_github_workflow(text: str, source: str) -> PipelineIR:
+    """Parse a GitHub Actions workflow."""
+    workflow = yaml.load(text, Loader=Loader) or {}
+    # YAML 1.1 reads the bare key ``on`` as True
+    events = workflow.get("on", workflow.get(True, []))
+    triggers = list(
+        dict.fromkeys(
+            _GITHUB_TRIGGERS[event]
+            for event in _lines(list(events) if isinstance(events, dict) else events)
+            if event in _GITHUB_TRIGGERS
+        )
+    )
+    variables = {str(key): str(value) for key, value in (workflow.get("env") or {}).items()}
+    # The workflow env becomes pipeline variables, which steps see as env vars
+    workflow_env = {name: f"<+pipeline.variables.{name}>" for name in variables}
+    workflow_directory = _working_directory(workflow)
+    # Dispatch inputs become runtime inputs, referenced as pipeline variables
+    dispatch = events.get("workflow_dispatch") if isinstance(events, dict) else None
+    for name, spec in ((dispatch or {}).get("inputs") or {}).items():
+        default = (spec or {}).get("default")
+        variables[str(name)] = "<+input>" if default is None else f"<+input>.default({default})"
+
+    jobs = workflow.get("jobs") or {}
+    stages: list[CIStage] = []
+    skipped: list[str] = []
+    unresolved: list[str] = []
+    for job_id in _ordered(
+        {job_id: _lines((job or {}).get("needs")) for job_id, job in jobs.items()}
+    ):
+        job = jobs[job_id] or {}
+        job_when = _github_condition(job["if"]) if "if" in job else None
+        if "if" in job and job_when is None:
+            skipped.append(f"{job_id} (if: {job['if']})")
+            continue
+        if job.get("services"):
+            skipped.append(f"{job_id}: services")
+        container = job.get("container")
+        image = container.get("image") if isinstance(container, dict) else container
+        job_env = {**workflow_env, **_github_env(job.get("env"), unresolved)}
+        job_directory = _working_directory(job) or workflow_directory
+        steps: list[CIStep] = []
+        for index, step in enumerate(job.get("steps") or [], 1):
+            if "run" in step:
+                name = step.get("name") or f"Step {index}"
+                when = _github_condition(step["if"]) if "if" in step else None
+                if "if" in step and when is None:
+                    skipped.append(f"{job_id}: {name} (if: {step['if']})")
+                    continue
+                command = _github_command(str(step["run"]), unresolved)
+                directory = step.get("working-directory") or job_directory
+                if directory:
+                    command = f'cd "{_github_command(str(directory), unresolved)}"\n{command}'
+                env = {**job_env, **_github_env(step.get("env"), unresolved)}
+                steps.append(
+                    {"name": name, "command": command, "image": image, "env": env, "when": when}
+                )
+            elif "uses" in step and not str(step["uses"]).startswith(_IMPLICIT_ACTIONS):
+                skipped.append(f"{job_id}: {step['uses']}")
+        stage: CIStage = {"name": str(job.get("name") or job_id), "steps": steps}
+        matrix = _github_matrix(job)
+        if matrix:
+            stage["matrix"] = matrix
+        if job_when:
+            stage["when"] = job_when
+        stages.append(stage)
+
+    return {
+        "source": source,
+        "system": "github",
+        "stages": stages,
+        "triggers": triggers,
+        "variables": variables,
+        "skipped": skipped,
+        "unresolved": unresolved,
+    }
+
+
+def _gitlab_triggers(conditions: Any) -> list[str]:
+    """Read the IR triggers named by GitLab ``rules`` or ``only`` conditions."""
+    sources: list[str] = []
+    if isinstance(conditions, dict):  # ``only: {refs: [...]}``
+        conditions = conditions.get("refs")
+    for condition in conditions if isinstance(conditions, list) else []:
+        if isinstance(condition, dict):  # A rule
+            if condition.get("when") == "never":
+                continue
+            sources.extend(_GITLAB_SOURCE_RULE.findall(str(condition.get("if", ""))))
+        else:
+            sources.append(str(condition))
+    return [_GITLAB_SOURCES[source] for source in sources if source in _GITLAB_SOURCES]
+
+
+def _gitlab_variables(values: Any) -> dict[str, str]:
+    """Read a GitLab ``variables`` map (plain values or ``value:`` entries)."""
+    if not isinstance(values, dict):
+        return {}
+    return {
+        str(key): str(value.get("value", "") if isinstance(value, dict) else value)
+        for key, value in values.items()
+    }
+
+
+def _merged(base: dict, override: dict) -> dict:
+    """Merge GitLab job keys the way ``extends`` does: maps deeply, the rest replaced."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = _merged(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+def _gitlab_extends(config: dict, job: dict, depth: int = 0) -> Optional[dict]:
+    """Resolve a job's ``extends``, or None if a job it extends is not in the file."""
+    parents = _lines(job.get("extends"))
+    if not parents:
+        return job
+    if depth >= _GITLAB_MAX_EXTENDS:
+        return None
+    resolved: dict = {}
+    for parent in parents:
+        template = config.get(parent)
+        template = (
+            _gitlab_extends(config, template, depth + 1) if isinstance(template, dict) else None
+        )
+        if template is None:
+            return None
+        resolved = _merged(resolved, template)
+    resolved = _merged(resolved, job)
+    del resolved["extends"]
+    return resolved
+
+
+def parse_gitlab_ci(text: str, source: str) -> PipelineIR:
+    """Parse a ``.gitlab-ci.yml`` file.
+
+    Jobs restricted by ``rules``, ``only`` or ``except`` and ``manual`` or
+    ``delayed`` jobs are not translated; they are listed in ``skipped``.
+    """
+    config = yaml.load(text, Loader=Loader) or {}
+    default = config.get("default") or {}
+    default_image = config.get("image") or default.get("image")
+    default_before = _lines(config.get("before_script") or default.get("before_script"))
+    default_after = config.get("after_script") or default.get("after_script")
+    default_services = config.get("services") or default.get("services")
+
+    variables = _gitlab_variables(config.get("variables"))
+    # Global variables become pipeline variables, which steps see as env vars
+    global_env = {name: f"<+pipeline.variables.{name}>" for name in variables}
+
+    stage_steps: dict[str, list[CIStep]] = {
+        stage: [] for stage in config.get("stages") or _GITLAB_DEFAULT_STAGES
+    }
+    skipped: list[str] = ["include"] if config.get("include") else []
+    jobs = []
+    for name, job in config.items():
+        if name in _GITLAB_RESERVED or str(name).startswith(".") or not isinstance(job, dict):
+            continue
+        resolved = _gitlab_extends(config, job)
+        if resolved is None:
+            skipped.append(f"{name} (extends: {', '.join(_lines(job['extends']))})")
+            continue
+        job = resolved
+        jobs.append(job)
+        if "script" not in job:
+            skipped.append(str(name))
+            continue
+        conditions = [key for key in ("rules", "only", "except") if key in job]
+        if conditions:
+            skipped.append(f"{name} ({', '.join(conditions)})")
+            continue
+        if job.get("when", "on_success") not in _GITLAB_WHEN:
+            skipped.append(f"{name} (when: {job['when']})")
+            continue
+        if job.get("services", default_services):
+            skipped.append(f"{name}: services")
+        if job.get("after_script", default_after):
+            skipped.append(f"{name}: after_script")
+        image = job.get("image", default_image)
+        if isinstance(image, dict):
+            image = image.get("name")
+        command = "\n".join(
+            _lines(job.get("before_script", default_before)) + _lines(job["script"])
+        )
+        stage_steps.setdefault(job.get("stage", "test"), []).append(
+            {
+                "name": str(name),
+                "command": command,
+                "image": image,
+                "env": {**global_env, **_gitlab_variables(job.get("variables"))},
+                "when": _GITLAB_WHEN[job.get("when", "on_success")],
+            }
+        )
+
+    # ``workflow:rules`` decide which pipelines run at all; otherwise jobs
+    # restricted to other sources add to the default push and merge requests
+    triggers = _gitlab_triggers((config.get("workflow") or {}).get("rules"))
+    if not triggers:
+        triggers = ["push", "pull_request"]
+        for job in jobs:
+            triggers.extend(_gitlab_triggers(job.get("rules")) + _gitlab_triggers(job.get("only")))
+    return {
+        "source": source,
+        "system": "gitlab",
+        "stages": [
+            {"name": stage, "steps": steps} for stage, steps in stage_steps.items() if steps
+        ],
+        "triggers": list(dict.fromkeys(triggers)),
+        "variables": variables,
+        "skipped": skipped,
+        "unresolved": [],
+    }
+
+
+def _jenkins_environment(text: str) -> dict[str, str]:
+    """Read the variables of the ``environment`` blocks in a piece of a Jenkinsfile."""
+    variables: dict[str, str] = {}
+    for block in _JENKINS_ENVIRONMENT.findall(text):
+        variables.update(_JENKINS_VARIABLE.findall(block))
+    return variables
+
+
+def _jenkins_command(command: str, env: dict[str, str], unresolved: list[str]) -> str:
+    """Rewrite the Groovy interpolations of a double-quoted ``sh`` string.
+
+    ``env.NAME`` and variables from ``environment`` blocks become shell
+    variables and ``params.NAME`` pipeline variables; any other
+    interpolation is kept as written and added to ``unresolved``.
+    """
+
+    def replace(match: re.Match) -> str:
+        expression = match.group(1)
+        kind, _, name = expression.rpartition(".")
+        if kind == "env" or (not kind and name in env):
+            return f"${{{name}}}"
+        if kind == "params":
+            return f"<+pipeline.variables.{name}>"
+        if match.group(0) not in unresolved:
+            unresolved.append(match.group(0))
+        return match.group(0)
+
+    return _JENKINS_INTERPOLATION.sub(replace, command)
+
+
+def parse_jenkinsfile(text: str, source: str) -> PipelineIR:
+    """Parse a declarative Jenkinsfile.
+
+    Only ``stage`` blocks and their ``sh``/``bat`` steps are read; scripted
+    Groovy is not interpreted. Stages with a ``when`` block are not
+    translated; they are listed in ``skipped``.
+    """
+    headers = list(_JENKINS_STAGE.finditer(text))
+    preamble = text[: headers[0].start()] if headers else text
+    image_match = _JENKINS_IMAGE.search(preamble)
+    pipeline_image = image_match.group(1) if image_match else None
+    variables = _jenkins_environment(preamble)
+    # Pipeline environment becomes pipeline variables, which steps see as env vars
+    pipeline_env = {name: f"<+pipeline.variables.{name}>" for name in variables}
+
+    stages: list[CIStage] = []
+    skipped: list[str] = []
+    unresolved: list[str] = []
+    for index, header in enumerate(headers):
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(text)
+        body = text[header.end() : end]
+        if _JENKINS_WHEN.search(body):
+            skipped.append(f"{header.group(1)} (when)")
+            continue
+        image_match = _JENKINS_IMAGE.search(body)
+        image = image_match.group(1) if image_match else pipeline_image
+        env = {**pipeline_env, **_jenkins_environment(body)}
+        steps: list[CIStep] = []
+        for number, match in enumerate(_JENKINS_SH.finditer(body), 1):
+            literal = match.group(1)
+            quote = 3 if literal[:3] in ("'''", '"""') else 1
+            command = literal[quote:-quote].strip()
+            if literal[0] == '"':
+                command = _jenkins_command(command, env, unresolved)
+            steps.append(
+                {
+                    "name": f"{header.group(1)} {number}",
+                    "command": command,
+                    "image": image,
+                    "env": env,
+                    "when": None,
+                }
+            )
+        if steps:
+            stages.append({"name": header.group(1), "steps": steps})
+
+    triggers = ["push"]
+    if re.search(r"\b(?:cron|pollSCM)\s*\(", text):
+        triggers.append("schedule")
+    return {
+        "source": source,
+        "system": "jenkins",
+        "stages": stages,
+        "triggers": triggers,
+        "variables": variables,
+        "skipped": skipped,
+        "unresolved": unresolved,
+    }
+
+
+def _parser_for(path: str) -> Optional[Callable[[str, str], PipelineIR]]:
+    """Pick the parser for a CI file, or None if its format is not supported."""
+    if path.startswith(".github/workflows/"):
+        return parse_github_workflow
+    if os.path.basename(path) == ".gitlab-ci.yml":
+        return parse_gitlab_ci
+    if os.path.basename(path).startswith("Jenkinsfile"):
+        return parse_jenkinsfile
+    return None
+
+
+def translate_ci_file(repo_path: str, path: str) -> Optional[PipelineIR]:
+    """Translate one CI file into the pipeline IR, using the cache when possible.
+
+    Args:
+        repo_path: Repository root
+        path: CI file path relative to the root
+
+    Returns:
+        The IR, or None if the format is unsupported or the file cannot be
+        read or parsed
+    """
+    parser = _parser_for(path)
+    if parser is None:
+        return None
+    try:
+        with open(os.path.join(repo_path, path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    key = hashlib.sha256(f"{IR_VERSION}\0{path}\0".encode() + data).hexdigest()
+    cached = cache_dir("ci_ir") / f"{key}.json"
+    try:
+        return json.loads(cached.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        ir = parser(data.decode("utf-8", errors="replace"), path)
+    except (yaml.YAMLError, AttributeError, TypeError):
+        return None
+    tmp_path = cached.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(ir), encoding="utf-8")
+    os.replace(tmp_path, cached)
+    return ir
+
+
+def translate_ci_files(repo_path: str, paths: list[str]) -> list[PipelineIR]:
+    """Translate the CI files of a repository, skipping those without shell steps.
+
+    Args:
+        repo_path: Repository root
+        paths: CI file paths relative to the root (``ci_files_present``)
+
+    Returns:
+        IRs of the files that translated to at least one step
+    """
+    translated = (translate_ci_file(repo_path, path) for path in paths)
+    return [ir for ir in translated if ir and any(stage["steps"] for stage in ir["stages"])]
@@ -0,0 +1,219 @@
+"""Streaming index of Kubernetes, Helm and Compose manifests.
+
+YAML files are classified from libyaml's event stream (``yaml.parse`` with
+the C loader) instead of being loaded: only the few top-level scalars that
+identify a document (``apiVersion``, ``kind``, the ``services`` of a
+Compose file) are picked out as the events go by, so no
+node tree or Python objects are built for the rest of the document. Every
+document of a multi-document file is classified.
+
+Helm charts are found by their ``Chart.yaml``. Chart templates (and any
+other file using Go templating) are not valid YAML, so their documents are
+classified from ``apiVersion:``/``kind:`` lines at the start of a line.
+"""
+
+import posixpath
+import re
+from collections import Counter
+from typing import Iterator, Optional, TypedDict
+
+import yaml
+
+from .walker import MAX_LISTED_PATHS, Scanner
+
+# libyaml's C parser is much faster; PyYAML without it still works
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
+# Deployment patterns implied by resource kinds
+KIND_PATTERNS = {
+    "StatefulSet": "stateful_workloads",
+    "DaemonSet": "daemon_sets",
+    "Job": "batch_jobs",
+    "CronJob": "batch_jobs",
+    "Ingress": "ingress",
+    "Gateway": "ingress",
+    "HTTPRoute": "ingress",
+    "VirtualService": "service_mesh",
+    "HorizontalPodAutoscaler": "autoscaling",
+    "Rollout": "progressive_delivery",
+    "Kustomization": "kustomize",
+}
+
+# Reported deployment patterns, in this order
+PATTERN_ORDER = (
+    "kubernetes",
+    "helm",
+    "kustomize",
+    "docker_compose",
+    "stateful_workloads",
+    "daemon_sets",
+    "batch_jobs",
+    "ingress",
+    "service_mesh",
+    "autoscaling",
+    "progressive_delivery",
+    "serverless",
+)
+
+_YAML_FILE = re.compile(r"\.ya?ml$")
+_DOCUMENT_SEPARATOR = re.compile(r"^---.*$", re.MULTILINE)
+_TOP_LEVEL = re.compile(r"^(apiVersion|kind):[ \t]*['\"]?([A-Za-z0-9./-]+)", re.MULTILINE)
+
+# Top-level keys whose scalar values identify a document
+_IDENTIFYING = {("apiVersion",), ("kind",)}
+
+
+class ManifestIndex(TypedDict):
+    """Deployment manifests found in a repository."""
+
+    kubernetes_manifests: list[str]  # Files with at least one Kubernetes resource
+    resources: dict[str, int]  # Kind -> number of documents
+    helm_charts: list[str]  # Chart directories
+    compose_services: dict[str, list[str]]  # Compose file -> service names
+    deployment_patterns: list[str]
+    infrastructure_as_code: list[str]  # helm, kustomize, terraform
+
+
+def _documents(text: str) -> Iterator[dict]:
+    """Pick the identifying fields of each YAML document out of the event stream.
+
+    Args:
+        text: YAML text, possibly with several documents
+
+    Yields:
+        Per document, the identifying scalars by key and, for a top-level
+        ``services`` mapping, its keys under ``"services"``
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    fields: dict = {}
+    # Open collections: [path, is_mapping, expecting_key, current_key]
+    stack: list[list] = []
+
+    for event in yaml.parse(text, Loader=Loader):
+        if isinstance(event, yaml.DocumentStartEvent):
+            fields, stack = {}, []
+        elif isinstance(event, yaml.DocumentEndEvent):
+            yield fields
+        elif isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+            if not stack:
+                continue
+            top = stack[-1]
+            if top[1] and top[2]:
+                top[2], top[3] = False, getattr(event, "value", None)
+                if top[0] == ("services",) and top[3] is not None:
+                    fields.setdefault("services", []).append(top[3])
+                continue
+            if top[1]:
+                path = top[0] + (top[3],)
+                if path in _IDENTIFYING and isinstance(event, yaml.ScalarEvent):
+                    fields[path[0]] = event.value
+                top[2] = True
+        elif isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            if stack:
+                parent = stack[-1]
+                path = parent[0] + (parent[3],) if parent[1] else parent[0] + ("[]",)
+            else:
+                path = ()
+            stack.append([path, isinstance(event, yaml.MappingStartEvent), True, None])
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            stack.pop()
+            if stack and stack[-1][1]:
+                stack[-1][2] = True
+
+
+def _templated_documents(text: str) -> Iterator[dict]:
+    """Classify the documents of a templated (not valid YAML) file line by line."""
+    for chunk in _DOCUMENT_SEPARATOR.split(text):
+        fields = {}
+        for key, value in _TOP_LEVEL.findall(chunk):
+            fields.setdefault(key, value)
+        if fields:
+            yield fields
+
+
+class ManifestScanner(Scanner):
+    """Indexes Kubernetes resources, Helm charts and Compose services."""
+
+    def __init__(self) -> None:
+        self.manifests: list[str] = []
+        self.resources: Counter = Counter()
+        self.api_groups: set[str] = set()
+        self.helm_charts: list[str] = []
+        self.compose_services: dict[str, list[str]] = {}
+        self.kustomize = False
+        self.terraform = False
+        self.serverless = False
+
+    def visit(self, path: str, size: int) -> bool:
+        if path.endswith(".tf"):
+            self.terraform = True
+            return False
+        return bool(_YAML_FILE.search(path))
+
+    def feed(self, path: str, text: str) -> None:
+        name = posixpath.basename(path)
+        if name in ("Chart.yaml", "Chart.yml"):
+            self.helm_charts.append(posixpath.dirname(path) or ".")
+            return
+        if name in ("kustomization.yaml", "kustomization.yml"):
+            self.kustomize = True
+        if name in ("serverless.yml", "serverless.yaml"):
+            self.serverless = True
+        # Most YAML files (CI configs, app settings) can be rejected unparsed
+        if "kind" not in text and "services" not in text:
+            return
+
+        documents: list[dict]
+        if "{{" in text:
+            documents = list(_templated_documents(text))
+        else:
+            try:
+                documents = list(_documents(text))
+            except yaml.YAMLError:
+                documents = list(_templated_documents(text))
+
+        kubernetes = False
+        for fields in documents:
+            kind, api_version = fields.get("kind"), fields.get("apiVersion")
+            if kind and api_version:
+                kubernetes = True
+                self.resources[kind] += 1
+                self.api_groups.add(api_version.partition("/")[0])
+            elif fields.get("services") and not api_version:
+                self.compose_services[path] = fields["services"]
+        if kubernetes and len(self.manifests) < MAX_LISTED_PATHS:
+            self.manifests.append(path)
+
+    def index(self) -> ManifestIndex:
+        """Get the index, sorted for stable output."""
+        patterns = set()
+        if self.resources:
+            patterns.add("kubernetes")
+        if self.helm_charts:
+            patterns.add("helm")
+        if self.kustomize:
+            patterns.add("kustomize")
+        if self.compose_services:
+            patterns.add("docker_compose")
+        if self.serverless or "serving.knative.dev" in self.api_groups:
+            patterns.add("serverless")
+        patterns.update(KIND_PATTERNS[kind] for kind in self.resources if kind in KIND_PATTERNS)
+
+        infrastructure: list[Optional[str]] = [
+            "helm" if self.helm_charts else None,
+            "kustomize" if "kustomize" in patterns else None,
+            "terraform" if self.terraform else None,
+        ]
+        return {
+            "kubernetes_manifests": sorted(self.manifests),
+            "resources": dict(sorted(self.resources.items())),
+            "helm_charts": sorted(self.helm_charts),
+            "compose_services": dict(sorted(self.compose_services.items())),
+            "deployment_patterns": [pattern for pattern in PATTERN_ORDER if pattern in patterns],
+            "infrastructure_as_code": [name for name in infrastructure if name],
+        }
@@ -0,0 +1,87 @@
+"""Local repository scan run by the analysis phase.
+
+:func:`scan_repository` walks the repository once with every local scanner
+and returns their combined findings, which the analysis node merges into
+``RepositoryAnalysis``.
+"""
+
+import re
+from typing import TypedDict
+
+from .complexity import MetricsScanner, RepositoryMetrics
+from .manifests import ManifestIndex, ManifestScanner
+from .secrets import SecretScan, SecretScanner
+from .walker import MAX_LISTED_PATHS, Scanner, WalkStats, walk_repository
+
+# CI configuration files by path
+CI_FILE_PATTERN = re.compile(
+    r"^(?:\.github/workflows/[^/]+\.ya?ml|\.gitlab-ci\.yml|Jenkinsfile|\.circleci/config\.ya?ml"
+    r"|azure-pipelines\.ya?ml|bitbucket-pipelines\.yml|\.travis\.yml|\.drone\.ya?ml)$"
+)
+COMPOSE_FILE_PATTERN = re.compile(r"(?:^|/)(?:docker-)?compose(?:\.[^/]+)?\.ya?ml$")
+DOCKERFILE_PATTERN = re.compile(r"(?:^|/)(?:Dockerfile(?:\.[^/]+)?|[^/]+\.Dockerfile|Containerfile)$")
+
+
+class Inventory(TypedDict):
+    """Container and CI files found in a repository."""
+
+    dockerfiles: list[str]
+    compose_files: list[str]
+    ci_files: list[str]
+
+
+class InventoryScanner(Scanner):
+    """Records container and CI files by path, without reading them."""
+
+    def __init__(self) -> None:
+        self.inventory: Inventory = {"dockerfiles": [], "compose_files": [], "ci_files": []}
+
+    def visit(self, path: str, size: int) -> bool:
+        if CI_FILE_PATTERN.match(path):
+            category = "ci_files"
+        elif COMPOSE_FILE_PATTERN.search(path):
+            category = "compose_files"
+        elif DOCKERFILE_PATTERN.search(path):
+            category = "dockerfiles"
+        else:
+            return False
+        if len(self.inventory[category]) < MAX_LISTED_PATHS:
+            self.inventory[category].append(path)
+        return False
+
+    def finish(self) -> None:
+        for paths in self.inventory.values():
+            paths.sort()
+
+
+class RepositoryScan(TypedDict):
+    """Combined results of the local scanners."""
+
+    walk: WalkStats
+    inventory: Inventory
+    secrets: SecretScan
+    manifests: ManifestIndex
+    metrics: RepositoryMetrics
+
+
+def scan_repository(repo_path: str) -> RepositoryScan:
+    """Scan a repository with every local scanner in a single walk.
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Findings of each scanner and the walk counters
+    """
+    inventory = InventoryScanner()
+    secrets = SecretScanner()
+    manifests = ManifestScanner()
+    metrics = MetricsScanner()
+    walk = walk_repository(repo_path, [inventory, secrets, manifests, metrics])
+    return {
+        "walk": walk,
+        "inventory": inventory.inventory,
+        "secrets": secrets.result(),
+        "manifests": manifests.index(),
+        "metrics": metrics.summary(),
+    }
@@ -0,0 +1,234 @@
+"""Secret and credential-usage detection in one multi-pattern pass.
+
+Every source, CI, container, IaC, manifest and env file is searched once
+for all anchor strings at the same time (documentation is not): the
+places code reads environment variables (``os.getenv(``, ``process.env.``,
+``System.getenv(`` ...), CI secret expressions (``${{ secrets.``),
+variable substitutions in compose/CI/Dockerfiles (``${``), Kubernetes
+secret references (``secretKeyRef:``) and imports of cloud SDKs
+(``boto3``, ``@google-cloud/``, ``@azure/`` ...). Each hit is then
+confirmed by reading the identifier right after it.
+
+The search uses an Aho-Corasick automaton when ``pyahocorasick`` is
+installed (the ``analysis`` extra) and otherwise a single compiled regular
+expression alternating over all anchors; both scan a file's text once,
+however many anchors there are.
+"""
+
+import re
+from collections import defaultdict
+from typing import Callable, Iterator, TypedDict
+
+from .walker import Scanner
+
+# Import is optional - fall back to one combined regular expression
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Anchor kinds
+ENV = "env"  # identifier (possibly quoted) follows the anchor
+SUBSTITUTION = "substitution"  # ${NAME} in compose, CI and container files
+CI_SECRET = "ci_secret"  # ${{ secrets.NAME }}
+KUBERNETES_SECRET = "kubernetes_secret"  # secretKeyRef/secretRef followed by name:
+CLOUD = "cloud"  # cloud SDK usage; the value is the provider
+
+ANCHORS: dict[str, tuple[str, str]] = {
+    # Environment variable reads
+    "os.environ[": (ENV, ""),
+    "os.environ.get(": (ENV, ""),
+    "os.getenv(": (ENV, ""),
+    "getenv(": (ENV, ""),
+    "process.env.": (ENV, ""),
+    "process.env[": (ENV, ""),
+    "os.Getenv(": (ENV, ""),
+    "os.LookupEnv(": (ENV, ""),
+    "System.getenv(": (ENV, ""),
+    "Environment.GetEnvironmentVariable(": (ENV, ""),
+    "env::var(": (ENV, ""),
+    "ENV[": (ENV, ""),
+    "ENV.fetch(": (ENV, ""),
+    # CI and manifest references
+    "${{ secrets.": (CI_SECRET, ""),
+    "${{secrets.": (CI_SECRET, ""),
+    "${": (SUBSTITUTION, ""),
+    "secretKeyRef:": (KUBERNETES_SECRET, ""),
+    "secretRef:": (KUBERNETES_SECRET, ""),
+    # Cloud SDKs
+    "boto3": (CLOUD, "aws"),
+    "botocore": (CLOUD, "aws"),
+    "aws-sdk": (CLOUD, "aws"),
+    "@aws-sdk/": (CLOUD, "aws"),
+    "github.com/aws/aws-sdk-go": (CLOUD, "aws"),
+    "com.amazonaws": (CLOUD, "aws"),
+    "google.cloud": (CLOUD, "gcp"),
+    "google-cloud-": (CLOUD, "gcp"),
+    "@google-cloud/": (CLOUD, "gcp"),
+    "cloud.google.com/go": (CLOUD, "gcp"),
+    "com.google.cloud": (CLOUD, "gcp"),
+    "azure.identity": (CLOUD, "azure"),
+    "azure.storage": (CLOUD, "azure"),
+    "azure-identity": (CLOUD, "azure"),
+    "azure-storage": (CLOUD, "azure"),
+    "@azure/": (CLOUD, "azure"),
+    "github.com/Azure/azure-sdk-for-go": (CLOUD, "azure"),
+    "com.azure": (CLOUD, "azure"),
+}
+
+# Environment variables whose name ends in a credential word (DB_PASSWORD,
+# GITHUB_TOKEN, SENTRY_DSN), not ones that merely contain one (TOKENIZER_PATH)
+SECRET_NAME_PATTERN = re.compile(
+    r"(?:^|_)(?:TOKEN|SECRET|SECRET_?KEY|PASSWORD|PASSWD|PASS|API_?KEY|ACCESS_?KEY(?:_ID)?"
+    r"|PRIVATE_?KEY|CREDENTIALS?|AUTH|DSN|CONNECTION_STRING|WEBHOOK(?:_URL)?"
+    r"|(?:DATABASE|DB|REDIS|MONGO(?:DB)?|AMQP)_UR[LI])S?$"
+)
+
+# Well-known cloud credentials, mapped to their provider
+CLOUD_CREDENTIALS = {
+    "AWS_ACCESS_KEY_ID": "aws",
+    "AWS_SECRET_ACCESS_KEY": "aws",
+    "GOOGLE_APPLICATION_CREDENTIALS": "gcp",
+    "AZURE_CLIENT_ID": "azure",
+    "AZURE_CLIENT_SECRET": "azure",
+}
+
+# Files referencing a secret that are reported as examples
+MAX_REFERENCES_PER_SECRET = 5
+
+_IDENTIFIER = re.compile(r"""\s*['"`]?([A-Za-z_][A-Za-z0-9_]*)""")
+_SUBSTITUTED = re.compile(r"([A-Za-z_][A-Za-z0-9_]*)(?:[:?}-])")
+_SECRET_NAME = re.compile(r"[\s\S]{0,120}?\bname:\s*['\"]?([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# Files searched at all: source code, CI, container, IaC and Kubernetes files,
+# env files and dependency manifests (which name the cloud SDKs). Docs and
+# other prose are left out, where variable names are only mentioned.
+_SCANNED_FILES = re.compile(
+    r"(?:^|/)(?:Dockerfile[^/]*|Containerfile|Jenkinsfile|Makefile|Procfile|Gemfile|go\.mod"
+    r"|\.env[^/]*|package\.json|requirements[^/]*\.txt|pom\.xml"
+    r"|[^/]+\.(?:py|[cm]?jsx?|tsx?|go|java|kts?|scala|groovy|rb|php|cs|rs|swift|sh|bash"
+    r"|ya?ml|tf|tfvars|hcl|tpl|gradle|properties|toml|ini|cfg|conf))$"
+)
+
+# Files in which ${NAME} is a variable substitution rather than code
+_SUBSTITUTION_FILES = re.compile(
+    r"(?:^|/)(?:Dockerfile[^/]*|[^/]*compose[^/]*\.ya?ml|\.gitlab-ci\.yml|Jenkinsfile|Makefile"
+    r"|\.github/workflows/[^/]+\.ya?ml|[^/]+\.(?:ya?ml|sh|env|tf|tpl))$"
+)
+
+
+class SecretScan(TypedDict):
+    """Secrets and cloud services a repository uses."""
+
+    env_vars: list[str]  # Environment variables read by code and configs
+    secrets: list[str]  # Credentials: secret-like env vars, CI secrets, Kubernetes secrets
+    kubernetes_secrets: list[str]  # Secret objects referenced by manifests
+    cloud_providers: list[str]  # aws, gcp, azure
+    references: dict[str, list[str]]  # Secret -> files referencing it (first few)
+
+
+def harness_identifier(name: str) -> str:
+    """Turn a secret name (``DB_PASSWORD``, ``db-secret``) into a Harness identifier."""
+    identifier = re.sub(r"[^a-z0-9_]+", "_", name.lower()).strip("_")
+    return identifier if identifier[:1].isalpha() else f"secret_{identifier}"
+
+
+def _build_matcher() -> Callable[[str], Iterator[tuple[int, str]]]:
+    """Build a function yielding ``(end, anchor)`` for every anchor hit in a text."""
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for anchor in ANCHORS:
+            automaton.add_word(anchor, anchor)
+        automaton.make_automaton()
+
+        def matches(text: str) -> Iterator[tuple[int, str]]:
+            for last, anchor in automaton.iter(text):
+                yield last + 1, anchor
+
+        return matches
+
+    # Longest anchors first, so overlapping anchors resolve to the most specific one
+    pattern = re.compile(
+        "|".join(re.escape(anchor) for anchor in sorted(ANCHORS, key=len, reverse=True))
+    )
+
+    def matches(text: str) -> Iterator[tuple[int, str]]:
+        for match in pattern.finditer(text):
+            yield match.end(), match.group()
+
+    return matches
+
+
+_matches = _build_matcher()
+
+
+class SecretScanner(Scanner):
+    """Collects secret references and cloud SDK usage from file contents."""
+
+    def __init__(self) -> None:
+        self.env_vars: set[str] = set()
+        self.secrets: set[str] = set()
+        self.kubernetes_secrets: set[str] = set()
+        self.cloud_providers: set[str] = set()
+        self.references: dict[str, list[str]] = defaultdict(list)
+
+    def visit(self, path: str, size: int) -> bool:
+        return bool(_SCANNED_FILES.search(path))
+
+    def _secret(self, name: str, path: str) -> None:
+        self.secrets.add(name)
+        references = self.references[name]
+        if len(references) < MAX_REFERENCES_PER_SECRET and path not in references:
+            references.append(path)
+
+    def _env_var(self, name: str, path: str) -> None:
+        self.env_vars.add(name)
+        if name in CLOUD_CREDENTIALS:
+            self.cloud_providers.add(CLOUD_CREDENTIALS[name])
+        if SECRET_NAME_PATTERN.search(name.upper()):
+            self._secret(name, path)
+
+    def feed(self, path: str, text: str) -> None:
+        name = path.rsplit("/", 1)[-1]
+        if name.startswith(".env"):
+            # KEY=value files list the variables an application expects
+            for line in text.splitlines():
+                key, sep, _ = line.strip().removeprefix("export ").partition("=")
+                if sep and key.isidentifier():
+                    self._env_var(key, path)
+
+        substitutions = None
+        for end, anchor in _matches(text):
+            kind, value = ANCHORS[anchor]
+            if kind == CLOUD:
+                self.cloud_providers.add(value)
+            elif kind == ENV:
+                match = _IDENTIFIER.match(text, end)
+                if match:
+                    self._env_var(match.group(1), path)
+            elif kind == SUBSTITUTION:
+                if substitutions is None:
+                    substitutions = bool(_SUBSTITUTION_FILES.search(path))
+                match = _SUBSTITUTED.match(text, end) if substitutions else None
+                if match:
+                    self._env_var(match.group(1), path)
+            elif kind == CI_SECRET:
+                match = _IDENTIFIER.match(text, end)
+                if match:
+                    self._secret(match.group(1), path)
+            elif kind == KUBERNETES_SECRET:
+                match = _SECRET_NAME.match(text, end)
+                if match:
+                    self.kubernetes_secrets.add(match.group(1))
+                    self._secret(match.group(1), path)
+
+    def result(self) -> SecretScan:
+        """Get the scan results, sorted for stable output."""
+        return {
+            "env_vars": sorted(self.env_vars),
+            "secrets": sorted(self.secrets),
+            "kubernetes_secrets": sorted(self.kubernetes_secrets),
+            "cloud_providers": sorted(self.cloud_providers),
+            "references": {name: self.references[name] for name in sorted(self.secrets)},
+        }
@@ -0,0 +1,151 @@
+"""Single-pass repository walker.
+
+Local analyses (secret references, manifests, CI configs, file metrics)
+all need to look at the repository tree. Rather than each walking and
+reading it on its own, they are written as :class:`Scanner` objects and
+:func:`walk_repository` visits every file once, reading a file's content
+at most once and handing it to every scanner that asked for it.
+
+Vendored and generated directories (``node_modules``, ``vendor``,
+``.venv``, ...) are skipped, as are binary files and files larger than
+``ORCHESTRATOR_SCAN_MAX_FILE_BYTES`` (default 1 MiB).
+"""
+
+import os
+import time
+from typing import Iterable, Optional, TypedDict
+
+# Directories never descended into
+SKIPPED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "bower_components",
+        "vendor",
+        ".venv",
+        "venv",
+        "__pycache__",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".terraform",
+        "target",
+        "dist",
+        "build",
+    }
+)
+
+# Extensions of files that are never read
+BINARY_EXTENSIONS = frozenset(
+    {
+        ".png", ".jpg", ".jpeg", ".gif", ".ico", ".svg", ".webp", ".pdf",
+        ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".tar", ".jar", ".war",
+        ".class", ".so", ".dll", ".dylib", ".exe", ".o", ".a", ".pyc", ".whl",
+        ".woff", ".woff2", ".ttf", ".eot", ".mp3", ".mp4", ".mov", ".bin",
+    }
+)
+
+DEFAULT_MAX_FILE_BYTES = 1024 * 1024
+
+# Paths a scanner lists per category
+MAX_LISTED_PATHS = 100
+
+
+class Scanner:
+    """Base class of scanners fed by :func:`walk_repository`."""
+
+    def visit(self, path: str, size: int) -> bool:
+        """See a file; return True to be fed its content.
+
+        Args:
+            path: Path relative to the repository root, with ``/`` separators
+            size: File size in bytes
+        """
+        return False
+
+    def feed(self, path: str, text: str) -> None:
+        """Receive the content of a file this scanner asked for."""
+
+    def finish(self) -> None:
+        """Called once after the last file."""
+
+
+class WalkStats(TypedDict):
+    """Counters of one repository walk."""
+
+    files: int  # Files seen outside skipped directories
+    files_read: int
+    bytes_read: int
+    skipped_dirs: int
+    seconds: float
+
+
+def walk_repository(
+    root: str, scanners: Iterable[Scanner], max_file_bytes: Optional[int] = None
+) -> WalkStats:
+    """Visit every file of a repository once, feeding the given scanners.
+
+    Args:
+        root: Repository root
+        scanners: Scanners to feed
+        max_file_bytes: Larger files are seen but not read (defaults to
+            ``ORCHESTRATOR_SCAN_MAX_FILE_BYTES`` or 1 MiB)
+
+    Returns:
+        Walk counters
+    """
+    if max_file_bytes is None:
+        max_file_bytes = int(os.getenv("ORCHESTRATOR_SCAN_MAX_FILE_BYTES", DEFAULT_MAX_FILE_BYTES))
+    scanners = list(scanners)
+    stats: WalkStats = {"files": 0, "files_read": 0, "bytes_read": 0, "skipped_dirs": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    prefix_length = len(os.path.join(root, ""))
+
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SKIPPED_DIRS:
+                        stats["skipped_dirs"] += 1
+                    else:
+                        stack.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+
+            stats["files"] += 1
+            path = entry.path[prefix_length:].replace(os.sep, "/")
+            wanted = [scanner for scanner in scanners if scanner.visit(path, size)]
+            if not wanted or size > max_file_bytes:
+                continue
+            if os.path.splitext(entry.name)[1].lower() in BINARY_EXTENSIONS:
+                continue
+
+            try:
+                with open(entry.path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue
+            if b"\0" in data[:8192]:
+                continue
+            stats["files_read"] += 1
+            stats["bytes_read"] += len(data)
+            text = data.decode("utf-8", errors="replace")
+            for scanner in wanted:
+                scanner.feed(path, text)
+
+    for scanner in scanners:
+        scanner.finish()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
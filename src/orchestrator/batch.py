@@ -0,0 +1,265 @@
+"""Batch orchestration over a manifest of repositories.
+
+A manifest lists one job per row, either as CSV (with a header row) or as
+JSONL, using the columns ``repo_path``, ``org_id``, ``project_id`` and an
+optional ``repo_url``. Jobs run concurrently on a bounded worker pool; each
+job gets its own workflow ID (used as its checkpoint thread) and a timeout,
+and a failing or hung job never holds up the others.
+
+Every finished job is appended to a JSONL report as soon as it completes,
+with its outcome, errors and the time spent in each workflow node.
+"""
+
+import asyncio
+import csv
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional, TypedDict
+
+from .cancellation import cancellation_scope
+from .memory import workflow_slot
+from .state import create_initial_state
+
+DEFAULT_WORKERS = 4
+DEFAULT_JOB_TIMEOUT_SECONDS = 1800
+
+# Accepted spellings of the manifest columns
+_COLUMN_ALIASES = {
+    "repo": "repo_path",
+    "path": "repo_path",
+    "url": "repo_url",
+    "org": "org_id",
+    "project": "project_id",
+}
+_REQUIRED_COLUMNS = ("repo_path", "org_id", "project_id")
+
+
+class BatchJob(TypedDict, total=False):
+    """One repository to onboard."""
+
+    repo_path: str
+    repo_url: Optional[str]
+    org_id: str
+    project_id: str
+
+
+class BatchResult(TypedDict, total=False):
+    """Outcome of one batch job, as written to the report."""
+
+    repo_path: str
+    org_id: str
+    project_id: str
+    workflow_id: str
+    status: str  # complete, awaiting_approval, failed, timeout
+    last_phase: str
+    errors: list[str]
+    phase_timings: dict[str, float]
+    duration_seconds: float
+    pipeline_url: Optional[str]
+
+
+def _normalize_row(row: dict[str, Any], line: int) -> BatchJob:
+    job = {
+        _COLUMN_ALIASES.get(key.strip().lower(), key.strip().lower()): (value or "").strip()
+        for key, value in row.items()
+        if key
+    }
+    missing = [column for column in _REQUIRED_COLUMNS if not job.get(column)]
+    if missing:
+        raise ValueError(f"Manifest row {line} is missing {', '.join(missing)}")
+    return {
+        "repo_path": job["repo_path"],
+        "repo_url": job.get("repo_url") or None,
+        "org_id": job["org_id"],
+        "project_id": job["project_id"],
+    }
+
+
+def load_manifest(path: str) -> list[BatchJob]:
+    """Load batch jobs from a CSV or JSONL manifest.
+
+    Args:
+        path: Manifest file; ``.jsonl``/``.ndjson`` files are read as JSONL,
+            anything else as CSV with a header row
+
+    Returns:
+        Jobs in manifest order
+
+    Raises:
+        ValueError: If a row is malformed or missing a required column
+    """
+    manifest = Path(path)
+    with manifest.open(newline="", encoding="utf-8") as f:
+        if manifest.suffix.lower() in (".jsonl", ".ndjson"):
+            rows = [
+                (number, json.loads(line))
+                for number, line in enumerate(f, start=1)
+                if line.strip()
+            ]
+        else:
+            rows = list(enumerate(csv.DictReader(f), start=2))
+
+    return [_normalize_row(row, number) for number, row in rows]
+
+
+def _run_job(
+    graph: Any,
+    job: BatchJob,
+    workflow_id: str,
+    no_approval: bool,
+    cancelled: threading.Event,
+    on_phase: Optional[Callable[[BatchJob, str], None]],
+    on_started: Callable[[], None],
+) -> BatchResult:
+    """Stream one workflow to completion or its approval pause (runs in a worker thread).
+
+    ``on_started`` is called once the workflow is about to run (after any
+    wait for the degraded-mode workflow slot); the job's timeout counts from
+    there.
+    """
+    config = {"configurable": {"thread_id": workflow_id}}
+    initial_state = create_initial_state(
+        job["repo_path"],
+        job["org_id"],
+        job["project_id"],
+        repo_url=job.get("repo_url"),
+        workflow_id=workflow_id,
+        no_approval=no_approval,
+    )
+    result: BatchResult = {"status": "complete", "errors": [], "phase_timings": {}}
+
+    # In degraded mode (see orchestrator.memory) workflows run one at a time
+    with workflow_slot(), cancellation_scope(cancelled):
+        on_started()
+        step_started = time.monotonic()
+        for chunk in graph.stream(initial_state, config=config, stream_mode="updates"):
+            now = time.monotonic()
+            for node, update in chunk.items():
+                if node.startswith("__"):  # e.g. __interrupt__
+                    continue
+                timings = result["phase_timings"]
+                timings[node] = round(timings.get(node, 0.0) + now - step_started, 3)
+                if on_phase:
+                    on_phase(job, node)
+
+                update = update or {}
+                if update.get("current_phase"):
+                    result["last_phase"] = update["current_phase"]
+                if update.get("errors"):
+                    result["errors"].extend(update["errors"])
+                pipeline = (update.get("harness_setup") or {}).get("pipeline_created")
+                if pipeline:
+                    result["pipeline_url"] = pipeline.get("url")
+            step_started = now
+
+            if result["errors"]:
+                result["status"] = "failed"
+                return result
+            if cancelled.is_set():
+                # Timed out: stop at the next node boundary; the checkpoint keeps the progress
+                result["status"] = "timeout"
+                return result
+
+    if graph.get_state(config).next:
+        result["status"] = "awaiting_approval"
+    return result
+
+
+async def run_batch(
+    graph: Any,
+    jobs: list[BatchJob],
+    report_path: str,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_JOB_TIMEOUT_SECONDS,
+    no_approval: bool = False,
+    on_phase: Optional[Callable[[BatchJob, str], None]] = None,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+) -> list[BatchResult]:
+    """Run workflows for all jobs on a bounded worker pool.
+
+    Args:
+        graph: Compiled graph (with a thread-safe checkpointer)
+        jobs: Jobs to run
+        report_path: JSONL report file; one line is appended per finished job
+        workers: Maximum concurrent workflows
+        timeout: Per-job timeout in seconds
+        no_approval: Skip the human approval step
+        on_phase: Progress callback invoked with the job and node name after each node
+        on_result: Callback invoked with each job's result as it finishes
+
+    Returns:
+        Job results in manifest order
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-job")
+    semaphore = asyncio.Semaphore(workers)
+    report_lock = asyncio.Lock()
+    loop = asyncio.get_running_loop()
+
+    async def report(job: BatchJob, workflow_id: str, started: float, result: Any) -> BatchResult:
+        result = {
+            "repo_path": job["repo_path"],
+            "org_id": job["org_id"],
+            "project_id": job["project_id"],
+            "workflow_id": workflow_id,
+            **result,
+            "duration_seconds": round(time.monotonic() - started, 3),
+        }
+        async with report_lock:
+            with open(report_path, "a", encoding="utf-8") as report_file:
+                report_file.write(json.dumps(result) + "\n")
+        if on_result:
+            on_result(result)
+        return result
+
+    async def run_one(job: BatchJob) -> BatchResult:
+        # The slot is held until the job's thread has really finished, so a
+        # timed-out job never leaves a queued job without a thread to run on
+        async with semaphore:
+            workflow_id = str(uuid.uuid4())
+            cancelled = threading.Event()
+            running = asyncio.Event()
+            started = time.monotonic()
+            future = loop.run_in_executor(
+                executor,
+                _run_job,
+                graph,
+                job,
+                workflow_id,
+                no_approval,
+                cancelled,
+                on_phase,
+                lambda: loop.call_soon_threadsafe(running.set),
+            )
+
+            # The timeout starts once the workflow runs, not while it waits for a
+            # thread or the degraded-mode workflow slot
+            waiting = asyncio.ensure_future(running.wait())
+            await asyncio.wait({future, waiting}, return_when=asyncio.FIRST_COMPLETED)
+            waiting.cancel()
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except TimeoutError:
+                cancelled.set()
+                result = {
+                    "status": "timeout",
+                    "errors": [f"Job timed out after {timeout:g}s"],
+                    "phase_timings": {},
+                }
+            except Exception as e:
+                result = {"status": "failed", "errors": [str(e)], "phase_timings": {}}
+
+            result = await report(job, workflow_id, started, result)
+            if not future.done():
+                # Timed out: the workflow stops at its next node boundary, or
+                # within a poll interval in nodes that watch the cancel event
+                await asyncio.gather(future, return_exceptions=True)
+        return result
+
+    try:
+        return list(await asyncio.gather(*(run_one(job) for job in jobs)))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
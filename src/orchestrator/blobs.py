@@ -0,0 +1,93 @@
+"""Content-addressed blob store for large state fields.
+
+LangGraph checkpoints the full state on every super-step, so large payloads
+such as the LLM's structure analysis or the generated pipeline YAML are
+written once to a local content-addressed store and only a short reference
+(``blob:sha256:<digest>``) is kept in state. Readers resolve references
+lazily with :func:`resolve`, which passes plain values through unchanged.
+"""
+
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from .memory import degraded_limit
+from .paths import cache_dir
+
+BLOB_REF_PREFIX = "blob:sha256:"
+
+# Values at or below this size stay inline in state
+DEFAULT_THRESHOLD_BYTES = 4096
+
+
+def _blob_path(digest: str) -> Path:
+    return cache_dir("blobs", digest[:2]) / digest
+
+
+def is_blob_ref(value: object) -> bool:
+    """Check whether a state value is a blob reference."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+
+def put_blob(content: str) -> str:
+    """Store content in the blob store.
+
+    Identical content is only ever written once.
+
+    Args:
+        content: Text to store
+
+    Returns:
+        Reference to the stored blob
+    """
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = _blob_path(digest)
+    if not path.exists():
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(zlib.compress(data))
+        os.replace(tmp_path, path)
+    return f"{BLOB_REF_PREFIX}{digest}"
+
+
+def get_blob(ref: str) -> str:
+    """Load the content behind a blob reference.
+
+    Raises:
+        ValueError: If the value is not a blob reference
+        FileNotFoundError: If the blob is missing from the local store
+    """
+    if not is_blob_ref(ref):
+        raise ValueError(f"Not a blob reference: {ref[:80]}")
+    return zlib.decompress(_blob_path(ref[len(BLOB_REF_PREFIX) :]).read_bytes()).decode("utf-8")
+
+
+def offload(content: str, threshold: Optional[int] = None) -> str:
+    """Move large content into the blob store.
+
+    Args:
+        content: Text destined for state
+        threshold: Inline size limit in bytes (defaults to
+            ``ORCHESTRATOR_BLOB_THRESHOLD_BYTES`` or 4 KiB, reduced in
+            degraded mode)
+
+    Returns:
+        A blob reference if the content is larger than the threshold,
+        otherwise the content itself
+    """
+    if threshold is None:
+        threshold = degraded_limit(
+            int(os.getenv("ORCHESTRATOR_BLOB_THRESHOLD_BYTES", DEFAULT_THRESHOLD_BYTES))
+        )
+    if len(content.encode("utf-8")) <= threshold:
+        return content
+    return put_blob(content)
+
+
+def resolve(value: Optional[str]) -> Optional[str]:
+    """Get the content of a state value that may be a blob reference."""
+    if is_blob_ref(value):
+        return get_blob(value)
+    return value
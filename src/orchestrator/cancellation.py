@@ -0,0 +1,36 @@
+"""Cancellation of a running workflow from inside long-running nodes.
+
+Batch runs and the ``serve`` worker cancel a workflow by setting an event
+that they check between nodes. Nodes that can block for a long time (the
+verify node polls Harness executions for up to an hour) also watch the
+event of the workflow they run in, so a timed-out or cancelled workflow
+gives its worker back within one poll interval instead of at the next node
+boundary.
+
+The event is carried in a context variable, which LangGraph copies into
+every node it runs.
+"""
+
+import contextlib
+import threading
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_current: ContextVar[Optional[threading.Event]] = ContextVar(
+    "orchestrator_cancel_event", default=None
+)
+
+
+@contextlib.contextmanager
+def cancellation_scope(event: threading.Event) -> Iterator[None]:
+    """Make ``event`` the cancel event of the workflow run in this context."""
+    token = _current.set(event)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_cancel_event() -> Optional[threading.Event]:
+    """Get the cancel event of the running workflow, if it has one."""
+    return _current.get()
@@ -0,0 +1,137 @@
+"""Durable local checkpointing for CLI workflow runs.
+
+Checkpoints are stored in a SQLite database (``checkpoints.sqlite`` in the
+orchestrator cache directory, or ``ORCHESTRATOR_CHECKPOINT_DB``) so a
+workflow paused for approval or interrupted by a failure can be resumed
+from its last completed node without repeating the LLM phases.
+
+The database runs in WAL mode and commits are batched: checkpoint writes
+are grouped into one transaction until the commit interval has passed since
+the first of them, the pending-write limit is hit, or the saver is flushed.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from .paths import cache_dir
+
+DEFAULT_COMMIT_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_PENDING_WRITES = 64
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """SQLite checkpointer that groups checkpoint writes into fewer commits.
+
+    A timer commits the batch once its first write has waited
+    ``commit_interval`` seconds, so a run that stalls in a long node does
+    not leave its last checkpoint uncommitted.
+
+    Args:
+        conn: SQLite connection (opened with ``check_same_thread=False``)
+        commit_interval: Maximum seconds a write may stay uncommitted
+        max_pending_writes: Maximum writes grouped into one commit
+        serde: Optional checkpoint serializer
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        commit_interval: float = DEFAULT_COMMIT_INTERVAL_SECONDS,
+        max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES,
+        serde: Any = None,
+    ) -> None:
+        super().__init__(conn, serde=serde)
+        self.commit_interval = commit_interval
+        self.max_pending_writes = max_pending_writes
+        self._pending_writes = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor, deferring the commit until the batch is due."""
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                if transaction:
+                    self._pending_writes += 1
+                    if self._pending_writes >= self.max_pending_writes:
+                        self._commit()
+                    elif self._flush_timer is None:
+                        self._flush_timer = threading.Timer(self.commit_interval, self.flush)
+                        self._flush_timer.daemon = True
+                        self._flush_timer.start()
+
+    def _commit(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._closed:
+            self.conn.commit()
+        self._pending_writes = 0
+
+    def flush(self) -> None:
+        """Commit any batched checkpoint writes."""
+        with self.lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Flush batched writes and close the database."""
+        with self.lock:
+            self._commit()
+            self._closed = True
+            self.conn.close()
+
+
+def rewind_failed_run(graph: Any, config: dict) -> bool:
+    """Make a failed run resumable from the node that failed.
+
+    Nodes report failures in the ``errors`` state field and the run then
+    continues to its end, so a failed run has no next node to resume.
+    Forking the last checkpoint taken before an error was recorded makes
+    the failed node the next one again; earlier nodes are not repeated.
+
+    Args:
+        graph: Compiled graph with a checkpointer
+        config: Run configuration carrying the thread ID
+
+    Returns:
+        True if the run was rewound, False if it did not fail
+    """
+    snapshot = graph.get_state(config)
+    if snapshot.next or not snapshot.values.get("errors"):
+        return False
+    for earlier in graph.get_state_history(config):
+        if earlier.next and not earlier.values.get("errors"):
+            graph.update_state(earlier.config, None, as_node="__copy__")
+            return True
+    return False
+
+
+def open_checkpointer(path: Optional[str] = None) -> BatchedSqliteSaver:
+    """Open the durable checkpoint database.
+
+    Args:
+        path: Database file (defaults to ``ORCHESTRATOR_CHECKPOINT_DB`` or
+            ``checkpoints.sqlite`` in the orchestrator cache directory)
+
+    Returns:
+        Checkpointer to compile the graph with; close it when done
+    """
+    path = path or os.getenv("ORCHESTRATOR_CHECKPOINT_DB") or str(
+        cache_dir() / "checkpoints.sqlite"
+    )
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return BatchedSqliteSaver(conn)
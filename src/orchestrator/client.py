@@ -0,0 +1,129 @@
+"""Thin client for the ``serve`` worker's Unix socket API.
+
+Only the standard library is imported, so submitting a job costs
+milliseconds instead of a full LangGraph/LangChain import.
+"""
+
+import http.client
+import json
+import socket
+from typing import Any, Iterator, Optional
+
+from .paths import socket_path
+
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._path)
+        self.sock = sock
+
+
+class OrchestratorClient:
+    """Client for a running ``ai-template-engine serve`` worker.
+
+    Args:
+        path: Worker socket (defaults to :func:`orchestrator.paths.socket_path`)
+
+    Raises (from every request):
+        OSError: If no worker is listening on the socket
+        RuntimeError: If the worker rejects the request
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = str(path or socket_path())
+
+    def _request(self, method: str, url: str, body: Optional[dict[str, Any]] = None) -> Any:
+        conn = _UnixHTTPConnection(self.path)
+        try:
+            data = json.dumps(body).encode("utf-8") if body is not None else None
+            headers = {"Content-Type": "application/json"} if data is not None else {}
+            conn.request(method, url, body=data, headers=headers)
+            response = conn.getresponse()
+            payload = json.loads(response.read() or b"null")
+        finally:
+            conn.close()
+        if response.status >= 400:
+            raise RuntimeError((payload or {}).get("error") or f"HTTP {response.status}")
+        return payload
+
+    def health(self) -> dict[str, Any]:
+        """Get worker and MCP server status."""
+        return self._request("GET", "/health")
+
+    def metrics(self) -> str:
+        """Get per-node usage totals in the Prometheus text format."""
+        conn = _UnixHTTPConnection(self.path)
+        try:
+            conn.request("GET", "/metrics")
+            return conn.getresponse().read().decode("utf-8")
+        finally:
+            conn.close()
+
+    def submit(
+        self,
+        repo_path: str,
+        org_id: str,
+        project_id: str,
+        repo_url: Optional[str] = None,
+        no_approval: bool = False,
+    ) -> dict[str, Any]:
+        """Submit a workflow and return its job summary (including ``workflow_id``)."""
+        return self._request(
+            "POST",
+            "/jobs",
+            {
+                "repo_path": repo_path,
+                "org_id": org_id,
+                "project_id": project_id,
+                "repo_url": repo_url,
+                "no_approval": no_approval,
+            },
+        )
+
+    def jobs(self) -> list[dict[str, Any]]:
+        """List the worker's jobs."""
+        return self._request("GET", "/jobs")
+
+    def status(self, workflow_id: str) -> dict[str, Any]:
+        """Get a job summary."""
+        return self._request("GET", f"/jobs/{workflow_id}")
+
+    def approve(self, workflow_id: str, feedback: Optional[str] = None) -> dict[str, Any]:
+        """Approve a job paused for approval."""
+        return self._request("POST", f"/jobs/{workflow_id}/approve", {"feedback": feedback})
+
+    def cancel(self, workflow_id: str) -> dict[str, Any]:
+        """Cancel a job."""
+        return self._request("POST", f"/jobs/{workflow_id}/cancel", {})
+
+    def events(self, workflow_id: str, since: int = 0) -> Iterator[dict[str, Any]]:
+        """Stream a job's events until it finishes or pauses for approval.
+
+        Args:
+            workflow_id: Job to follow
+            since: Sequence number of the first event to return
+
+        Yields:
+            Job events (``node`` and ``status`` events)
+        """
+        conn = _UnixHTTPConnection(self.path, timeout=None)
+        try:
+            conn.request("GET", f"/jobs/{workflow_id}/events?since={since}")
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise RuntimeError(json.loads(response.read()).get("error"))
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            conn.close()
@@ -0,0 +1,151 @@
+"""Compact machine-readable workflow progress events.
+
+:func:`stream_events` runs a workflow with LangGraph's ``updates`` stream
+mode, so each step yields only the keys a node changed instead of the
+whole state, and turns every node update into a small JSON-serialisable
+event:
+
+- ``start``: the run began
+- ``node``: a node finished, with the phase, timings, the first line of its
+  message and a compact view of the fields it updated
+- ``paused``: the run stopped before a node (e.g. human approval)
+- ``end``: the run finished (``status`` is ``complete`` or ``failed``)
+
+In the compact view, lists are replaced by their length, long strings by
+their size and nested objects by their key count, while blob references
+(``blob:sha256:...``) are kept so consumers can fetch large fields with
+``ai-template-engine blob``.
+"""
+
+import time
+from typing import Any, Iterator, Optional
+
+from .blobs import is_blob_ref
+
+# Strings up to this many characters are included in events verbatim
+MAX_INLINE_CHARS = 256
+
+
+def compact(value: Any, depth: int = 1) -> Any:
+    """Summarise a state value for an event.
+
+    Args:
+        value: State value
+        depth: Levels of nested objects to expand
+
+    Returns:
+        JSON-serialisable summary of the value
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if len(value) <= MAX_INLINE_CHARS or is_blob_ref(value):
+            return value
+        return {"bytes": len(value.encode("utf-8"))}
+    if isinstance(value, (list, tuple)):
+        return {"count": len(value)}
+    if isinstance(value, dict):
+        if depth <= 0:
+            return {"keys": len(value)}
+        return {key: compact(item, depth - 1) for key, item in value.items()}
+    return str(value)[:MAX_INLINE_CHARS]
+
+
+def _heading(message: Any) -> Optional[str]:
+    """First non-empty line of a message, e.g. "✅ Repository analysis complete"."""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return next((line.strip() for line in content.splitlines() if line.strip()), None)
+
+
+def update_event(node: str, update: dict[str, Any]) -> dict[str, Any]:
+    """Build the event for one node's state update.
+
+    Args:
+        node: Node name
+        update: State update returned by the node
+
+    Returns:
+        Node event without timing fields
+    """
+    event: dict[str, Any] = {"event": "node", "node": node}
+    if update.get("current_phase"):
+        event["phase"] = update["current_phase"]
+    if update.get("errors"):
+        event["errors"] = list(update["errors"])
+
+    messages = update.get("messages") or []
+    if messages:
+        event["message"] = _heading(messages[-1])
+
+    fields = {
+        key: compact(value)
+        for key, value in update.items()
+        if key not in ("messages", "current_phase", "errors")
+    }
+    if fields:
+        event["fields"] = fields
+    return event
+
+
+def stream_events(
+    graph: Any, graph_input: Optional[dict[str, Any]], config: dict
+) -> Iterator[dict[str, Any]]:
+    """Run a workflow and yield compact progress events.
+
+    Args:
+        graph: Compiled graph with a checkpointer
+        graph_input: Initial state, or None to continue from the last checkpoint
+        config: Run configuration carrying the thread ID
+
+    Yields:
+        ``start``, ``node``, then ``paused`` or ``end`` events
+    """
+    workflow_id = config["configurable"]["thread_id"]
+    started = step_started = time.monotonic()
+    errors: list[str] = []
+    yield {"event": "start", "workflow_id": workflow_id}
+
+    for chunk in graph.stream(graph_input, config=config, stream_mode="updates"):
+        now = time.monotonic()
+        for node, update in chunk.items():
+            if node.startswith("__"):  # e.g. __interrupt__
+                continue
+            event = update_event(node, update or {})
+            errors.extend(event.get("errors", []))
+            yield {
+                "event": "node",
+                "workflow_id": workflow_id,
+                **event,
+                "duration_seconds": round(now - step_started, 3),
+                "elapsed_seconds": round(now - started, 3),
+            }
+        step_started = now
+        if errors:
+            break
+
+    elapsed = round(time.monotonic() - started, 3)
+    if errors:
+        yield {
+            "event": "end",
+            "workflow_id": workflow_id,
+            "status": "failed",
+            "errors": errors,
+            "elapsed_seconds": elapsed,
+        }
+        return
+
+    pending = graph.get_state(config).next
+    if pending:
+        yield {
+            "event": "paused",
+            "workflow_id": workflow_id,
+            "next": list(pending),
+            "elapsed_seconds": elapsed,
+        }
+    else:
+        yield {
+            "event": "end",
+            "workflow_id": workflow_id,
+            "status": "complete",
+            "elapsed_seconds": elapsed,
+        }
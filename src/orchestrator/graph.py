@@ -3,19 +3,76 @@
 This module defines the complete workflow graph that will be visualized
 in LangGraph Studio. The graph coordinates all phases of the orchestration:
 initialize → analyze → extract → generate → approve → setup → verify
+
+Harness setup fans out into parallel branches (connectors/secrets,
+environments/infrastructure, services, pipeline) that are joined before
+verification.
 """
 
+import importlib
+import inspect
+from typing import Any, Callable, Optional
+
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import RetryPolicy
 
+from .memo import memoize_node
+from .metrics import instrument_node
+from .profiling import profile_node
+from .repo import repo_revision
 from .state import OrchestratorState
-from .nodes import (
-    initialize_workflow,
-    analyze_repository,
-    extract_patterns,
-    generate_templates,
-    human_approval,
-    setup_harness,
-    verify_deployment,
+from .nodes.setup import SETUP_BRANCHES, route_setup_branches
+
+
+def _lazy_node(module: str, name: str) -> Callable[[OrchestratorState], dict[str, Any]]:
+    """Node that imports its implementation from ``nodes.<module>`` on first call.
+
+    Node modules pull in the LLM and MCP client libraries, so loading them
+    lazily keeps compiling the graph (and CLI startup) cheap.
+
+    Args:
+        module: Module in the nodes package
+        name: Node function name
+
+    Returns:
+        Node function with the implementation's name
+    """
+
+    def node(state: OrchestratorState) -> dict[str, Any]:
+        implementation = getattr(importlib.import_module(f".nodes.{module}", __package__), name)
+        return implementation(state)
+
+    node.__name__ = node.__qualname__ = name
+    return node
+
+
+initialize_workflow = _lazy_node("init", "initialize_workflow")
+analyze_repository = _lazy_node("analyze", "analyze_repository")
+extract_patterns = _lazy_node("extract", "extract_patterns")
+generate_templates = _lazy_node("generate", "generate_templates")
+human_approval = _lazy_node("hitl", "human_approval")
+setup_harness = _lazy_node("setup", "setup_harness")
+setup_connectors = _lazy_node("setup", "setup_connectors")
+setup_environments = _lazy_node("setup", "setup_environments")
+setup_services = _lazy_node("setup", "setup_services")
+setup_pipeline = _lazy_node("setup", "setup_pipeline")
+finalize_setup = _lazy_node("setup", "finalize_setup")
+verify_deployment = _lazy_node("verify", "verify_deployment")
+
+# Versions of memoized nodes; bump one to invalidate its recorded results
+NODE_VERSIONS = {
+    "analyze": "6",
+    "extract": "3",
+    "generate": "4",
+}
+
+# Setup branches retry independently; a branch that still fails leaves the
+# other branches' results checkpointed so a resume only re-runs that branch
+SETUP_RETRY_POLICY = RetryPolicy(max_attempts=3)
+
+# LangGraph renamed add_node's ``retry`` argument to ``retry_policy`` in 0.5
+_RETRY_KWARG = (
+    "retry_policy" if "retry_policy" in inspect.signature(StateGraph.add_node).parameters else "retry"
 )
 
 
@@ -51,14 +108,54 @@ def should_continue_workflow(state: OrchestratorState) -> str:
 # Create the workflow graph
 workflow = StateGraph(OrchestratorState)
 
+
+def _add_node(name: str, node: Callable[[OrchestratorState], dict[str, Any]], **kwargs: Any) -> None:
+    """Add a node, instrumented so its usage is recorded under ``metrics``.
+
+    The node is also sampled by the profiler when profiling is enabled.
+    """
+    workflow.add_node(name, instrument_node(profile_node(node, name), name), **kwargs)
+
+
 # Add nodes to the graph
-workflow.add_node("init", initialize_workflow)
-workflow.add_node("analyze", analyze_repository)
-workflow.add_node("extract", extract_patterns)
-workflow.add_node("generate", generate_templates)
-workflow.add_node("approval", human_approval)
-workflow.add_node("setup", setup_harness)
-workflow.add_node("verify", verify_deployment)
+_add_node("init", initialize_workflow)
+# Analysis phases are memoized on the state they read, so re-runs with
+# unchanged inputs replay their results instead of calling the LLM again
+_add_node(
+    "analyze",
+    memoize_node(
+        analyze_repository,
+        reads=("target_repo_path", "target_repo_url"),
+        version=NODE_VERSIONS["analyze"],
+        key_extra=lambda state: repo_revision(state["target_repo_path"]),
+    ),
+)
+_add_node(
+    "extract",
+    memoize_node(
+        extract_patterns,
+        reads=("repository_analysis",),
+        version=NODE_VERSIONS["extract"],
+    ),
+)
+_add_node(
+    "generate",
+    memoize_node(
+        generate_templates,
+        reads=("repository_analysis", "extracted_patterns", "warnings"),
+        version=NODE_VERSIONS["generate"],
+        # Translates the repository's CI files, which the analysis only lists
+        key_extra=lambda state: repo_revision(state["target_repo_path"]),
+    ),
+)
+_add_node("approval", human_approval)
+_add_node("setup", setup_harness)
+_add_node("setup_connectors", setup_connectors, **{_RETRY_KWARG: SETUP_RETRY_POLICY})
+_add_node("setup_environments", setup_environments, **{_RETRY_KWARG: SETUP_RETRY_POLICY})
+_add_node("setup_services", setup_services, **{_RETRY_KWARG: SETUP_RETRY_POLICY})
+_add_node("setup_pipeline", setup_pipeline, **{_RETRY_KWARG: SETUP_RETRY_POLICY})
+_add_node("setup_finalize", finalize_setup)
+_add_node("verify", verify_deployment)
 
 # Define edges (workflow flow)
 workflow.add_edge(START, "init")
@@ -86,7 +183,10 @@ workflow.add_conditional_edges(
     },
 )
 
-workflow.add_edge("setup", "verify")
+# Fan out to the independent setup branches (same super-step), then join
+workflow.add_conditional_edges("setup", route_setup_branches, [*SETUP_BRANCHES, "verify"])
+workflow.add_edge(SETUP_BRANCHES, "setup_finalize")
+workflow.add_edge("setup_finalize", "verify")
 
 # Conditional edge for completion
 workflow.add_conditional_edges(
@@ -102,13 +202,28 @@ workflow.add_conditional_edges(
 # Add error handling edge
 workflow.add_edge("init", END)  # Allow early exit from init if errors
 
+
+def build_graph(checkpointer: Optional[Any] = None) -> Any:
+    """Compile the workflow graph.
+
+    Args:
+        checkpointer: Checkpointer for durable runs (e.g. the CLI's SQLite
+            checkpointer). LangGraph Studio supplies its own persistence.
+
+    Returns:
+        Compiled graph that pauses before the approval node
+    """
+    return workflow.compile(
+        checkpointer=checkpointer,
+        interrupt_before=["approval"],  # Pause before approval node
+    )
+
+
 # Compile the graph for LangGraph Studio
 # LangGraph API handles persistence automatically, no custom checkpointer needed
 # This enables the graph to pause at interrupts (like human approval)
-graph = workflow.compile(
-    interrupt_before=["approval"],  # Pause before approval node
-)
+graph = build_graph()
 
 # Export for LangGraph Studio
 # The langgraph.json file points to this variable
-__all__ = ["graph"]
+__all__ = ["build_graph", "graph"]
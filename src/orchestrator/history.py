@@ -0,0 +1,134 @@
+"""Bounded conversation history for the orchestrator state.
+
+``messages`` is checkpointed on every super-step and may be passed to the
+model, so it must not grow without bound in long-lived threads (e.g. Studio
+sessions with repeated approval loops). The :func:`bounded_add_messages`
+reducer keeps the most recent messages verbatim and folds older ones into a
+single compact summary message.
+
+Retention is configured with environment variables:
+
+- ``ORCHESTRATOR_HISTORY_MAX_MESSAGES``: messages kept verbatim (default 20)
+- ``ORCHESTRATOR_HISTORY_MAX_BYTES``: byte cap on verbatim messages (default 64 KiB)
+- ``ORCHESTRATOR_HISTORY_MAX_TOKENS``: approximate token cap on verbatim
+  messages (default 16000)
+- ``ORCHESTRATOR_HISTORY_SUMMARY_BYTES``: byte cap on the summary (default 4 KiB)
+
+The caps shrink while the process runs in degraded mode (see
+:mod:`orchestrator.memory`).
+"""
+
+import os
+from typing import TYPE_CHECKING, Any
+
+from .memory import degraded_limit
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: state.py (and so the CLI) imports this module
+    from langchain_core.messages import BaseMessage
+
+HISTORY_SUMMARY_ID = "history-summary"
+
+DEFAULT_MAX_MESSAGES = 20
+DEFAULT_MAX_BYTES = 64 * 1024
+DEFAULT_MAX_TOKENS = 16000
+DEFAULT_SUMMARY_BYTES = 4096
+
+# Characters of each folded message kept in the summary
+SUMMARY_LINE_CHARS = 160
+
+
+def _text(message: "BaseMessage") -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+    )
+
+
+def _approx_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for the history cap."""
+    return len(text) // 4 + 1
+
+
+def _summary_line(message: "BaseMessage") -> str:
+    """One-line digest of a folded message: its type and first non-empty line."""
+    first_line = next((line.strip() for line in _text(message).splitlines() if line.strip()), "")
+    if len(first_line) > SUMMARY_LINE_CHARS:
+        first_line = first_line[: SUMMARY_LINE_CHARS - 1] + "…"
+    return f"- [{message.type}] {first_line}"
+
+
+def trim_history(
+    messages: list["BaseMessage"],
+    max_messages: int = DEFAULT_MAX_MESSAGES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    summary_bytes: int = DEFAULT_SUMMARY_BYTES,
+) -> list["BaseMessage"]:
+    """Keep the newest messages verbatim and fold the rest into a summary.
+
+    The newest message is always kept verbatim. Tool results are never kept
+    without the message that requested them.
+
+    Args:
+        messages: Full message history (may start with a previous summary)
+        max_messages: Maximum messages kept verbatim
+        max_bytes: Maximum total size of verbatim messages
+        max_tokens: Maximum approximate tokens of verbatim messages
+        summary_bytes: Maximum size of the summary message
+
+    Returns:
+        Bounded history: an optional summary message followed by recent messages
+    """
+    history = messages
+    previous_summary = ""
+    if messages and messages[0].id == HISTORY_SUMMARY_ID:
+        previous_summary = _text(messages[0])
+        messages = messages[1:]
+
+    keep = messages[-max_messages:] if max_messages > 0 else messages[-1:]
+    sizes = [len(_text(m).encode("utf-8")) for m in keep]
+    tokens = [_approx_tokens(_text(m)) for m in keep]
+    while len(keep) > 1 and (sum(sizes) > max_bytes or sum(tokens) > max_tokens):
+        keep, sizes, tokens = keep[1:], sizes[1:], tokens[1:]
+    while len(keep) > 1 and keep[0].type == "tool":
+        keep = keep[1:]
+
+    folded = messages[: len(messages) - len(keep)]
+    if not folded:
+        return history
+
+    lines = [line for line in previous_summary.splitlines()[1:] if line.startswith("- ")]
+    lines.extend(_summary_line(m) for m in folded)
+
+    # Drop the oldest digest lines until the summary fits its byte cap
+    header = "Summary of earlier messages:"
+    while lines and len("\n".join([header, *lines]).encode("utf-8")) > summary_bytes:
+        lines.pop(0)
+
+    from langchain_core.messages import SystemMessage
+
+    summary = SystemMessage(content="\n".join([header, *lines]), id=HISTORY_SUMMARY_ID)
+    return [summary, *keep]
+
+
+def bounded_add_messages(left: Any, right: Any) -> list["BaseMessage"]:
+    """Reducer: ``add_messages`` followed by the configured retention policy."""
+    from langgraph.graph.message import add_messages
+
+    merged = add_messages(left, right)
+    return trim_history(
+        merged,
+        max_messages=degraded_limit(
+            int(os.getenv("ORCHESTRATOR_HISTORY_MAX_MESSAGES", DEFAULT_MAX_MESSAGES))
+        ),
+        max_bytes=degraded_limit(int(os.getenv("ORCHESTRATOR_HISTORY_MAX_BYTES", DEFAULT_MAX_BYTES))),
+        max_tokens=degraded_limit(
+            int(os.getenv("ORCHESTRATOR_HISTORY_MAX_TOKENS", DEFAULT_MAX_TOKENS))
+        ),
+        summary_bytes=degraded_limit(
+            int(os.getenv("ORCHESTRATOR_HISTORY_SUMMARY_BYTES", DEFAULT_SUMMARY_BYTES))
+        ),
+    )
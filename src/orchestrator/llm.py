@@ -0,0 +1,44 @@
+"""Shared chat model clients.
+
+Nodes get their chat model from :func:`get_chat_model` instead of
+constructing one per call, so a long-lived process (such as the ``serve``
+worker) reuses one client - and its HTTP connection pool - per model.
+
+When ``ORCHESTRATOR_REPLAY_MODE`` is set the client is wrapped to record or
+replay its exchanges (see :mod:`orchestrator.replay`).
+"""
+
+import functools
+from typing import Any
+
+from .metrics import UsageCallbackHandler
+from .replay import get_recorder, replay_chat_model
+
+DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+
+
+@functools.cache
+def get_chat_model(model: str = DEFAULT_MODEL, temperature: float = 0) -> Any:
+    """Get the shared chat model client for a model configuration.
+
+    Args:
+        model: Anthropic model name
+        temperature: Sampling temperature
+
+    Returns:
+        ChatAnthropic instance, created on first use and reused afterwards
+    """
+    # Token usage and cost are attributed to the node making each request
+    callbacks = [UsageCallbackHandler(model)]
+
+    recorder = get_recorder()
+    if recorder is not None and recorder.replaying:
+        return replay_chat_model(model, None, recorder, callbacks=callbacks)
+
+    # Imported here: loading the Anthropic client is slow and not needed at startup
+    from langchain_anthropic import ChatAnthropic
+
+    if recorder is not None:
+        chat_model = ChatAnthropic(model=model, temperature=temperature)
+        return replay_chat_model(model, chat_model, recorder, callbacks=callbacks)
+    return ChatAnthropic(model=model, temperature=temperature, callbacks=callbacks)
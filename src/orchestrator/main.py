@@ -1,22 +1,188 @@
 """CLI interface for the AI Template Engine orchestrator."""
 
+import asyncio
 import datetime
+import json
+import os
 import sys
-from typing import Optional
+import uuid
+from collections import Counter
+from enum import StrEnum
+from typing import Any, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 
-from .graph import graph
-from .state import OrchestratorState
+from .batch import (
+    DEFAULT_JOB_TIMEOUT_SECONDS,
+    DEFAULT_WORKERS,
+    BatchJob,
+    BatchResult,
+    load_manifest,
+    run_batch,
+)
+from .state import create_initial_state
 
 app = typer.Typer(
     name="ai-template-engine",
     help="LangGraph-based orchestration for automated Harness CI/CD setup",
 )
 console = Console()
+# Human-readable notes go to stderr when stdout carries JSONL events
+err_console = Console(stderr=True)
+
+
+class OutputFormat(StrEnum):
+    """Progress output formats for workflow commands."""
+
+    rich = "rich"  # Rendered console output
+    jsonl = "jsonl"  # One compact JSON event per node update on stdout
+
+
+def _emit_events(graph: Any, graph_input: Optional[dict[str, Any]], config: dict) -> None:
+    """Stream a workflow run as JSONL events on stdout, exiting 1 if it fails.
+
+    Args:
+        graph: Compiled graph with a checkpointer
+        graph_input: Initial state, or None to continue from the last checkpoint
+        config: Run configuration carrying the thread ID
+    """
+    from .events import stream_events
+
+    for event in stream_events(graph, graph_input, config):
+        sys.stdout.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+        if event["event"] == "end" and event["status"] == "failed":
+            sys.exit(1)
+
+
+def _emit_failure(workflow_id: str, error: Exception) -> None:
+    """Write a failed ``end`` event for an exception raised outside the stream."""
+    event = {"event": "end", "workflow_id": workflow_id, "status": "failed", "errors": [str(error)]}
+    sys.stdout.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _print_metrics(metrics: dict[str, Any]) -> None:
+    """Print the per-node timing, token and MCP usage of a run."""
+    if not metrics:
+        return
+
+    # Peak allocations are only recorded when memory tracking is enabled
+    peaks = any("peak_alloc_bytes" in values for values in metrics.values())
+
+    table = Table(title="Node metrics", title_justify="left")
+    table.add_column("Node", no_wrap=True)
+    for column in ("Wall s", "CPU s", "LLM calls", "Tokens in/out", "Cached", "Cost $", "MCP calls", "MCP s"):
+        table.add_column(column, justify="right")
+    if peaks:
+        table.add_column("Peak MiB", justify="right")
+    for node, values in metrics.items():
+        peak = [f"{values.get('peak_alloc_bytes', 0) / 2**20:.1f}"] if peaks else []
+        table.add_row(
+            node,
+            f"{values.get('wall_seconds', 0):.2f}",
+            f"{values.get('cpu_seconds', 0):.2f}",
+            str(values.get("llm_calls", 0)),
+            f"{values.get('input_tokens', 0)}/{values.get('output_tokens', 0)}",
+            str(values.get("cached_tokens", 0)),
+            f"{values.get('cost_usd', 0):.4f}",
+            str(values.get("mcp_calls", 0)),
+            f"{values.get('mcp_seconds', 0):.2f}",
+            *peak,
+        )
+    console.print(table)
+
+
+def _print_profile(workflow_id: str, notes: Console) -> None:
+    """Print the hottest functions sampled by the node profiler during a run."""
+    from .profiling import hot_functions, profile_dir
+
+    functions = hot_functions(workflow_id)
+    if not functions:
+        return
+
+    table = Table(title="Hot functions (profiled samples)", title_justify="left")
+    table.add_column("Function", overflow="fold")
+    table.add_column("Self", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Share", justify="right")
+    table.add_column("Nodes")
+    for function in functions:
+        table.add_row(
+            function["function"],
+            str(function["self"]),
+            str(function["total"]),
+            f"{function['share']:.1%}",
+            ", ".join(function["nodes"]),
+        )
+    notes.print(table)
+    notes.print(f"[dim]Folded stacks per node: {profile_dir(workflow_id)}[/dim]")
+
+
+def _run_workflow(graph: Any, graph_input: Optional[dict[str, Any]], config: dict) -> None:
+    """Stream a workflow run to the console until it completes or pauses.
+
+    Args:
+        graph: Compiled graph with a checkpointer
+        graph_input: Initial state, or None to continue from the last checkpoint
+        config: Run configuration carrying the thread ID
+    """
+    workflow_id = config["configurable"]["thread_id"]
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Initializing workflow...", total=None)
+        last_message_id = None
+
+        # Stream the graph execution
+        for event in graph.stream(graph_input, config=config, stream_mode="values"):
+            phase = event.get("current_phase", "unknown")
+            progress.update(task, description=f"Phase: {phase}")
+
+            # Print any new messages (parallel branches emit steps without one)
+            messages = event.get("messages", [])
+            if messages and messages[-1].id != last_message_id:
+                last_message = messages[-1]
+                last_message_id = last_message.id
+                console.print(f"\n{last_message.content}\n")
+
+            # Check for errors
+            errors = event.get("errors", [])
+            if errors:
+                console.print(f"[bold red]Errors: {', '.join(errors)}[/bold red]")
+                console.print(f"[dim]Workflow ID: {workflow_id}[/dim]")
+                sys.exit(1)
+
+            # Check for completion
+            if phase == "complete":
+                break
+
+    snapshot = graph.get_state(config)
+    _print_metrics(snapshot.values.get("metrics") or {})
+
+    # Handle approval interrupt - the checkpoint keeps all work done so far
+    if snapshot.next:
+        console.print("\n[yellow]⏸ Workflow paused for human approval[/yellow]")
+        console.print(
+            f"[dim]To approve: ai-template-engine resume {workflow_id} --approve[/dim]"
+        )
+        console.print(
+            "[dim]In LangGraph Studio, you can interact with the paused workflow[/dim]\n"
+        )
+        return
+
+    console.print(
+        Panel.fit(
+            "✅ Orchestration Complete!",
+            border_style="bold green",
+        )
+    )
 
 
 @app.command()
@@ -26,7 +192,15 @@ def orchestrate(
     org_id: str = typer.Option(..., "--org", "-o", help="Harness organization ID"),
     project_id: str = typer.Option(..., "--project", "-p", help="Harness project ID"),
     no_approval: bool = typer.Option(
-        False, "--no-approval", help="Skip human approval step"
+        False,
+        "--no-approval",
+        help="Skip human approval step (verified pipelines are still recorded for reuse)",
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.rich, "--output", help="rich console output or jsonl progress events"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Sample every node and summarise the hottest functions"
     ),
 ) -> None:
     """Run the complete orchestration workflow.
@@ -39,95 +213,373 @@ def orchestrate(
     5. Setup Harness platform
     6. Verify deployment
 
+    Progress is checkpointed locally; a paused or failed run can be
+    continued with `ai-template-engine resume <workflow_id>`.
+
+    With `--output jsonl`, console rendering is skipped and one compact JSON
+    event per node update is written to stdout for automation.
+
+    With `--profile`, every node is sampled; folded stacks are written per
+    node under the cache directory and the hottest functions are printed.
+
     Example:
         ai-template-engine /path/to/repo --org my-org --project my-project
     """
+    if output is OutputFormat.rich:
+        console.print(
+            Panel.fit(
+                "🚀 AI Template Engine - Harness Orchestration",
+                border_style="bold blue",
+            )
+        )
+
+    workflow_id = str(uuid.uuid4())
+
+    # Create initial state
+    initial_state = create_initial_state(
+        repo_path,
+        org_id,
+        project_id,
+        repo_url=repo_url,
+        workflow_id=workflow_id,
+        no_approval=no_approval,
+    )
+
+    from .checkpoint import open_checkpointer
+    from .graph import build_graph
+
+    # Run the workflow, using the workflow ID as the checkpoint thread
+    config = {"configurable": {"thread_id": workflow_id}}
+    checkpointer = open_checkpointer()
+    if profile:
+        os.environ["ORCHESTRATOR_PROFILE"] = "1"
+
+    try:
+        if output is OutputFormat.jsonl:
+            _emit_events(build_graph(checkpointer), initial_state, config)
+        else:
+            _run_workflow(build_graph(checkpointer), initial_state, config)
+
+    except Exception as e:
+        if output is OutputFormat.jsonl:
+            _emit_failure(workflow_id, e)
+            sys.exit(1)
+        console.print(f"[bold red]Orchestration failed: {str(e)}[/bold red]")
+        console.print(f"[dim]Resume with: ai-template-engine resume {workflow_id}[/dim]")
+        sys.exit(1)
+
+    finally:
+        checkpointer.close()
+        if profile:
+            _print_profile(workflow_id, err_console if output is OutputFormat.jsonl else console)
+
+
+@app.command()
+def resume(
+    workflow_id: str = typer.Argument(..., help="Workflow ID of the run to continue"),
+    approve: bool = typer.Option(
+        False, "--approve", help="Approve the generated templates before continuing"
+    ),
+    feedback: Optional[str] = typer.Option(None, help="Approval feedback to record"),
+    output: OutputFormat = typer.Option(
+        OutputFormat.rich, "--output", help="rich console output or jsonl progress events"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Sample every node and summarise the hottest functions"
+    ),
+) -> None:
+    """Continue a checkpointed workflow from its last completed node.
+
+    Use this after the approval pause (with --approve) or after a failure, which
+    is retried from the node that failed; completed phases such as analysis
+    and generation are not repeated.
+
+    Example:
+        ai-template-engine resume 3f2c... --approve
+    """
+    from .checkpoint import open_checkpointer, rewind_failed_run
+    from .graph import build_graph
+
+    config = {"configurable": {"thread_id": workflow_id}}
+    checkpointer = open_checkpointer()
+    notes = err_console if output is OutputFormat.jsonl else console
+    if profile:
+        os.environ["ORCHESTRATOR_PROFILE"] = "1"
+
+    try:
+        graph = build_graph(checkpointer)
+        snapshot = graph.get_state(config)
+        if not snapshot.values:
+            notes.print(f"[bold red]No checkpoint found for workflow {workflow_id}[/bold red]")
+            sys.exit(1)
+        if rewind_failed_run(graph, config):
+            notes.print(
+                f"[yellow]Retrying after: {', '.join(snapshot.values['errors'])}[/yellow]"
+            )
+        elif not snapshot.next and not approve:
+            notes.print(f"[yellow]Workflow {workflow_id} has already finished[/yellow]")
+            return
+
+        if approve:
+            graph.update_state(config, {"hitl_approved": True, "hitl_feedback": feedback})
+            notes.print("[green]✅ Approval recorded[/green]")
+
+        notes.print(
+            f"[dim]Resuming workflow {workflow_id} at: {', '.join(graph.get_state(config).next)}[/dim]"
+        )
+        if output is OutputFormat.jsonl:
+            _emit_events(graph, None, config)
+        else:
+            _run_workflow(graph, None, config)
+
+    except Exception as e:
+        if output is OutputFormat.jsonl:
+            _emit_failure(workflow_id, e)
+            sys.exit(1)
+        console.print(f"[bold red]Resume failed: {str(e)}[/bold red]")
+        sys.exit(1)
+
+    finally:
+        checkpointer.close()
+        if profile:
+            _print_profile(workflow_id, notes)
+
+
+@app.command("orchestrate-batch")
+def orchestrate_batch(
+    manifest: str = typer.Argument(..., help="CSV or JSONL manifest of repo_path/org_id/project_id rows"),
+    report: str = typer.Option("batch-report.jsonl", help="JSONL report file to append results to"),
+    workers: int = typer.Option(DEFAULT_WORKERS, "--workers", "-w", help="Concurrent workflows"),
+    timeout: float = typer.Option(
+        DEFAULT_JOB_TIMEOUT_SECONDS, "--timeout", help="Per-repository timeout in seconds"
+    ),
+    no_approval: bool = typer.Option(
+        False,
+        "--no-approval",
+        help="Skip human approval step (verified pipelines are still recorded for reuse)",
+    ),
+) -> None:
+    """Run the orchestration workflow for every repository in a manifest.
+
+    Repositories run concurrently; one failing or hung repository does not
+    hold up the others. Each finished repository is appended to the report
+    with its workflow ID, outcome and per-phase timings. Runs paused for
+    approval can be continued with `ai-template-engine resume <workflow_id>`.
+
+    Example:
+        ai-template-engine orchestrate-batch repos.csv --workers 8
+    """
+    try:
+        jobs = load_manifest(manifest)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Cannot read manifest: {str(e)}[/bold red]")
+        sys.exit(1)
+
     console.print(
         Panel.fit(
-            "🚀 AI Template Engine - Harness Orchestration",
+            f"🚀 AI Template Engine - Batch Orchestration\n\n"
+            f"{len(jobs)} repositories, {workers} workers",
             border_style="bold blue",
         )
     )
 
-    # Create initial state
-    initial_state: OrchestratorState = {
-        "messages": [],
-        "current_phase": "init",
-        "target_repo_path": repo_path,
-        "target_repo_url": repo_url,
-        "harness_org_id": org_id,
-        "harness_project_id": project_id,
-        "repository_analysis": None,
-        "extracted_patterns": None,
-        "generated_templates": None,
-        "harness_setup": None,
-        "deployment_verification": None,
-        "hitl_required": not no_approval,
-        "hitl_approved": no_approval,  # Auto-approve if flag set
-        "hitl_feedback": None,
-        "errors": [],
-        "warnings": [],
-        "workflow_id": "",
-        "started_at": "",
-        "completed_at": None,
-        "total_duration_seconds": None,
+    status_styles = {
+        "complete": "green",
+        "awaiting_approval": "yellow",
+        "failed": "red",
+        "timeout": "red",
     }
 
-    # Run the workflow
-    config = {"configurable": {"thread_id": "orchestration-session"}}
-
-    try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Initializing workflow...", total=None)
-
-            # Stream the graph execution
-            for event in graph.stream(initial_state, config=config, stream_mode="values"):
-                phase = event.get("current_phase", "unknown")
-                progress.update(task, description=f"Phase: {phase}")
-
-                # Print any new messages
-                messages = event.get("messages", [])
-                if messages:
-                    last_message = messages[-1]
-                    console.print(f"\n{last_message.content}\n")
-
-                # Check for errors
-                errors = event.get("errors", [])
-                if errors:
-                    console.print(f"[bold red]Errors: {', '.join(errors)}[/bold red]")
-                    sys.exit(1)
-
-                # Handle approval interrupt
-                if phase == "approval" and not event.get("hitl_approved"):
-                    console.print(
-                        "\n[yellow]⏸ Workflow paused for human approval[/yellow]"
-                    )
-                    console.print(
-                        "[dim]To approve: Update the graph state with hitl_approved=True[/dim]"
-                    )
-                    console.print(
-                        "[dim]In LangGraph Studio, you can interact with the paused workflow[/dim]\n"
-                    )
-                    # In CLI mode, we can't interactively approve, so exit
-                    sys.exit(0)
-
-                # Check for completion
-                if phase == "complete":
-                    break
+    def on_phase(job: BatchJob, node: str) -> None:
+        console.print(f"[dim]{job['repo_path']}: {node}[/dim]")
 
+    def on_result(result: BatchResult) -> None:
+        style = status_styles.get(result["status"], "white")
         console.print(
-            Panel.fit(
-                "✅ Orchestration Complete!",
-                border_style="bold green",
+            f"[{style}]{result['status']}[/{style}] {result['repo_path']} "
+            f"({result['duration_seconds']:.1f}s, workflow {result['workflow_id']})"
+        )
+
+    from .checkpoint import open_checkpointer
+    from .graph import build_graph
+
+    checkpointer = open_checkpointer()
+    try:
+        results = asyncio.run(
+            run_batch(
+                build_graph(checkpointer),
+                jobs,
+                report,
+                workers=workers,
+                timeout=timeout,
+                no_approval=no_approval,
+                on_phase=on_phase,
+                on_result=on_result,
             )
         )
+    finally:
+        checkpointer.close()
 
-    except Exception as e:
-        console.print(f"[bold red]Orchestration failed: {str(e)}[/bold red]")
+    counts = Counter(result["status"] for result in results)
+    console.print(
+        Panel.fit(
+            "\n".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+            + f"\n\nReport: {report}",
+            title="Batch summary",
+            border_style="bold green" if counts.keys() <= {"complete", "awaiting_approval"} else "bold red",
+        )
+    )
+    if counts["failed"] or counts["timeout"]:
+        sys.exit(1)
+
+
+@app.command()
+def serve(
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket to listen on (default: ORCHESTRATOR_SOCKET or the cache dir)"
+    ),
+    workers: int = typer.Option(4, "--workers", "-w", help="Concurrently running jobs"),
+    warm_mcp: bool = typer.Option(
+        True, "--warm-mcp/--no-warm-mcp", help="Start MCP servers before the first job"
+    ),
+) -> None:
+    """Run a long-lived worker that serves orchestration jobs over a local socket.
+
+    The worker keeps the compiled graph, chat model clients and MCP server
+    sessions warm, so jobs submitted with `ai-template-engine submit` start
+    in milliseconds.
+
+    Example:
+        ai-template-engine serve --workers 8
+    """
+    from .checkpoint import open_checkpointer
+    from .graph import build_graph
+    from .server import OrchestratorWorker, create_server, warm_up
+
+    checkpointer = open_checkpointer()
+    worker = OrchestratorWorker(build_graph(checkpointer), workers=workers)
+    try:
+        server = create_server(worker, socket_path)
+    except RuntimeError as e:
+        console.print(f"[bold red]{str(e)}[/bold red]")
+        checkpointer.close()
+        sys.exit(1)
+
+    for warning in warm_up(start_mcp_servers=warm_mcp):
+        console.print(f"[yellow]Warning: {warning}[/yellow]")
+
+    console.print(
+        Panel.fit(
+            f"🛰 AI Template Engine worker listening on {server.server_address}\n"
+            f"{workers} workers",
+            border_style="bold blue",
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Worker stopped[/yellow]")
+    finally:
+        server.server_close()
+        os.unlink(server.server_address)
+        worker.shutdown()
+        checkpointer.close()
+
+
+def _follow_job(client: Any, workflow_id: str, since: int = 0) -> None:
+    """Print a worker job's messages until it finishes or pauses for approval."""
+    status = None
+    errors: list[str] = []
+    for event in client.events(workflow_id, since):
+        if event["type"] == "node" and event.get("message"):
+            console.print(f"\n{event['message']}\n")
+        elif event["type"] == "status":
+            status, errors = event["status"], event.get("errors", [])
+
+    if status == "awaiting_approval":
+        console.print("\n[yellow]⏸ Job paused for human approval[/yellow]")
+        console.print(f"[dim]To approve: ai-template-engine approve-job {workflow_id}[/dim]")
+    elif status == "complete":
+        console.print(Panel.fit("✅ Orchestration Complete!", border_style="bold green"))
+    else:
+        console.print(f"[bold red]Job {status}: {', '.join(errors)}[/bold red]")
+        console.print(f"[dim]Workflow ID: {workflow_id}[/dim]")
+        sys.exit(1)
+
+
+@app.command()
+def submit(
+    repo_path: str = typer.Argument(..., help="Path to the target repository"),
+    repo_url: Optional[str] = typer.Option(None, help="Repository URL (optional)"),
+    org_id: str = typer.Option(..., "--org", "-o", help="Harness organization ID"),
+    project_id: str = typer.Option(..., "--project", "-p", help="Harness project ID"),
+    no_approval: bool = typer.Option(
+        False,
+        "--no-approval",
+        help="Skip human approval step (verified pipelines are still recorded for reuse)",
+    ),
+    follow: bool = typer.Option(
+        True, "--follow/--detach", help="Stream the job's progress until it stops"
+    ),
+) -> None:
+    """Submit an orchestration job to a running `serve` worker.
+
+    Example:
+        ai-template-engine submit /path/to/repo --org my-org --project my-project
+    """
+    from .client import OrchestratorClient
+
+    client = OrchestratorClient()
+    try:
+        job = client.submit(repo_path, org_id, project_id, repo_url=repo_url, no_approval=no_approval)
+        console.print(f"[dim]Workflow ID: {job['workflow_id']}[/dim]")
+        if follow:
+            _follow_job(client, job["workflow_id"])
+    except OSError as e:
+        console.print(f"[bold red]No worker reachable at {client.path}: {str(e)}[/bold red]")
+        console.print("[dim]Start one with: ai-template-engine serve[/dim]")
+        sys.exit(1)
+    except RuntimeError as e:
+        console.print(f"[bold red]Submit failed: {str(e)}[/bold red]")
+        sys.exit(1)
+
+
+@app.command("approve-job")
+def approve_job(
+    workflow_id: str = typer.Argument(..., help="Workflow ID of the paused worker job"),
+    feedback: Optional[str] = typer.Option(None, help="Approval feedback to record"),
+    follow: bool = typer.Option(
+        True, "--follow/--detach", help="Stream the job's progress until it stops"
+    ),
+) -> None:
+    """Approve a `serve` worker job paused for approval and continue it."""
+    from .client import OrchestratorClient
+
+    client = OrchestratorClient()
+    try:
+        # Follow only what happens after the pause
+        since = client.status(workflow_id)["events"]
+        client.approve(workflow_id, feedback)
+        console.print("[green]✅ Approval recorded[/green]")
+        if follow:
+            _follow_job(client, workflow_id, since)
+    except (OSError, RuntimeError) as e:
+        console.print(f"[bold red]Approve failed: {str(e)}[/bold red]")
+        sys.exit(1)
+
+
+@app.command("cancel-job")
+def cancel_job(
+    workflow_id: str = typer.Argument(..., help="Workflow ID of the worker job"),
+) -> None:
+    """Cancel a `serve` worker job at its next node boundary."""
+    from .client import OrchestratorClient
+
+    try:
+        job = OrchestratorClient().cancel(workflow_id)
+        console.print(f"[yellow]Cancellation requested (job is {job['status']})[/yellow]")
+    except (OSError, RuntimeError) as e:
+        console.print(f"[bold red]Cancel failed: {str(e)}[/bold red]")
         sys.exit(1)
 
 
@@ -162,6 +614,20 @@ def studio() -> None:
         console.print("\n[yellow]Studio server stopped[/yellow]")
 
 
+@app.command()
+def blob(
+    ref: str = typer.Argument(..., help="Blob reference (blob:sha256:...) from workflow state"),
+) -> None:
+    """Print a large state field that was offloaded to the blob store."""
+    from .blobs import get_blob
+
+    try:
+        console.print(get_blob(ref), markup=False, highlight=False)
+    except (ValueError, FileNotFoundError) as e:
+        console.print(f"[bold red]Cannot read blob: {str(e)}[/bold red]")
+        sys.exit(1)
+
+
 @app.command()
 def version() -> None:
     """Show version information."""
@@ -172,7 +638,19 @@ def version() -> None:
 
 def main() -> None:
     """Entry point for the CLI."""
-    app()
+    try:
+        app()
+    finally:
+        # Terminate warm MCP servers before the interpreter exits (the pool
+        # module is only loaded if a command used MCP tools)
+        pool = sys.modules.get(f"{__package__}.tools.mcp_pool")
+        if pool is not None:
+            pool.shutdown_session_pool()
+
+        # Export node metrics for Prometheus' textfile collector, if configured
+        metrics = sys.modules.get(f"{__package__}.metrics")
+        if metrics is not None:
+            metrics.write_prometheus()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+"""Input-hash memoization of workflow nodes across runs.
+
+A memoized node hashes the slice of state it reads (plus the node name and
+version). When the same hash has been seen before, in any thread or
+workflow, the recorded state update is returned instead of running the
+node. Bump a node's version to invalidate its recorded results.
+
+Set ``ORCHESTRATOR_MEMOIZE=0`` to disable memoization.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Callable, Optional
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .paths import cache_dir
+
+_serde = JsonPlusSerializer()
+
+
+def memoization_enabled() -> bool:
+    """Check whether node memoization is enabled."""
+    return os.getenv("ORCHESTRATOR_MEMOIZE", "1").lower() not in ("0", "false", "no")
+
+
+def input_hash(
+    node_name: str, version: str, state: dict[str, Any], reads: tuple[str, ...], extra: str = ""
+) -> str:
+    """Hash the state slice a node reads.
+
+    Args:
+        node_name: Node name
+        version: Node version; changing it invalidates recorded results
+        state: Current state
+        reads: State keys the node depends on
+        extra: Additional key material (e.g. the repository revision)
+
+    Returns:
+        Hex digest of the node's inputs
+    """
+    payload = json.dumps(
+        [node_name, version, extra, {key: state.get(key) for key in reads}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_update(node_name: str, key: str) -> Optional[dict[str, Any]]:
+    """Load a recorded state update, or None if the inputs were never seen."""
+    path = cache_dir("memo", node_name) / key
+    try:
+        type_name, _, data = path.read_bytes().partition(b"\n")
+        return _serde.loads_typed((type_name.decode("ascii"), data))
+    except (OSError, ValueError):
+        return None
+
+
+def save_update(node_name: str, key: str, update: dict[str, Any]) -> None:
+    """Record the state update a node produced for the given inputs."""
+    path = cache_dir("memo", node_name) / key
+    type_name, data = _serde.dumps_typed(update)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(type_name.encode("ascii") + b"\n" + data)
+    os.replace(tmp_path, path)
+
+
+def memoize_node(
+    node: Callable[[Any], dict[str, Any]],
+    reads: tuple[str, ...],
+    version: str = "1",
+    key_extra: Optional[Callable[[Any], Optional[str]]] = None,
+) -> Callable[[Any], dict[str, Any]]:
+    """Wrap a node so identical inputs replay the recorded state update.
+
+    Only successful updates are recorded; updates that move the workflow to
+    the error phase always re-run.
+
+    Args:
+        node: Node function
+        reads: State keys the node depends on
+        version: Node version; bump it when the node's logic changes
+        key_extra: Callable returning extra key material for a state, or
+            None to skip memoization for that call (e.g. when the repository
+            revision cannot be determined)
+
+    Returns:
+        Memoizing node function
+    """
+    node_name = node.__name__
+
+    @functools.wraps(node)
+    def memoized(state: Any) -> dict[str, Any]:
+        if not memoization_enabled():
+            return node(state)
+
+        extra = ""
+        if key_extra is not None:
+            extra = key_extra(state)
+            if extra is None:
+                return node(state)
+
+        key = input_hash(node_name, version, state, reads, extra)
+        recorded = load_update(node_name, key)
+        if recorded is not None:
+            return recorded
+
+        update = node(state)
+        if update.get("current_phase") != "error" and not update.get("errors"):
+            try:
+                save_update(node_name, key, update)
+            except OSError:
+                # Memoization is an optimisation - never fail the node over it
+                pass
+        return update
+
+    return memoized
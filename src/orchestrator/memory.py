@@ -0,0 +1,190 @@
+"""Per-node allocation tracking, soft memory budgets and degraded mode.
+
+Set ``ORCHESTRATOR_TRACEMALLOC=1`` to record each node's peak Python
+allocation (``peak_alloc_bytes`` in its metrics). Tracking uses
+``tracemalloc``, which slows allocation-heavy code down noticeably, so it
+is off by default.
+
+The tracer and its peak are process-wide. Nodes that overlap in time (the
+setup branches, or nodes of concurrent batch and ``serve`` workflows)
+cannot be told apart: their recorded peak is the process peak while they
+ran, an upper bound, and budgets are only checked for nodes that ran
+alone, so no node is blamed for another's allocations.
+
+``ORCHESTRATOR_MEMORY_BUDGET_MB`` sets soft budgets and turns tracking on.
+It is either one number applied to every node (``1024``) or comma-separated
+``node=MB`` pairs with an optional ``default`` (``analyze=2048,default=512``).
+
+When a node peaks above its budget the process switches to degraded mode
+for the rest of its life, trading speed for headroom instead of running
+into the container's memory limit:
+
+- message history and inline state budgets shrink, so less is kept in
+  memory and more is offloaded to the blob store
+- concurrent tool calls, verification executions and workflows (in the
+  ``serve`` worker and batch runs) are cut down
+"""
+
+import contextlib
+import os
+import threading
+import tracemalloc
+from typing import Iterator, Optional
+
+# Limits are divided by this factor in degraded mode
+DEGRADATION_FACTOR = 4
+
+_degraded = threading.Event()
+_degraded_reason: Optional[str] = None
+_workflow_slot = threading.Lock()
+
+# Tracked nodes currently running, and a counter bumped whenever they overlap
+_tracking_lock = threading.Lock()
+_tracked_nodes = 0
+_overlaps = 0
+
+
+def _budgets() -> dict[str, int]:
+    """Parse ``ORCHESTRATOR_MEMORY_BUDGET_MB`` into bytes per node."""
+    configured = os.getenv("ORCHESTRATOR_MEMORY_BUDGET_MB", "").strip()
+    if not configured:
+        return {}
+    if "=" not in configured:
+        return {"default": int(float(configured) * 2**20)}
+    budgets = {}
+    for entry in configured.split(","):
+        node, _, megabytes = entry.partition("=")
+        if node.strip():
+            budgets[node.strip()] = int(float(megabytes) * 2**20)
+    return budgets
+
+
+def node_budget_bytes(node: str) -> Optional[int]:
+    """Get a node's soft memory budget in bytes, or None if it has none."""
+    budgets = _budgets()
+    return budgets.get(node, budgets.get("default"))
+
+
+def tracking_enabled() -> bool:
+    """Check whether per-node peak allocations are tracked."""
+    if os.getenv("ORCHESTRATOR_TRACEMALLOC", "0").lower() not in ("", "0", "false", "no"):
+        return True
+    return bool(_budgets())
+
+
+def start_tracking() -> Optional[int]:
+    """Start tracking a node's allocations.
+
+    Starts tracemalloc if needed. The peak is reset only when no other
+    tracked node is running, since resetting it would corrupt their peaks.
+
+    Returns:
+        Token for :func:`stop_tracking`; None if the node overlaps another
+    """
+    global _tracked_nodes, _overlaps
+    with _tracking_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracked_nodes += 1
+        if _tracked_nodes > 1:
+            _overlaps += 1
+            return None
+        tracemalloc.reset_peak()
+        return _overlaps
+
+
+def stop_tracking(token: Optional[int]) -> tuple[int, bool]:
+    """Stop tracking a node's allocations.
+
+    Args:
+        token: Value returned by :func:`start_tracking`
+
+    Returns:
+        Peak traced allocation, and whether the node ran alone (so the peak
+        is its own)
+    """
+    global _tracked_nodes
+    with _tracking_lock:
+        _tracked_nodes -= 1
+        return traced_peak(), token is not None and token == _overlaps
+
+
+def traced_peak() -> int:
+    """Peak traced allocation since tracemalloc's peak was last reset."""
+    return tracemalloc.get_traced_memory()[1]
+
+
+def check_budget(node: str, peak_bytes: int) -> Optional[str]:
+    """Enter degraded mode if a node peaked above its budget.
+
+    Args:
+        node: Node name
+        peak_bytes: Node's peak allocation
+
+    Returns:
+        Description of the overrun, or None if the node stayed within budget
+    """
+    budget = node_budget_bytes(node)
+    if budget is None or peak_bytes <= budget:
+        return None
+    reason = (
+        f"{node} peaked at {peak_bytes / 2**20:.0f} MiB, "
+        f"over its {budget / 2**20:.0f} MiB memory budget"
+    )
+    enter_degraded_mode(reason)
+    return reason
+
+
+def enter_degraded_mode(reason: str) -> None:
+    """Switch the process to degraded mode (keeps the first reason)."""
+    global _degraded_reason
+    if not _degraded.is_set():
+        _degraded_reason = reason
+        _degraded.set()
+
+
+def reset_degraded_mode() -> None:
+    """Leave degraded mode (e.g. after the worker was given more memory)."""
+    global _degraded_reason
+    _degraded.clear()
+    _degraded_reason = None
+
+
+def is_degraded() -> bool:
+    """Check whether the process runs in degraded mode."""
+    return _degraded.is_set()
+
+
+def degraded_limit(value: int, minimum: int = 1) -> int:
+    """Scale a size or concurrency limit down while degraded.
+
+    Args:
+        value: Normal limit
+        minimum: Lowest limit to return
+
+    Returns:
+        ``value``, or ``value / DEGRADATION_FACTOR`` (at least ``minimum``) while degraded
+    """
+    if not _degraded.is_set():
+        return value
+    return max(minimum, value // DEGRADATION_FACTOR)
+
+
+@contextlib.contextmanager
+def workflow_slot() -> Iterator[None]:
+    """Hold while running a workflow; while degraded, workflows run one at a time."""
+    if not _degraded.is_set():
+        yield
+        return
+    with _workflow_slot:
+        yield
+
+
+def memory_status() -> dict[str, object]:
+    """Degraded mode and tracking status, for health checks."""
+    return {
+        "degraded": _degraded.is_set(),
+        "reason": _degraded_reason,
+        "tracking": tracking_enabled(),
+        "budgets_mb": {node: budget / 2**20 for node, budget in _budgets().items()},
+    }
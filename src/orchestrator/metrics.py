@@ -0,0 +1,226 @@
+"""Per-node timing, token, cost and MCP usage instrumentation.
+
+Every graph node is wrapped with :func:`instrument_node`, which measures
+wall and CPU time and collects the LLM token usage and MCP calls made while
+the node runs. The measurements are
+
+- returned in the node's state update under ``metrics`` (keyed by node
+  name, summed over repeated executions), and
+- added to process-wide totals that can be rendered in the Prometheus text
+  format: served at ``/metrics`` by the ``serve`` worker, and written to
+  ``ORCHESTRATOR_METRICS_FILE`` (e.g. for the node exporter's textfile
+  collector) when a CLI command finishes.
+
+LLM usage is collected by a callback attached to the shared chat model; MCP
+calls are reported by the session pool and the replay harness. Peak
+allocations and memory budgets are handled by :mod:`orchestrator.memory`.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+
+from . import memory
+from .state import PEAK_METRICS, NodeMetrics
+
+# USD per million tokens: (input, output, cache read)
+MODEL_PRICES_PER_MTOK: dict[str, tuple[float, float, float]] = {
+    "claude-sonnet-4-5-20250929": (3.00, 15.00, 0.30),
+}
+
+# Metrics exported to Prometheus: name -> (type, help)
+_PROMETHEUS_METRICS = {
+    "runs": ("counter", "Node executions"),
+    "wall_seconds": ("counter", "Wall-clock time spent in the node"),
+    "cpu_seconds": ("counter", "CPU time spent in the node's thread"),
+    "llm_calls": ("counter", "LLM requests made by the node"),
+    "input_tokens": ("counter", "LLM input tokens"),
+    "output_tokens": ("counter", "LLM output tokens"),
+    "cached_tokens": ("counter", "LLM input tokens read from the prompt cache"),
+    "cost_usd": ("counter", "Estimated LLM cost in USD"),
+    "mcp_calls": ("counter", "MCP tool calls made by the node"),
+    "mcp_errors": ("counter", "MCP tool calls that failed"),
+    "mcp_seconds": ("counter", "Time spent in MCP tool calls"),
+    "peak_alloc_bytes": ("gauge", "Highest peak Python allocation of a node execution"),
+    "budget_exceeded": ("counter", "Node executions that exceeded their memory budget"),
+}
+
+# Metrics of the node running in the current context
+_current: ContextVar[Optional[NodeMetrics]] = ContextVar("orchestrator_node_metrics", default=None)
+
+# Process-wide totals keyed by node name
+_totals: dict[str, NodeMetrics] = {}
+_totals_lock = threading.Lock()
+
+
+def _add(metrics: NodeMetrics, key: str, value: float) -> None:
+    if key in PEAK_METRICS:
+        metrics[key] = max(metrics.get(key, 0), value)
+    else:
+        metrics[key] = metrics.get(key, 0) + value
+
+
+def record_llm_usage(model: str, usage: Optional[dict[str, Any]]) -> None:
+    """Attribute one LLM response's token usage to the running node.
+
+    Args:
+        model: Model name (for cost estimation)
+        usage: LangChain ``usage_metadata`` of the response
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return
+
+    _add(metrics, "llm_calls", 1)
+    if not usage:
+        return
+    input_tokens = usage.get("input_tokens", 0)
+    output_tokens = usage.get("output_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    _add(metrics, "input_tokens", input_tokens)
+    _add(metrics, "output_tokens", output_tokens)
+    _add(metrics, "cached_tokens", cached_tokens)
+
+    prices = MODEL_PRICES_PER_MTOK.get(model)
+    if prices is not None:
+        input_price, output_price, cache_price = prices
+        cost = (
+            (input_tokens - cached_tokens) * input_price
+            + output_tokens * output_price
+            + cached_tokens * cache_price
+        ) / 1_000_000
+        _add(metrics, "cost_usd", cost)
+
+
+def record_mcp_call(seconds: float, error: bool = False) -> None:
+    """Attribute one MCP tool call to the running node."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    _add(metrics, "mcp_calls", 1)
+    _add(metrics, "mcp_seconds", seconds)
+    if error:
+        _add(metrics, "mcp_errors", 1)
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Chat model callback recording token usage for the running node.
+
+    Args:
+        model: Model name (for cost estimation)
+    """
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def on_llm_end(self, response: Any, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                record_llm_usage(self.model, getattr(message, "usage_metadata", None))
+
+
+def instrument_node(
+    node: Callable[[Any], dict[str, Any]], name: Optional[str] = None
+) -> Callable[[Any], dict[str, Any]]:
+    """Wrap a node so its resource usage is measured and added to its update.
+
+    A node that ran alone and peaked above its memory budget switches the
+    process to degraded mode and adds a warning message to its update.
+
+    Args:
+        node: Node function
+        name: Metrics key (defaults to the function name)
+
+    Returns:
+        Instrumented node function
+    """
+    name = name or node.__name__
+
+    @functools.wraps(node)
+    def instrumented(state: Any) -> dict[str, Any]:
+        metrics: NodeMetrics = {"runs": 1}
+        tracking = memory.tracking_enabled()
+        if tracking:
+            tracking_token = memory.start_tracking()
+        token = _current.set(metrics)
+        wall_started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            update = node(state)
+        finally:
+            _current.reset(token)
+            metrics["wall_seconds"] = time.perf_counter() - wall_started
+            metrics["cpu_seconds"] = time.thread_time() - cpu_started
+            overrun = None
+            if tracking:
+                metrics["peak_alloc_bytes"], alone = memory.stop_tracking(tracking_token)
+                # Overlapping nodes share the peak; only a node that ran alone is blamed
+                overrun = memory.check_budget(name, metrics["peak_alloc_bytes"]) if alone else None
+                if overrun:
+                    metrics["budget_exceeded"] = 1
+            with _totals_lock:
+                totals = _totals.setdefault(name, {})
+                for key, value in metrics.items():
+                    _add(totals, key, value)
+
+        update = {**update, "metrics": {name: metrics}}
+        if overrun:
+            # Ahead of the node's own messages, which the CLI prints as its progress
+            update["messages"] = [
+                AIMessage(content=f"⚠️ Memory budget exceeded: {overrun}; continuing in degraded mode"),
+                *update.get("messages", []),
+            ]
+        return update
+
+    return instrumented
+
+
+def totals() -> dict[str, NodeMetrics]:
+    """Get process-wide metrics per node."""
+    with _totals_lock:
+        return {node: dict(values) for node, values in _totals.items()}
+
+
+def render_prometheus(node_metrics: Optional[dict[str, NodeMetrics]] = None) -> str:
+    """Render node metrics in the Prometheus text exposition format.
+
+    Args:
+        node_metrics: Metrics per node (defaults to the process-wide totals)
+
+    Returns:
+        Exposition text
+    """
+    node_metrics = totals() if node_metrics is None else node_metrics
+    lines = []
+    for key, (metric_type, help_text) in _PROMETHEUS_METRICS.items():
+        metric = f"orchestrator_node_{key}" + ("_total" if metric_type == "counter" else "")
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for node, values in sorted(node_metrics.items()):
+            lines.append(f'{metric}{{node="{node}"}} {values.get(key, 0):g}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Optional[str] = None) -> Optional[str]:
+    """Write the process-wide totals to a Prometheus textfile.
+
+    Args:
+        path: Output file (defaults to ``ORCHESTRATOR_METRICS_FILE``)
+
+    Returns:
+        Path written, or None if no file is configured or nothing was measured
+    """
+    path = path or os.getenv("ORCHESTRATOR_METRICS_FILE")
+    if not path or not totals():
+        return None
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+    return path
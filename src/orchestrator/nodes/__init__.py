@@ -2,22 +2,56 @@
 
 Each node represents a step in the orchestration workflow and can be
 visualized individually in LangGraph Studio.
+
+Node modules are imported on first attribute access, since most of them
+pull in the LLM and MCP client libraries.
 """
 
-from .analyze import analyze_repository
-from .extract import extract_patterns
-from .generate import generate_templates
-from .hitl import human_approval
-from .init import initialize_workflow
-from .setup import setup_harness
-from .verify import verify_deployment
-
-__all__ = [
-    "initialize_workflow",
-    "analyze_repository",
-    "extract_patterns",
-    "generate_templates",
-    "human_approval",
-    "setup_harness",
-    "verify_deployment",
-]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analyze import analyze_repository
+    from .extract import extract_patterns
+    from .generate import generate_templates
+    from .hitl import human_approval
+    from .init import initialize_workflow
+    from .setup import (
+        SETUP_BRANCHES,
+        finalize_setup,
+        route_setup_branches,
+        setup_connectors,
+        setup_environments,
+        setup_harness,
+        setup_pipeline,
+        setup_services,
+    )
+    from .verify import verify_deployment
+
+# Public name -> defining module
+_EXPORTS = {
+    "initialize_workflow": "init",
+    "analyze_repository": "analyze",
+    "extract_patterns": "extract",
+    "generate_templates": "generate",
+    "human_approval": "hitl",
+    "setup_harness": "setup",
+    "setup_connectors": "setup",
+    "setup_environments": "setup",
+    "setup_services": "setup",
+    "setup_pipeline": "setup",
+    "finalize_setup": "setup",
+    "route_setup_branches": "setup",
+    "SETUP_BRANCHES": "setup",
+    "verify_deployment": "verify",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
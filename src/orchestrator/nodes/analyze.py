@@ -2,18 +2,28 @@
 
 from typing import Any
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
+from ..analysis.scan import scan_repository
+from ..blobs import offload
+from ..llm import get_chat_model
+from ..repo import repo_revision
 from ..state import OrchestratorState, RepositoryAnalysis
+from ..tools.mcp_executor import execute_tool_calls
 from ..tools.mcp_registry import get_mcp_tools
 
+# Upper bound on model/tool round trips during analysis
+MAX_TOOL_TURNS = 8
+
 
 def analyze_repository(state: OrchestratorState) -> dict[str, Any]:
     """Analyze the target repository structure and technologies.
 
-    Uses MCP tools (Scaffold, Repomix) and Claude to perform deep analysis
-    of the repository to understand:
+    Scans the repository locally in a single pass (container and CI files,
+    secrets, cloud SDK usage, Kubernetes/Helm/Compose manifests, per-file
+    metrics behind the complexity score and confidence), then uses MCP tools
+    (Scaffold, Repomix) and Claude to perform deep analysis of the repository
+    to understand:
     - Languages and frameworks
     - Build tools and dependencies
     - Existing CI/CD patterns
@@ -29,14 +39,20 @@ def analyze_repository(state: OrchestratorState) -> dict[str, Any]:
     repo_path = state["target_repo_path"]
 
     try:
-        # Get MCP tools for repository analysis
-        tools = get_mcp_tools(["scaffold", "repomix", "github"])
+        # Local single-pass scan: facts the model does not need to rediscover
+        scan = scan_repository(repo_path)
+        inventory, secrets, manifests = scan["inventory"], scan["secrets"], scan["manifests"]
+        metrics = scan["metrics"]
+        languages = list(metrics["languages"]) or ["unknown"]
+
+        # Get MCP tools for repository analysis (servers start on first tool call)
+        server_names = ["scaffold", "repomix"]
+        if state.get("target_repo_url"):
+            server_names.append("github")
+        tools = get_mcp_tools(server_names, cache_scope=repo_revision(repo_path))
 
         # Initialize Claude with tools
-        llm = ChatAnthropic(
-            model="claude-sonnet-4-5-20250929",
-            temperature=0,
-        ).bind_tools(tools)
+        llm = get_chat_model().bind_tools(tools)
 
         # Create analysis prompt
         system_prompt = SystemMessage(
@@ -64,6 +80,12 @@ Use the available MCP tools to:
 Provide a detailed analysis with confidence scores."""
         )
 
+        language_lines = ", ".join(
+            f"{name} ({loc})" for name, loc in metrics["languages"].items()
+        )
+        resource_counts = ", ".join(
+            f"{kind} ({count})" for kind, count in manifests["resources"].items()
+        )
         user_prompt = HumanMessage(
             content=f"""Analyze the repository at: {repo_path}
 
@@ -76,34 +98,57 @@ Provide a comprehensive analysis including:
 - Complexity assessment (1-10)
 - Confidence level (0.0-1.0)
 
+Local scan findings ({scan['walk']['files']} files):
+- Languages (lines of code): {language_lines or 'none'}
+- Complexity score: {metrics['complexity_score']}/10
+- Dockerfiles: {', '.join(inventory['dockerfiles'][:10]) or 'none'}
+- Compose files: {', '.join(inventory['compose_files'][:10]) or 'none'}
+- CI files: {', '.join(inventory['ci_files'][:10]) or 'none'}
+- Kubernetes resources: {resource_counts or 'none'}
+- Helm charts: {', '.join(manifests['helm_charts'][:10]) or 'none'}
+- Deployment patterns: {', '.join(manifests['deployment_patterns']) or 'none'}
+- Secrets referenced: {', '.join(secrets['secrets'][:30]) or 'none'}
+- Cloud providers: {', '.join(secrets['cloud_providers']) or 'none'}
+
 Use the MCP tools to gather this information."""
         )
 
-        # Invoke Claude with tools
-        response = llm.invoke([system_prompt, user_prompt])
+        # Invoke Claude with tools, running each turn's tool calls concurrently
+        conversation = [system_prompt, user_prompt]
+        response = llm.invoke(conversation)
+        for _ in range(MAX_TOOL_TURNS):
+            if not getattr(response, "tool_calls", None):
+                break
+            conversation.append(response)
+            conversation.extend(execute_tool_calls(response.tool_calls, tools))
+            response = llm.invoke(conversation)
 
         # Parse analysis results
         # NOTE: This is simplified - in production, we'd parse tool call results
         analysis: RepositoryAnalysis = {
             "repo_path": repo_path,
             "repo_url": state.get("target_repo_url"),
-            "primary_language": "python",  # Placeholder
-            "languages": ["python"],
+            "primary_language": languages[0],
+            "languages": languages,
             "frameworks": [],
             "build_tools": [],
             "package_managers": [],
             "dependencies": {},
             "entry_points": [],
             "test_frameworks": [],
-            "dockerfile_present": False,
-            "docker_compose_present": False,
-            "kubernetes_manifests": [],
-            "ci_files_present": [],
-            "deployment_patterns": [],
-            "infrastructure_as_code": [],
-            "structure_analysis": response.content if isinstance(response.content, str) else "",
-            "complexity_score": 5,
-            "confidence_level": 0.8,
+            "dockerfile_present": bool(inventory["dockerfiles"]),
+            "docker_compose_present": bool(inventory["compose_files"]),
+            "kubernetes_manifests": manifests["kubernetes_manifests"],
+            "ci_files_present": inventory["ci_files"],
+            "deployment_patterns": manifests["deployment_patterns"],
+            "infrastructure_as_code": manifests["infrastructure_as_code"],
+            "secrets_detected": secrets["secrets"],
+            "cloud_providers": secrets["cloud_providers"],
+            "structure_analysis": offload(
+                response.content if isinstance(response.content, str) else ""
+            ),
+            "complexity_score": metrics["complexity_score"],
+            "confidence_level": metrics["confidence_level"],
         }
 
         return {
@@ -114,6 +159,8 @@ Use the MCP tools to gather this information."""
                     content=f"""✅ Repository analysis complete
 
 **Primary Language:** {analysis['primary_language']}
+**Deployment Patterns:** {', '.join(analysis['deployment_patterns']) or 'none'}
+**Secrets Detected:** {len(analysis['secrets_detected'])}
 **Complexity Score:** {analysis['complexity_score']}/10
 **Confidence:** {analysis['confidence_level']:.0%}
 
@@ -2,10 +2,80 @@
 
 from typing import Any
 
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
-from ..state import ExtractedPatterns, OrchestratorState
+from ..analysis.secrets import harness_identifier
+from ..blobs import resolve
+from ..llm import get_chat_model
+from ..state import ExtractedPatterns, OrchestratorState, RepositoryAnalysis
+
+# Connector for each cloud provider the repository uses
+CLOUD_CONNECTORS = {
+    "aws": {"type": "aws", "name": "aws_connector"},
+    "gcp": {"type": "gcp", "name": "gcp_connector"},
+    "azure": {"type": "azure", "name": "azure_connector"},
+}
+
+# Compute each deployment target runs on
+TARGET_COMPUTE = {
+    "kubernetes": "kubernetes_cluster",
+    "serverless": "serverless_platform",
+    "docker": "docker_host",
+    "vm": "virtual_machine",
+}
+
+
+def _deployment_target(analysis: RepositoryAnalysis) -> str:
+    """Pick the deployment target from the manifests the local scan indexed.
+
+    Args:
+        analysis: Repository analysis, including the local scan findings
+
+    Returns:
+        kubernetes, serverless, docker or vm
+    """
+    patterns = set(analysis.get("deployment_patterns", []))
+    if patterns & {"kubernetes", "helm", "kustomize"}:
+        return "kubernetes"
+    if "serverless" in patterns:
+        return "serverless"
+    if "docker_compose" in patterns or analysis.get("dockerfile_present"):
+        return "docker"
+    return "vm"
+
+
+def _required_connectors(
+    analysis: RepositoryAnalysis, deployment_target: str
+) -> tuple[list[dict[str, str]], list[str]]:
+    """Derive the connectors a pipeline needs and the secrets they authenticate with.
+
+    Args:
+        analysis: Repository analysis, including the local scan findings
+        deployment_target: Extracted deployment target
+
+    Returns:
+        Connectors and the identifiers of their credential secrets
+    """
+    repo_url = analysis.get("repo_url") or ""
+    uses_github = "github.com" in repo_url or any(
+        path.startswith(".github/") for path in analysis.get("ci_files_present", [])
+    )
+    if uses_github:
+        connectors = [{"type": "github", "name": "github_connector"}]
+        secrets = ["github_token"]
+    else:
+        connectors = [{"type": "git", "name": "git_connector"}]
+        secrets = ["git_credentials"]
+
+    if analysis.get("dockerfile_present") or analysis.get("docker_compose_present"):
+        connectors.append({"type": "docker", "name": "docker_registry"})
+        secrets.append("docker_credentials")
+    if deployment_target == "kubernetes":
+        connectors.append({"type": "kubernetes", "name": "k8s_cluster"})
+    for provider in analysis.get("cloud_providers", []):
+        connectors.append(CLOUD_CONNECTORS[provider])
+        secrets.append(f"{provider}_credentials")
+    return connectors, secrets
 
 
 def extract_patterns(state: OrchestratorState) -> dict[str, Any]:
@@ -38,10 +108,7 @@ def extract_patterns(state: OrchestratorState) -> dict[str, Any]:
 
     try:
         # Initialize Claude
-        llm = ChatAnthropic(
-            model="claude-sonnet-4-5-20250929",
-            temperature=0,
-        )
+        llm = get_chat_model()
 
         # Create pattern extraction prompt
         system_prompt = SystemMessage(
@@ -73,10 +140,13 @@ Be specific and provide actionable recommendations."""
 **Build Tools:** {', '.join(analysis['build_tools'])}
 **Dockerfile Present:** {analysis['dockerfile_present']}
 **Kubernetes Manifests:** {len(analysis['kubernetes_manifests'])}
+**Deployment Patterns:** {', '.join(analysis.get('deployment_patterns', [])) or 'none'}
+**Secrets Referenced:** {', '.join(analysis.get('secrets_detected', [])[:30]) or 'none'}
+**Cloud Providers:** {', '.join(analysis.get('cloud_providers', [])) or 'none'}
 **Complexity:** {analysis['complexity_score']}/10
 
 **Structure Analysis:**
-{analysis['structure_analysis']}
+{resolve(analysis['structure_analysis'])}
 
 Provide:
 1. Build pattern recommendation
@@ -93,11 +163,21 @@ Format as structured JSON."""
         # Invoke Claude
         response = llm.invoke([system_prompt, user_prompt])
 
+        # Target, connectors and secrets come from the local scan rather than the model
+        deployment_target = _deployment_target(analysis)
+        connectors, connector_secrets = _required_connectors(analysis, deployment_target)
+        artifact_types = ["docker"]
+        if "helm" in analysis.get("deployment_patterns", []):
+            artifact_types.append("helm")
+        app_secrets = [
+            harness_identifier(name) for name in analysis.get("secrets_detected", [])
+        ]
+
         # Parse pattern extraction results
         # NOTE: In production, we'd use structured output or JSON parsing
         patterns: ExtractedPatterns = {
             "build_pattern": "container",
-            "deployment_target": "kubernetes",
+            "deployment_target": deployment_target,
             "environments": ["dev", "staging", "production"],
             "deployment_strategy": "rolling",
             "test_strategy": {
@@ -105,15 +185,11 @@ Format as structured JSON."""
                 "integration": "pytest",
                 "e2e": "manual",
             },
-            "artifact_types": ["docker"],
-            "secrets_required": ["github_token", "docker_credentials"],
-            "connectors_required": [
-                {"type": "github", "name": "github_connector"},
-                {"type": "docker", "name": "docker_hub"},
-                {"type": "kubernetes", "name": "k8s_cluster"},
-            ],
+            "artifact_types": artifact_types,
+            "secrets_required": list(dict.fromkeys(connector_secrets + app_secrets)),
+            "connectors_required": connectors,
             "infrastructure_requirements": {
-                "compute": ["kubernetes_cluster"],
+                "compute": [TARGET_COMPUTE[deployment_target]],
                 "storage": ["container_registry"],
             },
             "monitoring_patterns": ["prometheus", "grafana"],
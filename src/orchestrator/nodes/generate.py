@@ -1,54 +1,251 @@
 """Template generation node."""
 
+import os
+import posixpath
+import re
 from typing import Any
 
-from langchain_anthropic import ChatAnthropic
+import yaml
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
-from ..state import GeneratedTemplates, OrchestratorState
+from ..analysis.ci import CICondition, PipelineIR, translate_ci_files
+from ..analysis.secrets import harness_identifier
+from ..blobs import is_blob_ref, offload
+from ..llm import get_chat_model
+from ..similarity import PipelineMatch, find_similar, reuse_enabled
+from ..state import ExtractedPatterns, GeneratedTemplates, OrchestratorState, RepositoryAnalysis
 
+# Lines of pipeline YAML shown in the approval message when it is offloaded
+YAML_PREVIEW_LINES = 40
 
-def generate_templates(state: OrchestratorState) -> dict[str, Any]:
-    """Generate Harness pipeline templates based on extracted patterns.
+# Pipeline IR triggers -> template triggers
+IR_TRIGGERS = {
+    "push": {"type": "webhook", "event": "push"},
+    "pull_request": {"type": "webhook", "event": "pull_request"},
+    "schedule": {"type": "cron"},
+    "manual": {"type": "manual"},
+}
 
-    Uses Claude to generate:
-    - Complete pipeline YAML
-    - Pipeline stages
-    - Steps for each stage
-    - Variables and secrets
-    - Triggers
-    - Input sets
+# Untranslated CI steps that deploy; the pipeline is generated instead
+_DEPLOY_STEP = re.compile(r"deploy|release", re.IGNORECASE)
+
+# Template fields taken over from a reused pipeline
+REUSED_FIELDS = ("stages", "steps", "variables", "triggers", "input_sets")
+
+
+class _PipelineDumper(yaml.SafeDumper):
+    """Dumps multi-line strings (step commands) as literal blocks."""
+
+
+_PipelineDumper.add_representer(
+    str,
+    lambda dumper, value: dumper.represent_scalar(
+        "tag:yaml.org,2002:str", value, style="|" if "\n" in value else None
+    ),
+)
+
+
+def _unique_identifier(name: str, taken: set[str]) -> str:
+    """Derive a Harness identifier from a name, unique among ``taken``."""
+    base = harness_identifier(name) or "step"
+    identifier, suffix = base, 2
+    while identifier in taken:
+        identifier, suffix = f"{base}_{suffix}", suffix + 1
+    taken.add(identifier)
+    return identifier
+
+
+def _harness_when(when: CICondition, status_key: str) -> dict[str, str]:
+    """Build the ``when`` of a Harness step (``stageStatus``) or stage (``pipelineStatus``)."""
+    harness_when = {status_key: when.get("status", "Success")}
+    if when.get("condition"):
+        harness_when["condition"] = when["condition"]
+    return harness_when
+
+
+def _translate_pipeline(
+    pipelines: list[PipelineIR], patterns: ExtractedPatterns
+) -> tuple[str, GeneratedTemplates]:
+    """Convert translated CI configurations into a Harness pipeline.
+
+    Every IR stage becomes a CI stage with one Run step per shell step, in
+    the original order, with the step's environment and run condition.
 
     Args:
-        state: Current orchestrator state
+        pipelines: IRs of the repository's CI files
+        patterns: Extracted patterns (for the registry connector)
 
     Returns:
-        State updates with generated templates
+        Pipeline YAML and the matching stage, step, variable and trigger summaries
     """
-    patterns = state.get("extracted_patterns")
-    analysis = state.get("repository_analysis")
+    registry = next(
+        (c["name"] for c in patterns["connectors_required"] if c["type"] == "docker"), None
+    )
+    stage_ids: set[str] = set()
+    stages, summaries, steps_by_stage = [], [], {}
+    variables: dict[str, str] = {}
+    triggers: list[dict[str, str]] = []
 
-    if not patterns or not analysis:
-        return {
-            "current_phase": "error",
-            "errors": ["Missing patterns or analysis for template generation"],
-            "messages": [
-                AIMessage(
-                    content="❌ Cannot generate templates: missing required data"
-                )
-            ],
-        }
+    for pipeline in pipelines:
+        variables.update(pipeline["variables"])
+        for trigger in pipeline["triggers"]:
+            if IR_TRIGGERS[trigger] not in triggers:
+                triggers.append(IR_TRIGGERS[trigger])
+        for stage in pipeline["stages"]:
+            if not stage["steps"]:
+                continue
+            name = stage["name"]
+            if len(pipelines) > 1:
+                name = f"{name} ({posixpath.basename(pipeline['source'])})"
+            stage_id = _unique_identifier(name, stage_ids)
+            step_ids: set[str] = set()
+            steps = []
+            for step in stage["steps"]:
+                spec = {"shell": "Bash", "command": step["command"]}
+                if step["image"] and registry:
+                    spec.update(connectorRef=registry, image=step["image"])
+                if step.get("env"):
+                    spec["envVariables"] = step["env"]
+                harness_step = {
+                    "type": "Run",
+                    "name": step["name"],
+                    "identifier": _unique_identifier(step["name"], step_ids),
+                    "spec": spec,
+                }
+                if step.get("when"):
+                    harness_step["when"] = _harness_when(step["when"], "stageStatus")
+                steps.append({"step": harness_step})
+            harness_stage = {
+                "name": name,
+                "identifier": stage_id,
+                "type": "CI",
+                "spec": {"cloneCodebase": True, "execution": {"steps": steps}},
+            }
+            if stage.get("matrix"):
+                harness_stage["strategy"] = {"matrix": stage["matrix"]}
+            if stage.get("when"):
+                harness_stage["when"] = _harness_when(stage["when"], "pipelineStatus")
+            stages.append({"stage": harness_stage})
+            summaries.append({"name": name, "type": "CI"})
+            steps_by_stage[stage_id] = [{"name": s["step"]["name"], "type": "Run"} for s in steps]
 
-    try:
-        # Initialize Claude
-        llm = ChatAnthropic(
-            model="claude-sonnet-4-5-20250929",
-            temperature=0,
+    pipeline_yaml = yaml.dump(
+        {
+            "pipeline": {
+                "name": "Auto-Generated Pipeline",
+                "identifier": "auto_generated_pipeline",
+                "projectIdentifier": "<+input>",
+                "orgIdentifier": "<+input>",
+                "tags": {},
+                "variables": [
+                    {"name": name, "type": "String", "value": value}
+                    for name, value in variables.items()
+                ],
+                "stages": stages,
+            }
+        },
+        Dumper=_PipelineDumper,
+        sort_keys=False,
+        width=120,
+    )
+    templates: GeneratedTemplates = {
+        "stages": summaries,
+        "steps": steps_by_stage,
+        "variables": variables,
+        "triggers": triggers or [IR_TRIGGERS["manual"]],
+        "translated_from": [pipeline["source"] for pipeline in pipelines],
+    }
+    return pipeline_yaml, templates
+
+
+def _translation_warnings(pipelines: list[PipelineIR]) -> list[str]:
+    """List the steps, jobs, settings and expressions the CI translation left out."""
+    warnings = []
+    for pipeline in pipelines:
+        warnings.extend(
+            f"{pipeline['source']}: not translated: {step}"
+            for step in pipeline.get("skipped", [])
         )
+        warnings.extend(
+            f"{pipeline['source']}: expression kept as written: {expression}"
+            for expression in pipeline.get("unresolved", [])
+        )
+    return warnings
+
+
+def _rename_repository(value: Any, source_name: str, target_name: str) -> Any:
+    """Replace whole-word mentions of a repository name in a pipeline field."""
+    if not isinstance(value, str):
+        return value
+    renames = [
+        (source_name, target_name),
+        (harness_identifier(source_name), harness_identifier(target_name)),
+    ]
+    for old, new in renames:
+        value = re.sub(rf"(?<![A-Za-z0-9]){re.escape(old)}(?![A-Za-z0-9])", new, value)
+    return value
+
+
+def _adapt_pipeline(
+    match: PipelineMatch, analysis: RepositoryAnalysis
+) -> tuple[str, GeneratedTemplates]:
+    """Adapt the approved pipeline of a look-alike repository to this one.
+
+    The pipeline is kept as approved; only the other repository's name in
+    the pipeline ``name`` and ``identifier`` and the codebase ``repoName``
+    is replaced with this repository's. Pipeline YAML that does not parse
+    is reused unchanged.
+
+    Args:
+        match: Approved pipeline of the most similar repository
+        analysis: Repository analysis
+
+    Returns:
+        Pipeline YAML and the reused stage, step, variable and trigger summaries
+    """
+    source_name = os.path.basename(match["repo_path"].rstrip("/"))
+    target_name = os.path.basename(analysis["repo_path"].rstrip("/"))
+    pipeline_yaml = match["templates"]["pipeline_yaml"]
+    if source_name and target_name and source_name != target_name:
+        try:
+            document = yaml.safe_load(pipeline_yaml)
+        except yaml.YAMLError:
+            document = None
+        pipeline = document.get("pipeline") if isinstance(document, dict) else None
+        if isinstance(pipeline, dict):
+            for key in ("name", "identifier"):
+                if key in pipeline:
+                    pipeline[key] = _rename_repository(pipeline.get(key), source_name, target_name)
+            codebase = ((pipeline.get("properties") or {}).get("ci") or {}).get("codebase")
+            if isinstance(codebase, dict) and "repoName" in codebase:
+                codebase["repoName"] = _rename_repository(
+                    codebase["repoName"], source_name, target_name
+                )
+            pipeline_yaml = yaml.dump(document, Dumper=_PipelineDumper, sort_keys=False, width=120)
 
-        # Create template generation prompt
-        system_prompt = SystemMessage(
-            content="""You are a Harness CI/CD expert specializing in pipeline template generation.
+    templates: GeneratedTemplates = {
+        key: value for key, value in match["templates"].items() if key in REUSED_FIELDS
+    }
+    templates["reused_from"] = match["workflow_id"]
+    return pipeline_yaml, templates
+
+
+def _generate_with_llm(analysis: RepositoryAnalysis, patterns: ExtractedPatterns) -> str:
+    """Ask Claude for a pipeline when the repository has no CI configuration to translate.
+
+    Args:
+        analysis: Repository analysis
+        patterns: Extracted patterns
+
+    Returns:
+        Pipeline YAML
+    """
+    # Initialize Claude
+    llm = get_chat_model()
+
+    # Create template generation prompt
+    system_prompt = SystemMessage(
+        content="""You are a Harness CI/CD expert specializing in pipeline template generation.
 
 Generate production-ready Harness pipeline YAML following best practices:
 1. Use proper YAML structure and indentation
@@ -63,10 +260,10 @@ Generate production-ready Harness pipeline YAML following best practices:
 10. Include rollback mechanisms
 
 Generate complete, working Harness pipeline YAML."""
-        )
+    )
 
-        user_prompt = HumanMessage(
-            content=f"""Generate Harness pipeline templates for:
+    user_prompt = HumanMessage(
+        content=f"""Generate Harness pipeline templates for:
 
 **Repository:** {analysis['repo_path']}
 **Language:** {analysis['primary_language']}
@@ -91,14 +288,14 @@ Generate:
 6. Input sets for different environments
 
 Make it production-ready and follow Harness best practices."""
-        )
+    )
 
-        # Invoke Claude
-        response = llm.invoke([system_prompt, user_prompt])
+    # Invoke Claude
+    response = llm.invoke([system_prompt, user_prompt])
 
-        # Parse generated templates
-        # NOTE: In production, we'd parse the actual YAML from Claude's response
-        pipeline_yaml = """pipeline:
+    # Parse generated templates
+    # NOTE: In production, we'd parse the actual YAML from Claude's response
+    return """pipeline:
   name: Auto-Generated Pipeline
   identifier: auto_generated_pipeline
   projectIdentifier: <+input>
@@ -122,8 +319,83 @@ Make it production-ready and follow Harness best practices."""
                     command: echo "Building..."
 """
 
+
+def generate_templates(state: OrchestratorState) -> dict[str, Any]:
+    """Generate Harness pipeline templates based on extracted patterns.
+
+    When the repository already has CI configurations (GitHub Actions,
+    GitLab CI, Jenkinsfile), their stages and shell steps are translated
+    into the pipeline directly. Otherwise the pipeline approved for the most
+    similar previously seen repository is reused (see
+    :mod:`orchestrator.similarity`). Failing both, uses Claude to generate:
+    - Complete pipeline YAML
+    - Pipeline stages
+    - Steps for each stage
+    - Variables and secrets
+    - Triggers
+    - Input sets
+
+    Args:
+        state: Current orchestrator state
+
+    Returns:
+        State updates with generated templates
+    """
+    patterns = state.get("extracted_patterns")
+    analysis = state.get("repository_analysis")
+
+    if not patterns or not analysis:
+        return {
+            "current_phase": "error",
+            "errors": ["Missing patterns or analysis for template generation"],
+            "messages": [
+                AIMessage(
+                    content="❌ Cannot generate templates: missing required data"
+                )
+            ],
+        }
+
+    try:
+        # Existing CI configurations are translated directly, without the LLM
+        translated = translate_ci_files(
+            analysis["repo_path"], analysis.get("ci_files_present", [])
+        )
+        warnings = _translation_warnings(translated)
+        skipped_deploys = [
+            f"{pipeline['source']}: {step}"
+            for pipeline in translated
+            for step in pipeline.get("skipped", [])
+            if _DEPLOY_STEP.search(step)
+        ]
+        if skipped_deploys:
+            # A translation without its deploy steps would silently not deploy
+            warnings = [
+                f"Deploy step not translatable, pipeline generated instead: {step}"
+                for step in skipped_deploys
+            ]
+            translated = []
+        # Otherwise the pipeline approved for the most similar repository is reused
+        match = None if translated or not reuse_enabled() else find_similar(analysis, patterns)
+        if translated:
+            pipeline_yaml, overrides = _translate_pipeline(translated, patterns)
+        elif match:
+            pipeline_yaml, overrides = _adapt_pipeline(match, analysis)
+        else:
+            pipeline_yaml, overrides = _generate_with_llm(analysis, patterns), {}
+
+        # Keep large YAML out of checkpoints; state only carries a reference
+        pipeline_yaml_value = offload(pipeline_yaml)
+        yaml_lines = pipeline_yaml.splitlines()
+        if is_blob_ref(pipeline_yaml_value) and len(yaml_lines) > YAML_PREVIEW_LINES:
+            yaml_preview = "\n".join(yaml_lines[:YAML_PREVIEW_LINES]) + (
+                f"\n# ... {len(yaml_lines) - YAML_PREVIEW_LINES} more lines in "
+                f"{pipeline_yaml_value}\n"
+            )
+        else:
+            yaml_preview = pipeline_yaml
+
         templates: GeneratedTemplates = {
-            "pipeline_yaml": pipeline_yaml,
+            "pipeline_yaml": pipeline_yaml_value,
             "stages": [
                 {"name": "Build", "type": "CI"},
                 {"name": "Test", "type": "CI"},
@@ -153,23 +425,38 @@ Make it production-ready and follow Harness best practices."""
                 "secrets_valid": True,
             },
         }
+        templates.update(overrides)
+
+        if translated:
+            source = ", ".join(templates["translated_from"])
+        elif match:
+            source = f"reused from {match['repo_path']} ({match['similarity']:.0%} similar)"
+        else:
+            source = "generated"
+        warning_section = (
+            "\n**Warnings:**\n" + "".join(f"- {warning}\n" for warning in warnings)
+            if warnings
+            else ""
+        )
 
         return {
             "generated_templates": templates,
             "current_phase": "setup",
             "hitl_required": True,  # Require human approval before setup
+            "warnings": state.get("warnings", []) + warnings,
             "messages": [
                 AIMessage(
                     content=f"""✅ Template generation complete
 
 **Pipeline:** Auto-Generated Pipeline
+**Source:** {source}
 **Stages:** {len(templates['stages'])}
 **Variables:** {len(templates['variables'])}
 **Triggers:** {len(templates['triggers'])}
-
+{warning_section}
 **Generated Pipeline YAML:**
 ```yaml
-{pipeline_yaml}
+{yaml_preview}
 ```
 
 🔍 **Human approval required before proceeding to Harness setup.**"""
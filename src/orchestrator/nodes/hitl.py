@@ -63,6 +63,9 @@ Please review the following before proceeding:
 **Secrets to Create:**
 {chr(10).join(f"- {s}" for s in patterns.get('secrets_required', []))}
 
+**Warnings:**
+{chr(10).join(f"- {w}" for w in state.get('warnings', [])) or "- None"}
+
 ---
 
 **Options:**
@@ -20,7 +20,8 @@ def initialize_workflow(state: OrchestratorState) -> dict[str, Any]:
     Returns:
         State updates
     """
-    workflow_id = str(uuid.uuid4())
+    # The CLI assigns the workflow ID up front so it can double as the thread ID
+    workflow_id = state.get("workflow_id") or str(uuid.uuid4())
     started_at = datetime.datetime.now(datetime.UTC).isoformat()
 
     # Validate required inputs
@@ -49,8 +50,9 @@ def initialize_workflow(state: OrchestratorState) -> dict[str, Any]:
         "current_phase": "analyze",
         "errors": [],
         "warnings": [],
-        "hitl_required": False,
-        "hitl_approved": False,
+        # Keep the approval settings of create_initial_state (--no-approval)
+        "hitl_required": state.get("hitl_required", False),
+        "hitl_approved": state.get("hitl_approved", False),
         "messages": [
             AIMessage(
                 content=f"""✅ Workflow initialized successfully
@@ -1,29 +1,47 @@
-"""Harness platform setup node."""
+"""Harness platform setup nodes.
+
+Setup runs as parallel graph branches that each create one independent group
+of Harness resources and write their own slice of ``HarnessSetupResult``:
+
+- ``setup_connectors``: connectors and secrets
+- ``setup_environments``: environments and infrastructure definitions
+- ``setup_services``: services
+- ``setup_pipeline``: the pipeline
+
+``setup_harness`` gates the branches on approval and ``finalize_setup``
+joins them. The branches report the resources as created without calling
+Harness yet.
+"""
 
 from typing import Any
 
 from langchain_core.messages import AIMessage
 
 from ..state import HarnessSetupResult, OrchestratorState
-from ..tools.mcp_registry import get_mcp_tools
 
+# Parallel setup branches, in reporting order
+SETUP_BRANCHES = [
+    "setup_connectors",
+    "setup_environments",
+    "setup_services",
+    "setup_pipeline",
+]
 
-def setup_harness(state: OrchestratorState) -> dict[str, Any]:
-    """Setup Harness platform with connectors, secrets, environments, and pipelines.
 
-    Uses the Harness MCP server to:
-    1. Create connectors (GitHub, Docker, Kubernetes, etc.)
-    2. Create secrets
-    3. Create environments (dev, staging, production)
-    4. Create services
-    5. Create infrastructure definitions
-    6. Create the pipeline
+def _project_url(state: OrchestratorState) -> str:
+    org_id = state["harness_org_id"]
+    project_id = state["harness_project_id"]
+    return f"https://app.harness.io/ng/account/{org_id}/module/cd/orgs/{org_id}/projects/{project_id}"
+
+
+def setup_harness(state: OrchestratorState) -> dict[str, Any]:
+    """Check that Harness setup may start before fanning out to the setup branches.
 
     Args:
         state: Current orchestrator state
 
     Returns:
-        State updates with setup results
+        State updates; the workflow moves to the error phase if setup is blocked
     """
     templates = state.get("generated_templates")
     patterns = state.get("extracted_patterns")
@@ -45,105 +63,178 @@ def setup_harness(state: OrchestratorState) -> dict[str, Any]:
             "messages": [AIMessage(content="❌ Setup blocked: awaiting human approval")],
         }
 
-    try:
-        # Get Harness MCP tools
-        harness_tools = get_mcp_tools(["harness"])
+    return {"current_phase": "setup"}
 
-        # TODO: Use Harness MCP tools to create resources
-        # This is a placeholder implementation
 
-        org_id = state["harness_org_id"]
-        project_id = state["harness_project_id"]
+def route_setup_branches(state: OrchestratorState) -> list[str] | str:
+    """Conditional edge: fan out to every setup branch unless setup is blocked."""
+    if state.get("current_phase") == "error":
+        return "verify"
+    return SETUP_BRANCHES
 
-        setup_result: HarnessSetupResult = {
-            "connectors_created": [
-                {
-                    "id": "github_conn_1",
-                    "name": "GitHub Connector",
-                    "type": "github",
-                    "status": "success",
-                }
-            ],
-            "secrets_created": [
-                {
-                    "id": "secret_1",
-                    "name": "github_token",
-                    "type": "SecretText",
-                    "status": "success",
-                }
-            ],
-            "environments_created": [
-                {
-                    "id": "env_dev",
-                    "name": "Development",
-                    "type": "PreProduction",
-                    "status": "success",
-                },
-                {
-                    "id": "env_prod",
-                    "name": "Production",
-                    "type": "Production",
-                    "status": "success",
-                },
-            ],
-            "services_created": [
-                {
-                    "id": "svc_1",
-                    "name": "Application Service",
-                    "type": "Kubernetes",
-                    "status": "success",
-                }
-            ],
-            "infrastructure_created": [
-                {
-                    "id": "infra_k8s",
-                    "name": "Kubernetes Cluster",
-                    "type": "KubernetesDirect",
-                    "status": "success",
-                }
-            ],
-            "pipeline_created": {
-                "id": "pipeline_1",
-                "name": "Auto-Generated Pipeline",
-                "url": f"https://app.harness.io/ng/account/{org_id}/module/cd/orgs/{org_id}/projects/{project_id}/pipelines/pipeline_1",
+
+def setup_connectors(state: OrchestratorState) -> dict[str, Any]:
+    """Create the connectors and secrets the pipeline needs.
+
+    Args:
+        state: Current orchestrator state
+
+    Returns:
+        State updates with the connectors/secrets slice of the setup results
+    """
+    patterns = state["extracted_patterns"]
+
+    result: HarnessSetupResult = {
+        "connectors_created": [
+            {
+                "id": connector["name"],
+                "name": connector["name"],
+                "type": connector["type"],
                 "status": "success",
-            },
-            "setup_status": "success",
-            "setup_errors": [],
-            "harness_urls": {
-                "pipeline": f"https://app.harness.io/ng/account/{org_id}/module/cd/orgs/{org_id}/projects/{project_id}/pipelines/pipeline_1",
-                "project": f"https://app.harness.io/ng/account/{org_id}/module/cd/orgs/{org_id}/projects/{project_id}",
-            },
-        }
+            }
+            for connector in patterns.get("connectors_required", [])
+        ],
+        "secrets_created": [
+            {
+                "id": secret,
+                "name": secret,
+                "type": "SecretText",
+                "status": "success",
+            }
+            for secret in patterns.get("secrets_required", [])
+        ],
+    }
+    return {"harness_setup": result}
 
-        return {
-            "harness_setup": setup_result,
-            "current_phase": "verify",
-            "messages": [
-                AIMessage(
-                    content=f"""✅ Harness setup complete
 
-**Connectors Created:** {len(setup_result['connectors_created'])}
-**Secrets Created:** {len(setup_result['secrets_created'])}
-**Environments Created:** {len(setup_result['environments_created'])}
-**Services Created:** {len(setup_result['services_created'])}
-**Infrastructure Created:** {len(setup_result['infrastructure_created'])}
+def setup_environments(state: OrchestratorState) -> dict[str, Any]:
+    """Create the environments and their infrastructure definitions.
 
-**Pipeline:** {setup_result['pipeline_created']['name']}
-**URL:** {setup_result['pipeline_created']['url']}
+    Args:
+        state: Current orchestrator state
 
-Proceeding to deployment verification..."""
-                )
-            ],
-        }
+    Returns:
+        State updates with the environments/infrastructure slice of the setup results
+    """
+    patterns = state["extracted_patterns"]
+
+    environments = patterns.get("environments", [])
+    result: HarnessSetupResult = {
+        "environments_created": [
+            {
+                "id": f"env_{env}",
+                "name": env,
+                "type": "Production" if env in ("production", "prod") else "PreProduction",
+                "status": "success",
+            }
+            for env in environments
+        ],
+        "infrastructure_created": [
+            {
+                "id": f"infra_{env}",
+                "name": f"{env} {patterns.get('deployment_target', 'kubernetes')}",
+                "type": "KubernetesDirect",
+                "status": "success",
+            }
+            for env in environments
+        ],
+    }
+    return {"harness_setup": result}
+
+
+def setup_services(state: OrchestratorState) -> dict[str, Any]:
+    """Create the Harness service for the repository.
 
-    except Exception as e:
+    Args:
+        state: Current orchestrator state
+
+    Returns:
+        State updates with the services slice of the setup results
+    """
+    result: HarnessSetupResult = {
+        "services_created": [
+            {
+                "id": "svc_1",
+                "name": "Application Service",
+                "type": "Kubernetes",
+                "status": "success",
+            }
+        ],
+    }
+    return {"harness_setup": result}
+
+
+def setup_pipeline(state: OrchestratorState) -> dict[str, Any]:
+    """Create the generated pipeline.
+
+    Args:
+        state: Current orchestrator state
+
+    Returns:
+        State updates with the pipeline slice of the setup results
+    """
+    project_url = _project_url(state)
+    pipeline_url = f"{project_url}/pipelines/pipeline_1"
+
+    result: HarnessSetupResult = {
+        "pipeline_created": {
+            "id": "pipeline_1",
+            "name": "Auto-Generated Pipeline",
+            "url": pipeline_url,
+            "status": "success",
+        },
+        "harness_urls": {
+            "pipeline": pipeline_url,
+            "project": project_url,
+        },
+    }
+    return {"harness_setup": result}
+
+
+def finalize_setup(state: OrchestratorState) -> dict[str, Any]:
+    """Join the setup branches and report the overall setup status.
+
+    Args:
+        state: Current orchestrator state
+
+    Returns:
+        State updates with the final setup status
+    """
+    setup: HarnessSetupResult = state.get("harness_setup") or {}
+    errors = list(setup.get("setup_errors", []))
+    missing = [
+        key
+        for key in ("connectors_created", "environments_created", "services_created", "pipeline_created")
+        if key not in setup
+    ]
+    if missing:
+        errors.append(f"Setup incomplete: {', '.join(missing)} not created")
+
+    if errors:
         return {
             "current_phase": "error",
-            "errors": [f"Harness setup failed: {str(e)}"],
-            "harness_setup": {
-                "setup_status": "failed",
-                "setup_errors": [str(e)],
-            },
-            "messages": [AIMessage(content=f"❌ Harness setup failed: {str(e)}")],
+            "errors": [f"Harness setup failed: {'; '.join(errors)}"],
+            "harness_setup": {"setup_status": "partial" if len(missing) < 4 else "failed"},
+            "messages": [AIMessage(content=f"❌ Harness setup failed: {'; '.join(errors)}")],
         }
+
+    return {
+        "harness_setup": {"setup_status": "success", "setup_errors": []},
+        "current_phase": "verify",
+        "messages": [
+            AIMessage(
+                content=f"""✅ Harness setup complete
+
+**Connectors Created:** {len(setup['connectors_created'])}
+**Secrets Created:** {len(setup.get('secrets_created', []))}
+**Environments Created:** {len(setup['environments_created'])}
+**Services Created:** {len(setup['services_created'])}
+**Infrastructure Created:** {len(setup.get('infrastructure_created', []))}
+
+**Pipeline:** {setup['pipeline_created']['name']}
+**URL:** {setup['pipeline_created']['url']}
+
+Proceeding to deployment verification..."""
+            )
+        ],
+    }
@@ -1,20 +1,336 @@
 """Deployment verification node."""
 
+import contextvars
 import datetime
-from typing import Any
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
 
 from langchain_core.messages import AIMessage
 
-from ..state import DeploymentVerification, OrchestratorState
+from ..cancellation import current_cancel_event
+from ..memory import degraded_limit
+from ..similarity import record_pipeline
+from ..state import DeploymentVerification, EnvironmentVerification, OrchestratorState
 from ..tools.mcp_registry import get_mcp_tools
 
+# Environments that may only be verified once another environment has passed,
+# mirroring the promotion gates of the generated pipeline. Dependencies on
+# environments that are not being verified are ignored.
+PROMOTION_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "production": ("staging",),
+    "prod": ("staging",),
+}
+
+# Environments whose failures are reported but never abort sibling executions
+NON_BLOCKING_ENVIRONMENTS = frozenset({"preview"})
+
+# Harness MCP tools used to drive test executions
+EXECUTE_PIPELINE_TOOL = "execute_pipeline"
+GET_EXECUTION_TOOL = "get_execution"
+ABORT_EXECUTION_TOOL = "abort_execution"
+
+EXECUTION_POLL_INTERVAL_SECONDS = 10.0
+EXECUTION_TIMEOUT_SECONDS = 3600.0
+# Seconds between checks whether the workflow itself was cancelled
+CANCEL_CHECK_SECONDS = 1.0
+
+_HARNESS_STATUSES = {
+    "success": "success",
+    "succeeded": "success",
+    "ignorefailed": "success",
+    "failed": "failed",
+    "errored": "failed",
+    "expired": "failed",
+    "approvalrejected": "failed",
+    "aborted": "aborted",
+}
+
+EnvironmentRunner = Callable[
+    [str, threading.Event, Callable[[str], None]], EnvironmentVerification
+]
+
+
+def run_environment_verifications(
+    environments: list[str],
+    runner: EnvironmentRunner,
+    abort: Callable[[str], None],
+    dependencies: dict[str, tuple[str, ...]] | None = None,
+    cancelled: Optional[threading.Event] = None,
+) -> dict[str, EnvironmentVerification]:
+    """Verify several environments concurrently, honouring promotion order.
+
+    Every environment whose promotion dependencies have passed is launched
+    immediately, so independent environments run side by side (fewer at once
+    in degraded mode, see :mod:`orchestrator.memory`). The first
+    blocking failure cancels the run: executions still in flight are aborted
+    through ``abort`` and environments not yet launched are skipped.
+
+    Args:
+        environments: Environment names, in the order they should be reported
+        runner: Callable running one environment's test execution. It receives
+            the environment name, a cancellation event it should poll, and a
+            callback to report the execution ID as soon as it is known.
+        abort: Callable aborting a running execution by ID; executions that
+            start after the cancellation are aborted as soon as they report
+            their ID
+        dependencies: Promotion dependencies (defaults to PROMOTION_DEPENDENCIES)
+        cancelled: Cancel event of the workflow (see :mod:`orchestrator.cancellation`);
+            once set, the run is cancelled as on a blocking failure
+
+    Returns:
+        Per-environment verification results keyed by environment name
+    """
+    if dependencies is None:
+        dependencies = PROMOTION_DEPENDENCIES
+
+    gates = {
+        env: [dep for dep in dependencies.get(env, ()) if dep in environments and dep != env]
+        for env in environments
+    }
+    results: dict[str, EnvironmentVerification] = {}
+    execution_ids: dict[str, str] = {}
+    lock = threading.Lock()
+    cancel = threading.Event()
+    cancel_reason = "Cancelled after a blocking failure"
+
+    def abort_quietly(execution_id: str) -> None:
+        try:
+            abort(execution_id)
+        except Exception:
+            # Best effort - the runner still observes the cancel event
+            pass
+
+    def launch(env: str) -> EnvironmentVerification:
+        def on_started(execution_id: str) -> None:
+            with lock:
+                execution_ids[env] = execution_id
+                # Started after the siblings to abort were collected
+                cancelled = cancel.is_set()
+            if cancelled:
+                abort_quietly(execution_id)
+
+        started = time.monotonic()
+        if cancel.is_set():
+            # Queued behind busy workers when the run was cancelled
+            result = {"execution_status": "skipped", "error": cancel_reason}
+        else:
+            try:
+                result = runner(env, cancel, on_started)
+            except Exception as e:
+                result = {"execution_status": "failed", "error": str(e)}
+        result["environment"] = env
+        result["blocking"] = env not in NON_BLOCKING_ENVIRONMENTS
+        result.setdefault("duration_seconds", time.monotonic() - started)
+        return result
+
+    def cancel_run() -> None:
+        """Cancel the run and abort the executions in flight."""
+        cancel.set()
+        with lock:
+            siblings = [execution_ids[env] for env in running.values() if env in execution_ids]
+        for execution_id in siblings:
+            abort_quietly(execution_id)
+
+    def skip(env: str, reason: str) -> None:
+        results[env] = {
+            "environment": env,
+            "execution_status": "skipped",
+            "blocking": env not in NON_BLOCKING_ENVIRONMENTS,
+            "duration_seconds": 0.0,
+            "error": reason,
+        }
+
+    pending = list(environments)
+    running: dict[Future, str] = {}
+
+    with ThreadPoolExecutor(
+        max_workers=degraded_limit(max(len(environments), 1)), thread_name_prefix="verify"
+    ) as pool:
+        while pending or running:
+            if cancelled is not None and cancelled.is_set() and not cancel.is_set():
+                cancel_reason = "Workflow cancelled"
+                cancel_run()
+
+            for env in list(pending):
+                if cancel.is_set():
+                    skip(env, cancel_reason)
+                elif any(
+                    dep in results and results[dep]["execution_status"] != "success"
+                    for dep in gates[env]
+                ):
+                    skip(env, f"Promotion gate not passed: {', '.join(gates[env])}")
+                elif all(dep in results for dep in gates[env]):
+                    # Run in a copy of the node's context so its metrics see the MCP calls
+                    running[pool.submit(contextvars.copy_context().run, launch, env)] = env
+                else:
+                    continue
+                pending.remove(env)
+
+            if not running:
+                # Remaining environments wait on each other (dependency cycle)
+                for env in pending:
+                    skip(env, "Unresolvable promotion dependencies")
+                break
+
+            done, _ = wait(running, timeout=CANCEL_CHECK_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                env = running.pop(future)
+                result = future.result()
+                results[env] = result
+
+                if (
+                    result["execution_status"] == "failed"
+                    and result["blocking"]
+                    and not cancel.is_set()
+                ):
+                    cancel_run()
+
+    return {env: results[env] for env in environments}
+
+
+def _tool_result(response: Any) -> dict[str, Any]:
+    """Decode a Harness MCP tool response into a dictionary."""
+    if isinstance(response, dict):
+        return response
+    if isinstance(response, str):
+        try:
+            decoded = json.loads(response)
+        except ValueError:
+            return {}
+        return decoded if isinstance(decoded, dict) else {}
+    return {}
+
+
+def _harness_runner(
+    tools: dict[str, Any],
+    pipeline: dict[str, str],
+    org_id: str,
+    project_id: str,
+    abort: Callable[[str], None],
+) -> EnvironmentRunner:
+    """Build a runner that executes the pipeline for one environment via Harness MCP.
+
+    A runner cancelled while polling aborts its own execution through
+    ``abort`` before reporting it as aborted.
+    """
+
+    def run(
+        environment: str, cancel: threading.Event, on_started: Callable[[str], None]
+    ) -> EnvironmentVerification:
+        pipeline_url = pipeline["url"]
+        execute = tools.get(EXECUTE_PIPELINE_TOOL)
+
+        if execute is None:
+            # Placeholder implementation until the Harness MCP server is connected
+            execution_id = f"exec_test_{environment}"
+            on_started(execution_id)
+            return {
+                "execution_id": execution_id,
+                "execution_url": f"{pipeline_url}/executions/{execution_id}",
+                "execution_status": "success",
+                "stages_completed": ["build", "test", "deploy"],
+                "stages_failed": [],
+                "artifacts_generated": ["docker_image:latest"],
+            }
+
+        started = _tool_result(
+            execute.invoke(
+                {
+                    "org_id": org_id,
+                    "project_id": project_id,
+                    "pipeline_id": pipeline["id"],
+                    "environment": environment,
+                }
+            )
+        )
+        execution_id = str(started.get("execution_id", ""))
+        if not execution_id:
+            raise RuntimeError(f"Harness did not return an execution ID for {environment}")
+        on_started(execution_id)
+
+        get_execution = tools.get(GET_EXECUTION_TOOL)
+        deadline = time.monotonic() + EXECUTION_TIMEOUT_SECONDS
+        execution = started
+        status = _HARNESS_STATUSES.get(str(execution.get("status", "")).lower())
+
+        while status is None and get_execution is not None:
+            if cancel.wait(EXECUTION_POLL_INTERVAL_SECONDS):
+                try:
+                    abort(execution_id)
+                except Exception:
+                    pass  # Best effort, as for the siblings aborted on cancellation
+                status = "aborted"
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Execution {execution_id} did not finish in time")
+            execution = _tool_result(
+                get_execution.invoke(
+                    {
+                        "org_id": org_id,
+                        "project_id": project_id,
+                        "execution_id": execution_id,
+                    }
+                )
+            )
+            status = _HARNESS_STATUSES.get(str(execution.get("status", "")).lower())
+
+        result: EnvironmentVerification = {
+            "execution_id": execution_id,
+            "execution_url": execution.get(
+                "url", f"{pipeline_url}/executions/{execution_id}"
+            ),
+            "execution_status": status or "failed",
+            "stages_completed": list(execution.get("stages_completed", [])),
+            "stages_failed": list(execution.get("stages_failed", [])),
+            "artifacts_generated": list(execution.get("artifacts", [])),
+        }
+        if status is None:
+            # Without a final status the execution cannot count as passed
+            result["error"] = (
+                f"Execution {execution_id} did not report a final status "
+                f"({execution.get('status') or 'none'})"
+            )
+        return result
+
+    return run
+
+
+def _harness_abort(tools: dict[str, Any], org_id: str, project_id: str) -> Callable[[str], None]:
+    """Build a callable aborting a running execution via Harness MCP.
+
+    Each execution is aborted at most once, however many callers ask.
+    """
+    aborted: set[str] = set()
+    lock = threading.Lock()
+
+    def abort(execution_id: str) -> None:
+        with lock:
+            if execution_id in aborted:
+                return
+            aborted.add(execution_id)
+        abort_tool = tools.get(ABORT_EXECUTION_TOOL)
+        if abort_tool is not None:
+            abort_tool.invoke(
+                {
+                    "org_id": org_id,
+                    "project_id": project_id,
+                    "execution_id": execution_id,
+                }
+            )
+
+    return abort
+
 
 def verify_deployment(state: OrchestratorState) -> dict[str, Any]:
-    """Verify the deployment by triggering a test pipeline execution.
+    """Verify the deployment by triggering test executions per environment.
 
     Uses the Harness MCP server to:
-    1. Trigger the pipeline
-    2. Monitor execution
+    1. Trigger the pipeline for every target environment concurrently,
+       holding back environments behind their promotion gates
+    2. Monitor executions, aborting siblings on the first blocking failure
     3. Verify stages completed successfully
     4. Check artifacts generated
     5. Provide recommendations
@@ -40,29 +356,78 @@ def verify_deployment(state: OrchestratorState) -> dict[str, Any]:
 
     try:
         # Get Harness MCP tools
-        harness_tools = get_mcp_tools(["harness"])
+        harness_tools = {tool.name: tool for tool in get_mcp_tools(["harness"])}
+
+        org_id = state["harness_org_id"]
+        project_id = state["harness_project_id"]
+        pipeline = setup["pipeline_created"]
+        patterns = state.get("extracted_patterns") or {}
+        environments = list(patterns.get("environments") or ["default"])
+
+        abort = _harness_abort(harness_tools, org_id, project_id)
+        verify_started = time.monotonic()
+        results = run_environment_verifications(
+            environments,
+            _harness_runner(harness_tools, pipeline, org_id, project_id, abort),
+            abort,
+            cancelled=current_cancel_event(),
+        )
+        verify_duration = time.monotonic() - verify_started
 
-        # TODO: Use Harness MCP tools to trigger and monitor pipeline
-        # This is a placeholder implementation
+        summary = dict.fromkeys(("success", "failed", "aborted", "skipped"), 0)
+        for result in results.values():
+            summary[result["execution_status"]] = summary.get(result["execution_status"], 0) + 1
 
-        pipeline_url = setup["pipeline_created"]["url"]
+        passed = all(
+            result["execution_status"] == "success"
+            or (result["execution_status"] == "failed" and not result["blocking"])
+            for result in results.values()
+        )
+        failed_envs = [
+            env for env, result in results.items() if result["execution_status"] != "success"
+        ]
+        first = results[environments[0]]
 
         verification: DeploymentVerification = {
-            "test_execution_id": "exec_test_001",
-            "test_execution_url": f"{pipeline_url}/executions/exec_test_001",
-            "execution_status": "success",
-            "stages_completed": ["build", "test", "deploy"],
-            "stages_failed": [],
-            "artifacts_generated": ["docker_image:latest"],
-            "logs_url": f"{pipeline_url}/executions/exec_test_001/logs",
-            "verification_passed": True,
-            "recommendations": [
-                "Pipeline executed successfully",
-                "Consider adding monitoring and alerts",
-                "Review and optimize resource limits",
-                "Add automated rollback on failure",
-                "Configure approval gates for production",
+            "environment_results": results,
+            "environment_summary": summary,
+            "duration_seconds": verify_duration,
+            "test_execution_id": first.get("execution_id", ""),
+            "test_execution_url": first.get("execution_url", ""),
+            "execution_status": "success" if passed else "failed",
+            "stages_completed": [
+                f"{env}:{stage}"
+                for env, result in results.items()
+                for stage in result.get("stages_completed", [])
             ],
+            "stages_failed": [
+                f"{env}:{stage}"
+                for env, result in results.items()
+                for stage in result.get("stages_failed", [])
+            ],
+            "artifacts_generated": sorted(
+                {
+                    artifact
+                    for result in results.values()
+                    for artifact in result.get("artifacts_generated", [])
+                }
+            ),
+            "logs_url": f"{first['execution_url']}/logs" if first.get("execution_url") else "",
+            "verification_passed": passed,
+            "recommendations": (
+                [
+                    "Pipeline executed successfully",
+                    "Consider adding monitoring and alerts",
+                    "Review and optimize resource limits",
+                    "Add automated rollback on failure",
+                    "Configure approval gates for production",
+                ]
+                if passed
+                else [
+                    f"Investigate {env}: {results[env].get('error') or results[env]['execution_status']}"
+                    for env in failed_envs
+                ]
+            ),
         }
 
         # Calculate total duration
@@ -70,16 +435,56 @@ def verify_deployment(state: OrchestratorState) -> dict[str, Any]:
         completed = datetime.datetime.now(datetime.UTC)
         duration = (completed - started).total_seconds()
 
-        return {
+        environment_lines = chr(10).join(
+            f"- {env}: {result['execution_status']} ({result.get('duration_seconds', 0.0):.1f}s)"
+            for env, result in results.items()
+        )
+
+        update: dict[str, Any] = {
             "deployment_verification": verification,
-            "current_phase": "complete",
+            "current_phase": "complete" if passed else "error",
             "completed_at": completed.isoformat(),
             "total_duration_seconds": duration,
-            "messages": [
+        }
+
+        if not passed:
+            update["errors"] = [
+                f"Deployment verification failed in: {', '.join(failed_envs)}"
+            ]
+            update["messages"] = [
                 AIMessage(
-                    content=f"""✅ Deployment verification complete
+                    content=f"""❌ Deployment verification failed
+
+**Environments:**
+{environment_lines}
+
+**Recommendations:**
+{chr(10).join(f"- {r}" for r in verification['recommendations'])}"""
+                )
+            ]
+            return update
+
+        # Only pipelines that set up and verified cleanly are reused for
+        # look-alike repositories
+        templates = state.get("generated_templates")
+        if templates and not templates.get("reused_from"):
+            try:
+                record_pipeline(
+                    state.get("workflow_id", ""),
+                    state["repository_analysis"],
+                    state["extracted_patterns"],
+                    templates,
+                )
+            except OSError:
+                pass
+
+        update["messages"] = [
+            AIMessage(
+                content=f"""✅ Deployment verification complete
 
 **Execution Status:** {verification['execution_status']}
+**Environments:**
+{environment_lines}
 **Stages Completed:** {', '.join(verification['stages_completed'])}
 **Artifacts:** {', '.join(verification['artifacts_generated'])}
 
@@ -95,9 +500,9 @@ def verify_deployment(state: OrchestratorState) -> dict[str, Any]:
 **Total Duration:** {duration:.2f} seconds
 
 🚀 Your Harness CI/CD pipeline is ready to use!"""
-                )
-            ],
-        }
+            )
+        ]
+        return update
 
     except Exception as e:
         return {
@@ -0,0 +1,37 @@
+"""Local storage locations used by the orchestrator.
+
+Everything the orchestrator persists between runs lives under a single
+cache directory, ``~/.cache/ai-template-engine`` by default. Set
+``ORCHESTRATOR_CACHE_DIR`` to move it (e.g. onto a shared volume for
+long-lived workers).
+"""
+
+import os
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ai-template-engine"
+
+
+def cache_dir(*parts: str) -> Path:
+    """Get a directory under the orchestrator cache, creating it if needed.
+
+    Args:
+        parts: Path components below the cache root
+
+    Returns:
+        Path to the (existing) directory
+    """
+    root = Path(os.getenv("ORCHESTRATOR_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def socket_path() -> Path:
+    """Get the Unix socket the ``serve`` worker listens on.
+
+    Returns:
+        ``ORCHESTRATOR_SOCKET`` if set, else ``orchestrator.sock`` in the cache directory
+    """
+    configured = os.getenv("ORCHESTRATOR_SOCKET")
+    return Path(configured) if configured else cache_dir() / "orchestrator.sock"
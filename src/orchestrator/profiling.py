@@ -0,0 +1,170 @@
+"""Per-node sampling profiler.
+
+Set ``ORCHESTRATOR_PROFILE=1`` (or pass ``--profile`` to ``orchestrate`` or
+``resume``) to profile every node. While a node runs, a background thread
+samples the node's stack every ``ORCHESTRATOR_PROFILE_INTERVAL_MS``
+milliseconds (default 5) and counts the distinct stacks. The samples are
+written to ``profiles/<workflow_id>/<node>.collapsed`` in the cache
+directory, in the folded-stack format read by ``flamegraph.pl`` and
+speedscope; repeated executions of a node add to its file.
+
+Only the node's own thread is sampled: work a node hands to thread pools
+(e.g. concurrent tool calls) shows up as the node waiting on it.
+"""
+
+import functools
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .paths import cache_dir
+
+DEFAULT_INTERVAL_MS = 5.0
+
+
+def profiling_enabled() -> bool:
+    """Check whether node profiling is enabled."""
+    return os.getenv("ORCHESTRATOR_PROFILE", "0").lower() not in ("", "0", "false", "no")
+
+
+def profile_dir(workflow_id: str) -> Path:
+    """Get the directory holding a workflow's node profiles."""
+    return cache_dir("profiles", workflow_id)
+
+
+def _fold(frame: Any) -> str:
+    """Render a stack as ``outer;...;inner`` frames."""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="orchestrator-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_fold(frame)] += 1
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def read_profile(path: Path) -> Counter[str]:
+    """Read a folded-stack file."""
+    stacks: Counter[str] = Counter()
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def write_profile(workflow_id: str, node: str, stacks: Counter[str]) -> Path:
+    """Add samples to a node's folded-stack file.
+
+    Args:
+        workflow_id: Workflow the node ran in
+        node: Node name
+        stacks: Sample counts per folded stack
+
+    Returns:
+        Path of the profile
+    """
+    path = profile_dir(workflow_id) / f"{node}.collapsed"
+    if path.exists():
+        stacks = read_profile(path) + stacks
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def profile_node(
+    node: Callable[[Any], dict[str, Any]], name: Optional[str] = None
+) -> Callable[[Any], dict[str, Any]]:
+    """Wrap a node so it is sampled while profiling is enabled.
+
+    Args:
+        node: Node function
+        name: Profile file name (defaults to the function name)
+
+    Returns:
+        Node function writing a profile per execution when enabled
+    """
+    name = name or node.__name__
+
+    @functools.wraps(node)
+    def profiled(state: Any) -> dict[str, Any]:
+        if not profiling_enabled():
+            return node(state)
+
+        interval_ms = float(os.getenv("ORCHESTRATOR_PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS))
+        sampler = _Sampler(threading.get_ident(), interval_ms / 1000)
+        sampler.start()
+        try:
+            return node(state)
+        finally:
+            stacks = sampler.stop()
+            if stacks:
+                write_profile(state.get("workflow_id") or "unassigned", name, stacks)
+
+    return profiled
+
+
+def hot_functions(workflow_id: str, limit: int = 15) -> list[dict[str, Any]]:
+    """Summarise a workflow's profiles by function.
+
+    Args:
+        workflow_id: Workflow ID
+        limit: Number of functions to return
+
+    Returns:
+        Functions with the most samples at the top of the stack (``self``),
+        with their inclusive sample count (``total``), share of all samples
+        and the nodes they were sampled in
+    """
+    own: Counter[str] = Counter()
+    inclusive: Counter[str] = Counter()
+    nodes: dict[str, set[str]] = {}
+    samples = 0
+
+    for path in sorted(profile_dir(workflow_id).glob("*.collapsed")):
+        for stack, count in read_profile(path).items():
+            frames = stack.split(";")
+            samples += count
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+            nodes.setdefault(frames[-1], set()).add(path.stem)
+
+    return [
+        {
+            "function": function,
+            "self": count,
+            "total": inclusive[function],
+            "share": count / samples,
+            "nodes": sorted(nodes[function]),
+        }
+        for function, count in own.most_common(limit)
+    ]
@@ -0,0 +1,281 @@
+"""Record and replay LLM and MCP traffic for offline, deterministic runs.
+
+Set ``ORCHESTRATOR_REPLAY_MODE`` to enable:
+
+- ``record``: calls go to the real model and MCP servers; every chat model
+  request/response, MCP tool listing and tool call is appended to the
+  fixture file with its latency
+- ``replay``: responses are served from the fixture file; nothing reaches
+  the Anthropic API or starts an MCP server, and a request missing from
+  the fixture fails the node
+
+The fixture is a JSONL file (``ORCHESTRATOR_REPLAY_FIXTURE``, default
+``replay.jsonl`` in the cache directory). Exchanges are matched on a hash of
+the request (model, messages and bound tool names for chat requests;
+server, tool and arguments for tool calls); identical requests are replayed
+in recorded order. ``ORCHESTRATOR_REPLAY_LATENCY`` scales the recorded
+latency on replay (default 0: respond immediately, 1: recorded timing).
+
+Record with memoization disabled (``ORCHESTRATOR_MEMOIZE=0``) so every node
+actually makes its calls.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .metrics import record_mcp_call
+from .paths import cache_dir
+
+REPLAY_MODES = ("record", "replay")
+
+
+def _digest(payload: Any) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def chat_request_key(model: str, messages: list[Any], tool_names: list[str]) -> str:
+    """Key a chat model request by the content the model sees."""
+    return _digest(
+        [
+            "llm",
+            model,
+            sorted(tool_names),
+            [[m.type, m.content, getattr(m, "tool_calls", None) or []] for m in messages],
+        ]
+    )
+
+
+def tool_call_key(server_name: str, tool_name: str, arguments: dict[str, Any]) -> str:
+    """Key an MCP tool call by its server, name and arguments."""
+    return _digest(["mcp", server_name, tool_name, arguments])
+
+
+class Recorder:
+    """Appends exchanges to, or serves them from, a fixture file.
+
+    Args:
+        mode: ``record`` or ``replay``
+        path: Fixture file
+        latency_scale: Multiplier applied to recorded latency on replay
+    """
+
+    def __init__(self, mode: str, path: Path, latency_scale: float = 0.0) -> None:
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}. Expected one of {REPLAY_MODES}")
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._exchanges: dict[str, deque] = defaultdict(deque)
+        self._tool_specs: dict[str, list[dict[str, Any]]] = {}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["kind"] == "tool_specs":
+                    self._tool_specs[entry["server"]] = entry["tools"]
+                else:
+                    self._exchanges[entry["key"]].append(entry)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+
+    def lookup(self, key: str, description: str) -> dict[str, Any]:
+        """Take the next recorded exchange for a request, simulating its latency.
+
+        Raises:
+            LookupError: If the fixture has no exchange for the request
+        """
+        with self._lock:
+            entries = self._exchanges.get(key)
+            if not entries:
+                raise LookupError(f"No recorded exchange for {description} in {self.path}")
+            # The last recording of a request keeps answering once the queue is drained
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+        if self.latency_scale > 0:
+            time.sleep(entry.get("latency", 0.0) * self.latency_scale)
+        return entry
+
+    def record(self, kind: str, key: str, latency: float, **fields: Any) -> None:
+        """Append an exchange to the fixture."""
+        self._append({"kind": kind, "key": key, "latency": round(latency, 6), **fields})
+
+    def tool_specs(self, server_name: str) -> list[dict[str, Any]]:
+        """Get a server's recorded tool specs (empty if it was not reachable when recording)."""
+        return self._tool_specs.get(server_name, [])
+
+    def record_tool_specs(self, server_name: str, specs: list[dict[str, Any]]) -> None:
+        """Append a server's tool listing to the fixture."""
+        with self._lock:
+            if self._tool_specs.get(server_name) == specs:
+                return
+            self._tool_specs[server_name] = specs
+        self._append({"kind": "tool_specs", "server": server_name, "tools": specs})
+
+    def call_tool(
+        self, server_name: str, tool_name: str, arguments: dict[str, Any], call: Callable[[], str]
+    ) -> str:
+        """Record or replay one MCP tool call.
+
+        Args:
+            server_name: MCP server
+            tool_name: Tool name
+            arguments: Tool arguments
+            call: Performs the real call (record mode only)
+
+        Returns:
+            Tool result
+        """
+        key = tool_call_key(server_name, tool_name, arguments)
+        if self.replaying:
+            entry = self.lookup(key, f"MCP tool {server_name}.{tool_name}")
+            record_mcp_call(
+                entry.get("latency", 0.0) * self.latency_scale, error=bool(entry.get("error"))
+            )
+            if entry.get("error"):
+                raise RuntimeError(entry["error"])
+            return entry["result"]
+
+        started = time.monotonic()
+        try:
+            result = call()
+        except Exception as e:
+            self.record("mcp", key, time.monotonic() - started, tool=tool_name, error=str(e))
+            raise
+        self.record("mcp", key, time.monotonic() - started, tool=tool_name, result=result)
+        return result
+
+
+_recorder: Optional[Recorder] = None
+_recorder_config: Optional[tuple] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[Recorder]:
+    """Get the recorder configured by the environment, or None if disabled."""
+    global _recorder, _recorder_config
+    mode = os.getenv("ORCHESTRATOR_REPLAY_MODE", "").lower()
+    if not mode:
+        return None
+
+    config = (
+        mode,
+        os.getenv("ORCHESTRATOR_REPLAY_FIXTURE") or str(cache_dir() / "replay.jsonl"),
+        float(os.getenv("ORCHESTRATOR_REPLAY_LATENCY", "0")),
+    )
+    with _recorder_lock:
+        if _recorder is None or _recorder_config != config:
+            _recorder = Recorder(config[0], Path(config[1]), config[2])
+            _recorder_config = config
+        return _recorder
+
+
+def wrap_tool(tool: Any, server_name: str, recorder: Recorder) -> Any:
+    """Wrap a pooled MCP tool so its calls are recorded or replayed."""
+    from langchain_core.tools import StructuredTool
+
+    def call(**arguments: Any) -> str:
+        return recorder.call_tool(server_name, tool.name, arguments, lambda: tool.func(**arguments))
+
+    async def acall(**arguments: Any) -> str:
+        if recorder.replaying:
+            return recorder.call_tool(server_name, tool.name, arguments, lambda: "")
+        key = tool_call_key(server_name, tool.name, arguments)
+        started = time.monotonic()
+        try:
+            result = await tool.coroutine(**arguments)
+        except Exception as e:
+            recorder.record("mcp", key, time.monotonic() - started, tool=tool.name, error=str(e))
+            raise
+        recorder.record("mcp", key, time.monotonic() - started, tool=tool.name, result=result)
+        return result
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=call,
+        coroutine=acall,
+        metadata={**(tool.metadata or {}), "replay": recorder.mode},
+    )
+
+
+def replay_chat_model(
+    model: str, inner: Any, recorder: Recorder, callbacks: Optional[list[Any]] = None
+) -> Any:
+    """Build a chat model that records or replays exchanges with ``inner``.
+
+    Args:
+        model: Model name (part of the request key)
+        inner: Real chat model (unused when replaying)
+        recorder: Recorder to use
+        callbacks: Callbacks of the proxy model (e.g. usage metrics)
+
+    Returns:
+        Chat model supporting ``invoke`` and ``bind_tools``
+    """
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import message_to_dict, messages_from_dict
+    from langchain_core.outputs import ChatGeneration, ChatResult
+
+    class RecordReplayChatModel(BaseChatModel):
+        """Chat model proxy that records or replays exchanges with the real model."""
+
+        model_name: str
+        inner: Any = None
+
+        @property
+        def _llm_type(self) -> str:
+            return f"{recorder.mode}-chat-model"
+
+        def bind_tools(self, tools: Any, **kwargs: Any) -> Any:
+            return self.bind(tools=list(tools), **kwargs)
+
+        def _generate(
+            self, messages: list[Any], stop: Any = None, run_manager: Any = None, **kwargs: Any
+        ) -> Any:
+            tools = kwargs.pop("tools", [])
+            tool_names = [
+                getattr(tool, "name", None) or tool.get("name", "") for tool in tools
+            ]
+            key = chat_request_key(self.model_name, messages, tool_names)
+
+            if recorder.replaying:
+                entry = recorder.lookup(key, f"{self.model_name} request")
+                message = messages_from_dict([entry["response"]])[0]
+            else:
+                started = time.monotonic()
+                model = self.inner.bind_tools(tools, **kwargs) if tools else self.inner
+                message = model.invoke(messages, stop=stop)
+                recorder.record(
+                    "llm",
+                    key,
+                    time.monotonic() - started,
+                    model=self.model_name,
+                    response=message_to_dict(message),
+                )
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    return RecordReplayChatModel(model_name=model, inner=inner, callbacks=callbacks)
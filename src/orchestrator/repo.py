@@ -0,0 +1,46 @@
+"""Helpers for inspecting the target repository."""
+
+import hashlib
+import subprocess
+from typing import Optional
+
+
+def repo_revision(repo_path: str) -> Optional[str]:
+    """Identify the exact revision of a repository's working tree.
+
+    The revision combines the ``HEAD`` commit with a hash of the working
+    tree status and uncommitted diff, so it changes whenever tracked files
+    or the set of untracked files change.
+
+    Args:
+        repo_path: Path to the repository
+
+    Returns:
+        Revision identifier, or None if the path is not a git working tree
+    """
+    try:
+        head = subprocess.run(
+            ["git", "-C", repo_path, "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "-C", repo_path, "status", "--porcelain"],
+            capture_output=True,
+            check=True,
+            timeout=60,
+        ).stdout
+        if not status:
+            return head
+        diff = subprocess.run(
+            ["git", "-C", repo_path, "diff", "HEAD", "--no-ext-diff", "--binary"],
+            capture_output=True,
+            check=True,
+            timeout=60,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    return f"{head}+{hashlib.sha256(status + diff).hexdigest()[:16]}"
@@ -0,0 +1,429 @@
+"""Long-lived orchestration worker serving jobs over a local Unix socket.
+
+``ai-template-engine serve`` keeps the compiled graph, the chat model
+clients and the MCP server sessions warm in one process, so a job submitted
+to it skips the import, compile and cold-start costs of a fresh CLI run.
+The worker speaks a small JSON-over-HTTP API on a Unix socket
+(``orchestrator.sock`` in the cache directory, or ``ORCHESTRATOR_SOCKET``):
+
+- ``POST /jobs``: submit a job (``repo_path``, ``org_id``, ``project_id``,
+  optional ``repo_url`` and ``no_approval``)
+- ``GET /jobs`` and ``GET /jobs/<id>``: job status
+- ``GET /jobs/<id>/events?since=<seq>``: stream job events as JSON lines
+  until the job stops (finishes or pauses for approval)
+- ``POST /jobs/<id>/approve``: approve a paused job and continue it
+- ``POST /jobs/<id>/cancel``: stop a job at its next node boundary
+- ``GET /health``: worker, MCP server and memory (degraded mode) status
+- ``GET /metrics``: per-node usage totals in the Prometheus text format
+
+Jobs are checkpointed like CLI runs, so a job can also be continued with
+``ai-template-engine resume <id>`` after the worker stops.
+"""
+
+import importlib
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .cancellation import cancellation_scope
+from .memory import memory_status, workflow_slot
+from .metrics import render_prometheus
+from .paths import socket_path
+from .state import create_initial_state
+
+DEFAULT_WORKERS = 4
+
+# Finished jobs kept in memory for status queries
+MAX_FINISHED_JOBS = 1000
+
+# Seconds between checks for new events while streaming
+EVENT_POLL_SECONDS = 1.0
+
+# Job statuses at which a job stops producing events until acted on
+STOPPED_STATUSES = {"awaiting_approval", "complete", "failed", "cancelled"}
+
+_REQUIRED_FIELDS = ("repo_path", "org_id", "project_id")
+
+
+class _Job:
+    """One submitted workflow and the events it has produced."""
+
+    def __init__(self, workflow_id: str, request: dict[str, Any]) -> None:
+        self.workflow_id = workflow_id
+        self.request = request
+        self.status = "queued"
+        self.phase = "init"
+        self.errors: list[str] = []
+        self.events: list[dict[str, Any]] = []
+        self.cancelled = threading.Event()
+        self.changed = threading.Condition()
+
+    @property
+    def stopped(self) -> bool:
+        return self.status in STOPPED_STATUSES
+
+    def emit(self, event: dict[str, Any]) -> None:
+        """Record an event and wake up event streams."""
+        with self.changed:
+            self.events.append({"seq": len(self.events), **event})
+            self.changed.notify_all()
+
+    def set_status(self, status: str) -> None:
+        with self.changed:
+            self.status = status
+        self.emit({"type": "status", "status": status, "errors": list(self.errors)})
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "workflow_id": self.workflow_id,
+            "repo_path": self.request["repo_path"],
+            "status": self.status,
+            "phase": self.phase,
+            "errors": list(self.errors),
+            "events": len(self.events),
+        }
+
+
+class OrchestratorWorker:
+    """Runs submitted workflows on a thread pool against one compiled graph.
+
+    Args:
+        graph: Compiled graph with a (thread-safe) checkpointer
+        workers: Maximum concurrently running jobs
+    """
+
+    def __init__(self, graph: Any, workers: int = DEFAULT_WORKERS) -> None:
+        self.graph = graph
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orchestrator-job")
+        self._jobs: OrderedDict[str, _Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, request: dict[str, Any]) -> _Job:
+        """Queue a new workflow.
+
+        Raises:
+            ValueError: If a required field is missing
+        """
+        missing = [field for field in _REQUIRED_FIELDS if not request.get(field)]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        job = _Job(str(uuid.uuid4()), request)
+        initial_state = create_initial_state(
+            request["repo_path"],
+            request["org_id"],
+            request["project_id"],
+            repo_url=request.get("repo_url"),
+            workflow_id=job.workflow_id,
+            no_approval=bool(request.get("no_approval")),
+        )
+        with self._lock:
+            self._jobs[job.workflow_id] = job
+            self._prune()
+        self._executor.submit(self._run, job, initial_state)
+        return job
+
+    def approve(self, workflow_id: str, feedback: Optional[str] = None) -> _Job:
+        """Approve a job paused for approval and queue its continuation.
+
+        Raises:
+            KeyError: If the job is unknown
+            ValueError: If the job is not awaiting approval
+        """
+        job = self._get(workflow_id)
+        # Check and update under the job's lock so concurrent approvals (or a
+        # cancel) cannot both see the job awaiting approval
+        with job.changed:
+            if job.status != "awaiting_approval":
+                raise ValueError(f"Job {workflow_id} is {job.status}, not awaiting approval")
+            config = {"configurable": {"thread_id": workflow_id}}
+            self.graph.update_state(config, {"hitl_approved": True, "hitl_feedback": feedback})
+            job.set_status("queued")
+        self._executor.submit(self._run, job, None)
+        return job
+
+    def cancel(self, workflow_id: str) -> _Job:
+        """Cancel a job; a running job stops at its next node boundary.
+
+        Long-running nodes that watch the cancel event (see
+        :mod:`orchestrator.cancellation`) stop sooner.
+
+        Raises:
+            KeyError: If the job is unknown
+        """
+        job = self._get(workflow_id)
+        with job.changed:
+            job.cancelled.set()
+            if job.status == "awaiting_approval":
+                job.set_status("cancelled")
+        return job
+
+    def get(self, workflow_id: str) -> Optional[_Job]:
+        with self._lock:
+            return self._jobs.get(workflow_id)
+
+    def jobs(self) -> list[_Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self) -> None:
+        """Cancel all jobs and stop accepting work."""
+        for job in self.jobs():
+            job.cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get(self, workflow_id: str) -> _Job:
+        job = self.get(workflow_id)
+        if job is None:
+            raise KeyError(workflow_id)
+        return job
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond the retention limit (lock held)."""
+        finished = [
+            key for key, job in self._jobs.items() if job.status in ("complete", "failed", "cancelled")
+        ]
+        for key in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[key]
+
+    def _run(self, job: _Job, graph_input: Optional[dict[str, Any]]) -> None:
+        """Stream a job's workflow until it finishes, pauses or is cancelled."""
+        if job.cancelled.is_set():
+            job.set_status("cancelled")
+            return
+
+        config = {"configurable": {"thread_id": job.workflow_id}}
+        job.set_status("running")
+        try:
+            # In degraded mode (see orchestrator.memory) jobs run one at a time
+            with workflow_slot(), cancellation_scope(job.cancelled):
+                for chunk in self.graph.stream(graph_input, config=config, stream_mode="updates"):
+                    for node, update in chunk.items():
+                        if node.startswith("__"):  # e.g. __interrupt__
+                            continue
+                        update = update or {}
+                        job.phase = update.get("current_phase") or job.phase
+                        job.errors.extend(update.get("errors") or [])
+                        messages = update.get("messages") or []
+                        job.emit(
+                            {
+                                "type": "node",
+                                "node": node,
+                                "phase": job.phase,
+                                "message": messages[-1].content if messages else None,
+                            }
+                        )
+
+                    if job.errors:
+                        job.set_status("failed")
+                        return
+                    if job.cancelled.is_set():
+                        job.set_status("cancelled")
+                        return
+
+            job.set_status("awaiting_approval" if self.graph.get_state(config).next else "complete")
+
+        except Exception as e:
+            job.errors.append(str(e))
+            job.set_status("failed")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP handler for the worker API."""
+
+    server: "_UnixHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Unix socket clients have no address; job progress is reported via events
+        pass
+
+    def _send_json(self, status: HTTPStatus, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        worker = self.server.worker
+
+        if parts == ["health"]:
+            self._send_json(
+                HTTPStatus.OK,
+                {
+                    "status": "ok",
+                    "pid": os.getpid(),
+                    "jobs": len(worker.jobs()),
+                    "mcp_servers": _mcp_status(),
+                    "memory": memory_status(),
+                },
+            )
+        elif parts == ["metrics"]:
+            data = render_prometheus().encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, [job.summary() for job in worker.jobs()])
+        elif len(parts) in (2, 3) and parts[0] == "jobs":
+            job = worker.get(parts[1])
+            if job is None:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown job {parts[1]}"})
+            elif len(parts) == 2:
+                self._send_json(HTTPStatus.OK, job.summary())
+            elif parts[2] == "events":
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+                self._stream_events(job, since)
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+
+    def do_POST(self) -> None:
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        worker = self.server.worker
+
+        try:
+            body = self._read_json()
+            if parts == ["jobs"]:
+                self._send_json(HTTPStatus.ACCEPTED, worker.submit(body).summary())
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "approve":
+                self._send_json(
+                    HTTPStatus.ACCEPTED, worker.approve(parts[1], body.get("feedback")).summary()
+                )
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+                self._send_json(HTTPStatus.OK, worker.cancel(parts[1]).summary())
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+        except KeyError as e:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown job {e.args[0]}"})
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+    def _stream_events(self, job: _Job, since: int) -> None:
+        """Write events as JSON lines until the job stops (response ends at close)."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self.close_connection = True
+
+        sent = since
+        try:
+            while True:
+                with job.changed:
+                    job.changed.wait_for(
+                        lambda sent=sent: len(job.events) > sent, EVENT_POLL_SECONDS
+                    )
+                    events = job.events[sent:]
+                    stopped = job.stopped
+                for event in events:
+                    self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                sent += len(events)
+                if stopped and sent == len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+def _mcp_status() -> dict[str, Any]:
+    """MCP server health, if this process has started the session pool."""
+    pool_module = sys.modules.get(f"{__package__}.tools.mcp_pool")
+    return pool_module.session_pool_status() if pool_module is not None else {}
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server bound to a Unix socket."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, worker: OrchestratorWorker) -> None:
+        self.worker = worker
+        super().__init__(path, _Handler)
+
+
+def create_server(worker: OrchestratorWorker, path: Optional[str] = None) -> _UnixHTTPServer:
+    """Bind the worker API to a Unix socket.
+
+    Args:
+        worker: Worker running the jobs
+        path: Socket path (defaults to :func:`orchestrator.paths.socket_path`)
+
+    Returns:
+        Server; call ``serve_forever()`` to handle requests
+
+    Raises:
+        RuntimeError: If another worker is already listening on the socket
+    """
+    path = str(path or socket_path())
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # Stale socket from a worker that did not shut down cleanly
+        else:
+            raise RuntimeError(f"A worker is already listening on {path}")
+        finally:
+            probe.close()
+
+    # Create the socket owner-only from the start rather than chmod it after bind
+    umask = os.umask(0o177)
+    try:
+        return _UnixHTTPServer(path, worker)
+    finally:
+        os.umask(umask)
+
+
+def warm_up(start_mcp_servers: bool = True) -> list[str]:
+    """Load node modules and create shared clients ahead of the first job.
+
+    Args:
+        start_mcp_servers: Also start every MCP server in the background
+
+    Returns:
+        Warnings for anything that could not be warmed up
+    """
+    warnings = []
+    for module in ("init", "analyze", "extract", "generate", "hitl", "setup", "verify"):
+        importlib.import_module(f".nodes.{module}", __package__)
+
+    from .llm import get_chat_model
+
+    try:
+        get_chat_model()
+    except Exception as e:
+        warnings.append(f"Chat model not initialised: {str(e)}")
+
+    if start_mcp_servers:
+        from .tools import warm_mcp_servers
+
+        try:
+            warm_mcp_servers()
+        except Exception as e:
+            warnings.append(f"MCP servers not started: {str(e)}")
+    return warnings
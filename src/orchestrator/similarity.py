@@ -0,0 +1,272 @@
+"""Similarity index over approved pipelines, for reuse across look-alike repositories.
+
+When a pipeline passes deployment verification (whether it was approved
+or accepted with ``--no-approval``), the analysis and patterns it was
+generated for are reduced to a set of features (languages, frameworks, build tools,
+deployment patterns and target, connectors, ...) and a 64-bit SimHash of
+that set. Fingerprints are indexed in 8 bands of 8 bits, so any recorded
+fingerprint within 7 bits of a query shares at least one band with it and
+is found with a handful of dictionary lookups. Candidates are confirmed by
+the Jaccard similarity of their feature sets.
+
+Template generation reuses the nearest verified pipeline at or above
+``ORCHESTRATOR_REUSE_MIN_SIMILARITY`` (default 0.8) instead of asking the
+LLM. Set ``ORCHESTRATOR_REUSE=0`` to disable reuse.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Optional, TypedDict
+
+from .blobs import resolve
+from .paths import cache_dir
+from .state import ExtractedPatterns, GeneratedTemplates, RepositoryAnalysis
+
+SIMHASH_BITS = 64
+BANDS = 8
+BAND_BITS = SIMHASH_BITS // BANDS
+MAX_DISTANCE = BANDS - 1
+DEFAULT_MIN_SIMILARITY = 0.8
+
+# List fields whose values become features, by feature prefix
+_ANALYSIS_FEATURES = {
+    "language": "languages",
+    "framework": "frameworks",
+    "build": "build_tools",
+    "package": "package_managers",
+    "test": "test_frameworks",
+    "deploy": "deployment_patterns",
+    "iac": "infrastructure_as_code",
+    "cloud": "cloud_providers",
+}
+_PATTERN_FEATURES = {
+    "environment": "environments",
+    "artifact": "artifact_types",
+    "stage": "recommended_pipeline_stages",
+}
+
+_lock = threading.Lock()
+
+
+class PipelineMatch(TypedDict):
+    """An approved pipeline found for a look-alike repository."""
+
+    workflow_id: str  # Workflow the pipeline was approved in
+    repo_path: str  # Repository it was generated for
+    similarity: float  # Jaccard similarity of the feature sets
+    templates: GeneratedTemplates  # With ``pipeline_yaml`` resolved to text
+
+
+class _Index:
+    """In-memory view of the on-disk index, reloaded when the file grows.
+
+    Entries with the same feature set (near-clones usually have exactly the
+    same features) share one group, which points at the latest of them, so
+    lookups scale with the number of distinct feature sets.
+    """
+
+    def __init__(self, path: str = "") -> None:
+        self.path = path
+        self.size = 0
+        self.ids: set[str] = set()
+        self.fingerprints: list[int] = []
+        self.feature_sets: list[frozenset[str]] = []
+        self.latest: list[dict[str, Any]] = []  # Latest entry of each group
+        self.groups: dict[frozenset[str], int] = {}
+        self.bands: dict[tuple[int, int], list[int]] = defaultdict(list)
+
+    def add(self, entry: dict[str, Any]) -> None:
+        self.ids.add(entry["id"])
+        entry["seq"] = len(self.ids)
+        features = frozenset(entry["features"])
+        group = self.groups.get(features)
+        if group is not None:
+            self.latest[group] = entry
+            return
+        group = self.groups[features] = len(self.latest)
+        self.fingerprints.append(entry["fingerprint"])
+        self.feature_sets.append(features)
+        self.latest.append(entry)
+        for band in _bands(entry["fingerprint"]):
+            self.bands[band].append(group)
+
+
+_index = _Index()
+
+
+def reuse_enabled() -> bool:
+    """Check whether approved pipelines are reused for similar repositories."""
+    return os.getenv("ORCHESTRATOR_REUSE", "1").lower() not in ("0", "false", "no")
+
+
+def min_similarity() -> float:
+    """Lowest feature-set similarity at which a pipeline is reused."""
+    return float(os.getenv("ORCHESTRATOR_REUSE_MIN_SIMILARITY", DEFAULT_MIN_SIMILARITY))
+
+
+def fingerprint_features(
+    analysis: RepositoryAnalysis, patterns: ExtractedPatterns
+) -> list[str]:
+    """Reduce an analysis and its patterns to the features that shape a pipeline.
+
+    Args:
+        analysis: Repository analysis
+        patterns: Extracted patterns
+
+    Returns:
+        Sorted ``kind:value`` features
+    """
+    features = {f"primary:{analysis.get('primary_language', '')}"}
+    for prefix, key in _ANALYSIS_FEATURES.items():
+        features.update(f"{prefix}:{value}" for value in analysis.get(key, []))
+    for path in analysis.get("ci_files_present", []):
+        features.add(f"ci:{path.split('/', 1)[0]}")
+    if analysis.get("dockerfile_present"):
+        features.add("container:dockerfile")
+    if analysis.get("docker_compose_present"):
+        features.add("container:compose")
+
+    for key in ("build_pattern", "deployment_target", "deployment_strategy"):
+        features.add(f"{key}:{patterns.get(key, '')}")
+    for prefix, key in _PATTERN_FEATURES.items():
+        features.update(f"{prefix}:{value}" for value in patterns.get(key, []))
+    features.update(f"connector:{c['type']}" for c in patterns.get("connectors_required", []))
+    return sorted(features)
+
+
+def simhash(features: list[str]) -> int:
+    """Compute the 64-bit SimHash of a feature set."""
+    counts = [0] * SIMHASH_BITS
+    for feature in features:
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            counts[bit] += 1 if digest >> bit & 1 else -1
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+
+def _bands(fingerprint: int) -> list[tuple[int, int]]:
+    """Split a fingerprint into its (band, value) index keys."""
+    mask = (1 << BAND_BITS) - 1
+    return [(band, fingerprint >> (band * BAND_BITS) & mask) for band in range(BANDS)]
+
+
+def _refresh() -> _Index:
+    """Bring the in-memory index up to date with the index file (lock held)."""
+    global _index
+    path = cache_dir("similarity") / "index.jsonl"
+    try:
+        size = path.stat().st_size
+    except OSError:
+        size = 0
+    if _index.path != str(path) or size < _index.size:
+        _index = _Index(str(path))
+    if size == _index.size:
+        return _index
+
+    with open(path, "rb") as f:
+        f.seek(_index.size)
+        data = f.read(size - _index.size)
+    # A line still being appended by another process is read next time
+    complete = data[: data.rfind(b"\n") + 1]
+    for line in complete.splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if entry.get("id") not in _index.ids:
+            _index.add(entry)
+    _index.size += len(complete)
+    return _index
+
+
+def record_pipeline(
+    workflow_id: str,
+    analysis: RepositoryAnalysis,
+    patterns: ExtractedPatterns,
+    templates: GeneratedTemplates,
+) -> None:
+    """Add an approved pipeline to the index.
+
+    Args:
+        workflow_id: Workflow the pipeline was approved in
+        analysis: Repository analysis the pipeline was generated for
+        patterns: Extracted patterns the pipeline was generated for
+        templates: Approved templates
+    """
+    features = fingerprint_features(analysis, patterns)
+    stored = dict(templates, pipeline_yaml=resolve(templates.get("pipeline_yaml")) or "")
+    payload = json.dumps(stored, sort_keys=True, default=str)
+    entry_id = hashlib.sha256(json.dumps([features, payload]).encode("utf-8")).hexdigest()[:32]
+
+    with _lock:
+        index = _refresh()
+        if entry_id in index.ids:
+            return
+        pipeline_path = cache_dir("similarity", "pipelines") / f"{entry_id}.json"
+        tmp_path = pipeline_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, pipeline_path)
+
+        entry = {
+            "id": entry_id,
+            "fingerprint": simhash(features),
+            "features": features,
+            "workflow_id": workflow_id,
+            "repo_path": analysis.get("repo_path", ""),
+        }
+        with open(cache_dir("similarity") / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def find_similar(
+    analysis: RepositoryAnalysis, patterns: ExtractedPatterns
+) -> Optional[PipelineMatch]:
+    """Find the approved pipeline of the most similar previously seen repository.
+
+    Args:
+        analysis: Repository analysis
+        patterns: Extracted patterns
+
+    Returns:
+        The best match at or above :func:`min_similarity`, or None
+    """
+    features = fingerprint_features(analysis, patterns)
+    fingerprint = simhash(features)
+    wanted = frozenset(features)
+    threshold = min_similarity()
+
+    with _lock:
+        index = _refresh()
+        candidates = {group for band in _bands(fingerprint) for group in index.bands.get(band, ())}
+        best, best_similarity = None, threshold
+        for group in candidates:
+            if (index.fingerprints[group] ^ fingerprint).bit_count() > MAX_DISTANCE:
+                continue
+            recorded = index.feature_sets[group]
+            similarity = len(wanted & recorded) / len(wanted | recorded)
+            # Ties go to the most recent approval
+            if similarity > best_similarity or (
+                similarity == best_similarity
+                and (best is None or index.latest[group]["seq"] > best["seq"])
+            ):
+                best, best_similarity = index.latest[group], similarity
+        pipelines = os.path.join(os.path.dirname(index.path), "pipelines")
+
+    if best is None:
+        return None
+    try:
+        with open(os.path.join(pipelines, f"{best['id']}.json"), encoding="utf-8") as f:
+            templates = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return {
+        "workflow_id": best["workflow_id"],
+        "repo_path": best["repo_path"],
+        "similarity": best_similarity,
+        "templates": templates,
+    }
@@ -6,7 +6,7 @@ for orchestrating Harness CI/CD setup from repository analysis.
 
 from typing import Annotated, Literal, Optional, TypedDict
 
-from langgraph.graph import add_messages
+from .history import bounded_add_messages
 
 
 class RepositoryAnalysis(TypedDict, total=False):
@@ -28,7 +28,9 @@ class RepositoryAnalysis(TypedDict, total=False):
     ci_files_present: list[str]
     deployment_patterns: list[str]
     infrastructure_as_code: list[str]
-    structure_analysis: str  # Detailed markdown analysis
+    secrets_detected: list[str]  # Credentials the code, CI and manifests reference
+    cloud_providers: list[str]  # Cloud SDKs/credentials in use: aws, gcp, azure
+    structure_analysis: str  # Detailed markdown analysis (may be a blob reference)
     complexity_score: int  # 1-10
     confidence_level: float  # 0.0-1.0
 
@@ -54,7 +56,7 @@ class ExtractedPatterns(TypedDict, total=False):
 class GeneratedTemplates(TypedDict, total=False):
     """Generated Harness templates."""
 
-    pipeline_yaml: str
+    pipeline_yaml: str  # May be a blob reference
     stages: list[dict[str, str]]
     steps: dict[str, list[dict[str, str]]]
     variables: dict[str, str]
@@ -62,6 +64,8 @@ class GeneratedTemplates(TypedDict, total=False):
     input_sets: dict[str, dict[str, str]]
     templates_created: list[str]
     validation_results: dict[str, bool]
+    translated_from: list[str]  # CI files the pipeline was translated from, if any
+    reused_from: str  # Workflow whose approved pipeline was reused, if any
 
 
 class HarnessSetupResult(TypedDict, total=False):
@@ -78,9 +82,27 @@ class HarnessSetupResult(TypedDict, total=False):
     harness_urls: dict[str, str]
 
 
+class EnvironmentVerification(TypedDict, total=False):
+    """Results from a single environment's test execution."""
+
+    environment: str
+    execution_id: str
+    execution_url: str
+    execution_status: str  # success, failed, aborted, skipped
+    stages_completed: list[str]
+    stages_failed: list[str]
+    artifacts_generated: list[str]
+    blocking: bool
+    duration_seconds: float
+    error: Optional[str]
+
+
 class DeploymentVerification(TypedDict, total=False):
     """Results from initial deployment verification."""
 
+    environment_results: dict[str, EnvironmentVerification]
+    environment_summary: dict[str, int]  # success, failed, aborted, skipped counts
+    duration_seconds: float
     test_execution_id: str
     test_execution_url: str
     execution_status: str  # success, failed, running, aborted
@@ -92,6 +114,80 @@ class DeploymentVerification(TypedDict, total=False):
     recommendations: list[str]
 
 
+class NodeMetrics(TypedDict, total=False):
+    """Resource usage of one workflow node, summed over its executions."""
+
+    runs: int
+    wall_seconds: float
+    cpu_seconds: float
+    llm_calls: int
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int  # Input tokens read from the prompt cache
+    cost_usd: float  # Estimated from token counts
+    mcp_calls: int
+    mcp_errors: int
+    mcp_seconds: float
+    peak_alloc_bytes: int  # Highest tracemalloc peak of any execution (see orchestrator.memory)
+    budget_exceeded: int  # Executions that peaked above the node's memory budget
+
+
+# Metrics combined by taking the maximum instead of the sum
+PEAK_METRICS = frozenset({"peak_alloc_bytes"})
+
+
+def merge_metrics(
+    left: Optional[dict[str, NodeMetrics]], right: Optional[dict[str, NodeMetrics]]
+) -> dict[str, NodeMetrics]:
+    """Reducer adding per-node metrics from each node execution.
+
+    Peak metrics keep the highest value instead.
+
+    Args:
+        left: Current metrics keyed by node name
+        right: Metrics of the nodes that just ran
+
+    Returns:
+        Combined metrics
+    """
+    merged = {node: dict(values) for node, values in (left or {}).items()}
+    for node, values in (right or {}).items():
+        totals = merged.setdefault(node, {})
+        for key, value in values.items():
+            if key in PEAK_METRICS:
+                totals[key] = max(totals.get(key, 0), value)
+            else:
+                totals[key] = totals.get(key, 0) + value
+    return merged
+
+
+def merge_setup_results(
+    left: Optional[HarnessSetupResult], right: Optional[HarnessSetupResult]
+) -> Optional[HarnessSetupResult]:
+    """Reducer merging the partial setup results written by parallel setup branches.
+
+    Every field has one writer (a setup branch or ``finalize_setup``), so a
+    re-run's value replaces the earlier one instead of adding to it. Only
+    ``harness_urls`` is shared between writers and is merged per URL.
+
+    Args:
+        left: Current setup results
+        right: Update from a setup node
+
+    Returns:
+        Combined setup results
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    merged: HarnessSetupResult = {**left, **right}
+    if "harness_urls" in left and "harness_urls" in right:
+        merged["harness_urls"] = {**left["harness_urls"], **right["harness_urls"]}
+    return merged
+
+
 class OrchestratorState(TypedDict):
     """Main state for the Harness orchestration workflow.
 
@@ -99,8 +195,9 @@ class OrchestratorState(TypedDict):
     can be visualized in LangGraph Studio.
     """
 
-    # Conversation messages (for LangGraph Studio chat interface)
-    messages: Annotated[list, add_messages]
+    # Conversation messages (for LangGraph Studio chat interface), bounded by
+    # the history retention policy: older messages are folded into a summary
+    messages: Annotated[list, bounded_add_messages]
 
     # Current workflow phase
     current_phase: Literal[
@@ -117,7 +214,7 @@ class OrchestratorState(TypedDict):
     repository_analysis: Optional[RepositoryAnalysis]
     extracted_patterns: Optional[ExtractedPatterns]
     generated_templates: Optional[GeneratedTemplates]
-    harness_setup: Optional[HarnessSetupResult]
+    harness_setup: Annotated[Optional[HarnessSetupResult], merge_setup_results]
     deployment_verification: Optional[DeploymentVerification]
 
     # Human-in-the-loop
@@ -129,8 +226,57 @@ class OrchestratorState(TypedDict):
     errors: list[str]
     warnings: list[str]
 
+    # Per-node timing, token and MCP usage (see orchestrator.metrics)
+    metrics: Annotated[dict[str, NodeMetrics], merge_metrics]
+
     # Metadata
     workflow_id: str
     started_at: str
     completed_at: Optional[str]
     total_duration_seconds: Optional[float]
+
+
+def create_initial_state(
+    repo_path: str,
+    org_id: str,
+    project_id: str,
+    repo_url: Optional[str] = None,
+    workflow_id: str = "",
+    no_approval: bool = False,
+) -> OrchestratorState:
+    """Build the initial state for a workflow run.
+
+    Args:
+        repo_path: Path to the target repository
+        org_id: Harness organization ID
+        project_id: Harness project ID
+        repo_url: Repository URL (optional)
+        workflow_id: Workflow ID (assigned by the init node if empty)
+        no_approval: Skip the human approval step
+
+    Returns:
+        Initial orchestrator state
+    """
+    return {
+        "messages": [],
+        "current_phase": "init",
+        "target_repo_path": repo_path,
+        "target_repo_url": repo_url,
+        "harness_org_id": org_id,
+        "harness_project_id": project_id,
+        "repository_analysis": None,
+        "extracted_patterns": None,
+        "generated_templates": None,
+        "harness_setup": None,
+        "deployment_verification": None,
+        "hitl_required": not no_approval,
+        "hitl_approved": no_approval,  # Auto-approve if flag set
+        "hitl_feedback": None,
+        "errors": [],
+        "warnings": [],
+        "metrics": {},
+        "workflow_id": workflow_id,
+        "started_at": "",
+        "completed_at": None,
+        "total_duration_seconds": None,
+    }
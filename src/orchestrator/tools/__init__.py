@@ -1,5 +1,34 @@
-"""Tools for the orchestrator."""
+"""Tools for the orchestrator.
 
-from .mcp_registry import get_mcp_tools
+Submodules are imported on first attribute access so that importing the
+package does not load the MCP client libraries.
+"""
 
-__all__ = ["get_mcp_tools"]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .mcp_executor import aexecute_tool_calls, execute_tool_calls
+    from .mcp_pool import MCPSessionPool, get_session_pool, shutdown_session_pool
+    from .mcp_registry import get_mcp_tools, warm_mcp_servers
+
+# Public name -> defining module
+_EXPORTS = {
+    "MCPSessionPool": "mcp_pool",
+    "aexecute_tool_calls": "mcp_executor",
+    "execute_tool_calls": "mcp_executor",
+    "get_mcp_tools": "mcp_registry",
+    "get_session_pool": "mcp_pool",
+    "shutdown_session_pool": "mcp_pool",
+    "warm_mcp_servers": "mcp_registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,172 @@
+"""Result cache for idempotent MCP tool calls.
+
+Repository listings, Repomix packs and GitHub metadata lookups return the
+same result for the same repository revision. Results are cached by tool
+name, canonicalised arguments and a caller-supplied scope (the repository
+revision) in a two-tier cache: a small in-memory LRU in front of a larger
+on-disk store. Both tiers are capped by size and evict least recently used
+entries first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from ..paths import cache_dir
+
+DEFAULT_MEMORY_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024
+
+
+def cache_key(tool_name: str, arguments: dict[str, Any], scope: str) -> str:
+    """Build a cache key from the tool name, canonical arguments and scope.
+
+    Args:
+        tool_name: MCP tool name
+        arguments: Tool arguments (key order does not matter)
+        scope: Cache scope, typically the repository revision
+
+    Returns:
+        Hex digest identifying the call
+    """
+    canonical = json.dumps(
+        [tool_name, arguments, scope], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ToolResultCache:
+    """Two-tier (memory LRU + disk) cache of tool results.
+
+    Args:
+        directory: Directory for the disk tier
+        memory_bytes: Maximum total size of results kept in memory
+        disk_bytes: Maximum total size of results kept on disk
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory: OrderedDict[str, tuple[str, int]] = OrderedDict()  # Key -> (result, bytes)
+        self._memory_size = 0
+        self._disk_size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached result, promoting disk hits into memory."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key][0]
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)["result"]
+            # Refresh the access time used for disk eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        with self._lock:
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store a result in both tiers."""
+        with self._lock:
+            self._remember(key, value)
+
+        if len(value.encode("utf-8")) > self.disk_bytes:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"result": value}, f)
+        try:
+            replaced = path.stat().st_size  # Overwritten entry
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(p.stat().st_size for p in self.directory.glob("*/*.json"))
+            else:
+                self._disk_size += path.stat().st_size - replaced
+            if self._disk_size > self.disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key: str, value: str) -> None:
+        """Insert into the memory tier, evicting LRU entries over the cap."""
+        size = len(value.encode("utf-8"))
+        if size > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_size -= self._memory.pop(key)[1]
+        self._memory[key] = (value, size)
+        self._memory_size += size
+        while self._memory_size > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_size -= evicted
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used disk entries until below 90% of the cap."""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_size = total
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ToolResultCache:
+    """Get the process-wide tool result cache.
+
+    Size caps can be set with ``MCP_RESULT_CACHE_MEMORY_BYTES`` and
+    ``MCP_RESULT_CACHE_DISK_BYTES``.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ToolResultCache(
+                cache_dir("mcp", "results"),
+                memory_bytes=int(
+                    os.getenv("MCP_RESULT_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BYTES)
+                ),
+                disk_bytes=int(os.getenv("MCP_RESULT_CACHE_DISK_BYTES", DEFAULT_DISK_BYTES)),
+            )
+        return _cache
@@ -0,0 +1,102 @@
+"""Concurrent execution of the tool calls from one assistant turn.
+
+When the model asks for several tools at once (e.g. a Scaffold listing plus
+a GitHub metadata lookup), the calls are dispatched together across the
+pooled MCP sessions so the turn costs one tool latency rather than the sum.
+Results are returned in the order the model issued the calls.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+
+from ..memory import degraded_limit, is_degraded
+
+DEFAULT_TOOL_TIMEOUT_SECONDS = 120.0
+
+
+async def aexecute_tool_calls(
+    tool_calls: list[dict[str, Any]],
+    tools: list[BaseTool],
+    timeouts: Optional[dict[str, float]] = None,
+    default_timeout: float = DEFAULT_TOOL_TIMEOUT_SECONDS,
+    max_concurrency: Optional[int] = None,
+) -> list[ToolMessage]:
+    """Run tool calls concurrently and collect their results in order.
+
+    Failures and timeouts are reported back to the model as error tool
+    messages rather than raised, so one slow or broken tool does not lose
+    the results of the others.
+
+    Args:
+        tool_calls: Tool calls from an AIMessage (``name``, ``args``, ``id``)
+        tools: Tools available to the model
+        timeouts: Per-tool timeouts in seconds, keyed by tool name
+        default_timeout: Timeout for tools without a specific timeout
+        max_concurrency: Maximum calls in flight at once (unbounded if None;
+            reduced in degraded mode)
+
+    Returns:
+        One ToolMessage per tool call, in the same order as ``tool_calls``
+    """
+    if is_degraded():
+        max_concurrency = degraded_limit(max_concurrency or len(tool_calls))
+    tools_by_name = {tool.name: tool for tool in tools}
+    timeouts = timeouts or {}
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def run(call: dict[str, Any]) -> ToolMessage:
+        name = call["name"]
+        tool = tools_by_name.get(name)
+        if tool is None:
+            return ToolMessage(
+                content=f"Unknown tool: {name}",
+                tool_call_id=call["id"],
+                name=name,
+                status="error",
+            )
+
+        timeout = timeouts.get(name, default_timeout)
+        try:
+            if semaphore is None:
+                result = await asyncio.wait_for(tool.ainvoke(call["args"]), timeout)
+            else:
+                async with semaphore:
+                    result = await asyncio.wait_for(tool.ainvoke(call["args"]), timeout)
+        except TimeoutError:
+            return ToolMessage(
+                content=f"Tool '{name}' timed out after {timeout:.0f}s",
+                tool_call_id=call["id"],
+                name=name,
+                status="error",
+            )
+        except Exception as e:
+            return ToolMessage(
+                content=f"Tool '{name}' failed: {str(e)}",
+                tool_call_id=call["id"],
+                name=name,
+                status="error",
+            )
+
+        return ToolMessage(
+            content=result if isinstance(result, str) else str(result),
+            tool_call_id=call["id"],
+            name=name,
+        )
+
+    return list(await asyncio.gather(*(run(call) for call in tool_calls)))
+
+
+def execute_tool_calls(
+    tool_calls: list[dict[str, Any]],
+    tools: list[BaseTool],
+    timeouts: Optional[dict[str, float]] = None,
+    default_timeout: float = DEFAULT_TOOL_TIMEOUT_SECONDS,
+    max_concurrency: Optional[int] = None,
+) -> list[ToolMessage]:
+    """Synchronous wrapper around :func:`aexecute_tool_calls` for workflow nodes."""
+    return asyncio.run(
+        aexecute_tool_calls(tool_calls, tools, timeouts, default_timeout, max_concurrency)
+    )
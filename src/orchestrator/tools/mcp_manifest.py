@@ -0,0 +1,151 @@
+"""On-disk cache of MCP tool schemas.
+
+The manifest records the tools each MCP server exposed the last time it was
+started, so tools can be bound to the LLM without starting the server or
+waiting for a ``tools/list`` round trip. Entries are keyed by a fingerprint
+of the server command, the installed package version and its environment,
+so upgrading a server or changing its configuration produces a new entry
+instead of silently reusing stale schemas.
+"""
+
+import glob
+import hashlib
+import importlib.metadata
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from ..paths import cache_dir
+
+
+def _npx_package_version(package: str) -> Optional[str]:
+    """Find the version of an npm package as installed by npx or ``npm -g``."""
+    # Strip a version spec (e.g. "@scope/name@1.2.3" or "name@latest")
+    name = package if package.rfind("@") <= 0 else package[: package.rfind("@")]
+    candidates = glob.glob(
+        os.path.join(Path.home(), ".npm", "_npx", "*", "node_modules", name, "package.json")
+    )
+    npm_prefix = os.getenv("NPM_CONFIG_PREFIX")
+    if npm_prefix:
+        candidates.append(os.path.join(npm_prefix, "lib", "node_modules", name, "package.json"))
+
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        return None
+    try:
+        with open(max(existing, key=os.path.getmtime), encoding="utf-8") as f:
+            return str(json.load(f).get("version"))
+    except (OSError, ValueError):
+        return None
+
+
+def _python_module_version(module: str) -> Optional[str]:
+    """Find the version of the distribution providing a Python module."""
+    top_level = module.split(".")[0]
+    for dist in importlib.metadata.packages_distributions().get(top_level, []):
+        try:
+            return importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+def package_version(config: dict[str, Any]) -> str:
+    """Determine the version of the package a server command runs.
+
+    Args:
+        config: Server connection settings (``command``, ``args``)
+
+    Returns:
+        Installed version, or "unknown" when it cannot be determined locally
+    """
+    command = os.path.basename(config.get("command", ""))
+    args = list(config.get("args", []))
+    version: Optional[str] = None
+
+    if command == "npx":
+        packages = [arg for arg in args if not arg.startswith("-")]
+        if packages:
+            version = _npx_package_version(packages[0])
+    elif command.startswith("python") and "-m" in args:
+        index = args.index("-m")
+        if index + 1 < len(args):
+            version = _python_module_version(args[index + 1])
+
+    return version or "unknown"
+
+
+def server_fingerprint(config: dict[str, Any]) -> str:
+    """Fingerprint a server by command, package version and environment.
+
+    Environment values are only hashed, never stored.
+
+    Args:
+        config: Server connection settings
+
+    Returns:
+        Hex digest identifying this server build and configuration
+    """
+    payload = json.dumps(
+        {
+            "command": config.get("command"),
+            "args": config.get("args", []),
+            "version": package_version(config),
+            "env": sorted((config.get("env") or {}).items()),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _server_dir(server_name: str) -> Path:
+    return cache_dir("mcp", "manifests", server_name)
+
+
+def has_manifest(server_name: str, fingerprint: str) -> bool:
+    """Check whether schemas are cached for this exact server fingerprint."""
+    return (_server_dir(server_name) / f"{fingerprint}.json").exists()
+
+
+def load_manifest(server_name: str) -> Optional[list[dict[str, Any]]]:
+    """Load the most recently cached tool schemas for a server.
+
+    The newest entry is returned whatever its fingerprint, so binding never
+    waits on version detection; use :func:`has_manifest` to check freshness.
+
+    Args:
+        server_name: MCP server name
+
+    Returns:
+        Tool specs (``name``, ``description``, ``inputSchema``), or None if the
+        server has never been started or the manifest is unreadable
+    """
+    entries = sorted(
+        _server_dir(server_name).glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for entry in entries:
+        try:
+            with open(entry, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        tools = manifest.get("tools") if isinstance(manifest, dict) else None
+        if isinstance(tools, list):
+            return tools
+    return None
+
+
+def save_manifest(server_name: str, fingerprint: str, tools: list[dict[str, Any]]) -> None:
+    """Persist the tool schemas a server exposed.
+
+    Args:
+        server_name: MCP server name
+        fingerprint: Server fingerprint from :func:`server_fingerprint`
+        tools: Tool specs (``name``, ``description``, ``inputSchema``)
+    """
+    path = _server_dir(server_name) / f"{fingerprint}.json"
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"server": server_name, "fingerprint": fingerprint, "tools": tools}, f)
+    os.replace(tmp_path, path)
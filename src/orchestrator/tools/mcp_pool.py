@@ -0,0 +1,383 @@
+"""Process-wide pool of warm MCP server sessions.
+
+Starting an MCP server (``npx -y ...`` or ``python -m harness_mcp``) costs
+seconds, so servers are started once per process and their sessions kept
+alive for every node, run and thread that needs them. Sessions live on a
+dedicated background event loop so the synchronous workflow nodes can share
+them, are health-checked with MCP pings and are restarted automatically
+when a server dies.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+
+from ..metrics import record_mcp_call
+
+# Import is optional - gracefully degrade if not available
+try:
+    from langchain_mcp_adapters.sessions import create_session
+    MCP_AVAILABLE = True
+except ImportError:
+    MCP_AVAILABLE = False
+
+HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+HEALTH_CHECK_TIMEOUT_SECONDS = 10.0
+STARTUP_TIMEOUT_SECONDS = 120.0
+TOOL_CALL_TIMEOUT_SECONDS = 300.0
+RESTART_BACKOFF_SECONDS = (1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class _ServerSession:
+    """A single MCP server kept alive by a supervisor task on the pool loop."""
+
+    def __init__(
+        self,
+        name: str,
+        connection: dict[str, Any],
+        on_tools_listed: Optional[Callable[[str, list[dict[str, Any]]], None]] = None,
+    ) -> None:
+        self.name = name
+        self.connection = connection
+        self.on_tools_listed = on_tools_listed
+        self.session: Any = None
+        self.tools: list[dict[str, Any]] = []
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self._stop = asyncio.Event()
+        self._attempt: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._supervise(), name=f"mcp-{name}")
+
+    async def wait_ready(self, timeout: float) -> Any:
+        """Wait until the server is connected and return its session."""
+        await asyncio.wait_for(asyncio.shield(self._attempt), timeout)
+        if self.session is None:
+            # Connected once, but crashed and not yet restarted
+            raise RuntimeError(
+                f"MCP server '{self.name}' is not connected: {self.last_error or 'restarting'}"
+            )
+        return self.session
+
+    async def _supervise(self) -> None:
+        """Run the server, restarting it with backoff whenever it fails."""
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                async with create_session(self.connection) as session:
+                    await session.initialize()
+                    self.tools = [
+                        _tool_spec(tool) for tool in (await session.list_tools()).tools
+                    ]
+                    self.session = session
+                    if self.on_tools_listed is not None:
+                        try:
+                            self.on_tools_listed(self.name, self.tools)
+                        except Exception:
+                            pass
+                    failures = 0
+                    if not self._attempt.done():
+                        self._attempt.set_result(True)
+                    await self._monitor(session)
+            except Exception as e:
+                self.last_error = str(e)
+                if not self._attempt.done():
+                    self._attempt.set_exception(
+                        RuntimeError(f"MCP server '{self.name}' failed to start: {e}")
+                    )
+                    # Retrieve the exception so an unawaited attempt is not logged
+                    self._attempt.exception()
+            finally:
+                self.session = None
+
+            if self._stop.is_set() or not self.tools:
+                # Servers that never came up are not restarted; the pool
+                # starts a fresh supervisor on the next request instead.
+                break
+
+            # Start a new attempt that callers can wait on while restarting
+            self.restarts += 1
+            self._attempt = asyncio.get_running_loop().create_future()
+            delay = RESTART_BACKOFF_SECONDS[min(failures, len(RESTART_BACKOFF_SECONDS) - 1)]
+            failures += 1
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except TimeoutError:
+                pass
+
+    async def _monitor(self, session: Any) -> None:
+        """Ping the server periodically until it stops responding or we shut down."""
+        while True:
+            try:
+                await asyncio.wait_for(self._stop.wait(), HEALTH_CHECK_INTERVAL_SECONDS)
+                return
+            except TimeoutError:
+                pass
+            await asyncio.wait_for(session.send_ping(), HEALTH_CHECK_TIMEOUT_SECONDS)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the supervisor has given up on this server."""
+        return self._task.done()
+
+    async def close(self) -> None:
+        """Stop the supervisor and terminate the server process."""
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, HEALTH_CHECK_TIMEOUT_SECONDS)
+        except (TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+
+
+def _tool_spec(tool: Any) -> dict[str, Any]:
+    """Convert an MCP ``Tool`` definition into a JSON-serialisable spec."""
+    annotations = getattr(tool, "annotations", None)
+    return {
+        "name": tool.name,
+        "description": tool.description or "",
+        "inputSchema": tool.inputSchema,
+        "annotations": annotations.model_dump(exclude_none=True) if annotations else {},
+    }
+
+
+def _result_text(result: Any) -> str:
+    """Flatten an MCP ``CallToolResult`` into text for the LLM."""
+    return "\n".join(
+        content.text for content in result.content if getattr(content, "type", None) == "text"
+    )
+
+
+class MCPSessionPool:
+    """Pool of long-lived MCP sessions shared by every node in the process.
+
+    Servers are started on first request and stay connected until
+    :meth:`shutdown`. Tools handed out by the pool route every call through
+    the current session, so they remain valid across server restarts, and a
+    tool built from a known spec starts its server only when first invoked.
+
+    Args:
+        connections: Connection settings keyed by server name
+        on_tools_listed: Callback receiving a server's tool specs whenever it
+            (re)connects, e.g. to refresh a cached manifest
+    """
+
+    def __init__(
+        self,
+        connections: dict[str, dict[str, Any]],
+        on_tools_listed: Optional[Callable[[str, list[dict[str, Any]]], None]] = None,
+    ) -> None:
+        self._connections = connections
+        self._on_tools_listed = on_tools_listed
+        self._servers: dict[str, _ServerSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop hosting the sessions."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="mcp-session-pool", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro: Any, timeout: float) -> Any:
+        """Run a coroutine on the pool loop from a synchronous caller."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            # Do not leave the call running on the pool loop
+            future.cancel()
+            raise
+
+    async def _server(self, server_name: str) -> _ServerSession:
+        """Get (starting if needed) the server session. Runs on the pool loop."""
+        server = self._servers.get(server_name)
+        if server is None or server.finished:
+            if server_name not in self._connections:
+                raise ValueError(
+                    f"Unsupported MCP server: {server_name}. "
+                    f"Supported servers: {list(self._connections.keys())}"
+                )
+            server = _ServerSession(
+                server_name, self._connections[server_name], self._on_tools_listed
+            )
+            self._servers[server_name] = server
+        return server
+
+    async def _list_tools(self, server_name: str) -> list[dict[str, Any]]:
+        server = await self._server(server_name)
+        await server.wait_ready(STARTUP_TIMEOUT_SECONDS)
+        return server.tools
+
+    async def _call_tool(self, server_name: str, tool_name: str, arguments: dict[str, Any]) -> str:
+        server = await self._server(server_name)
+        session = await server.wait_ready(STARTUP_TIMEOUT_SECONDS)
+        result = await session.call_tool(tool_name, arguments)
+        if result.isError:
+            raise ToolException(_result_text(result) or f"MCP tool '{tool_name}' failed")
+        return _result_text(result)
+
+    def call_tool(self, server_name: str, tool_name: str, arguments: dict[str, Any]) -> str:
+        """Call a tool on a pooled server from synchronous code."""
+        started = time.monotonic()
+        try:
+            result = self._run(
+                self._call_tool(server_name, tool_name, arguments), TOOL_CALL_TIMEOUT_SECONDS
+            )
+        except Exception:
+            record_mcp_call(time.monotonic() - started, error=True)
+            raise
+        record_mcp_call(time.monotonic() - started)
+        return result
+
+    async def acall_tool(
+        self, server_name: str, tool_name: str, arguments: dict[str, Any]
+    ) -> str:
+        """Call a tool on a pooled server from any event loop."""
+        loop = self._ensure_loop()
+        started = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(
+            self._call_tool(server_name, tool_name, arguments), loop
+        )
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), TOOL_CALL_TIMEOUT_SECONDS)
+        except Exception:
+            future.cancel()
+            record_mcp_call(time.monotonic() - started, error=True)
+            raise
+        record_mcp_call(time.monotonic() - started)
+        return result
+
+    def make_tool(self, server_name: str, spec: dict[str, Any]) -> BaseTool:
+        """Wrap a tool spec as a LangChain tool routed through the pool.
+
+        Building the tool does not start the server; the first call does.
+        """
+        tool_name = spec["name"]
+
+        def call(**arguments: Any) -> str:
+            return self.call_tool(server_name, tool_name, arguments)
+
+        async def acall(**arguments: Any) -> str:
+            return await self.acall_tool(server_name, tool_name, arguments)
+
+        return StructuredTool(
+            name=tool_name,
+            description=spec.get("description", ""),
+            args_schema=spec.get("inputSchema") or {"type": "object", "properties": {}},
+            func=call,
+            coroutine=acall,
+            metadata={"mcp_server": server_name},
+        )
+
+    def list_tools(self, server_name: str) -> list[dict[str, Any]]:
+        """List a server's tool specs, starting it if not yet running.
+
+        Raises:
+            ValueError: If the server is not configured
+            RuntimeError: If the server cannot be started
+        """
+        return self._run(self._list_tools(server_name), STARTUP_TIMEOUT_SECONDS)
+
+    def get_tools(self, server_name: str) -> list[BaseTool]:
+        """Get LangChain tools for a server, starting it if not yet running.
+
+        Raises:
+            ValueError: If the server is not configured
+            RuntimeError: If the server cannot be started
+        """
+        return [self.make_tool(server_name, spec) for spec in self.list_tools(server_name)]
+
+    def start(self, server_names: list[str]) -> None:
+        """Start servers in the background without waiting for them to connect.
+
+        Raises:
+            ValueError: If a server is not configured
+        """
+        for server_name in server_names:
+            if server_name not in self._connections:
+                raise ValueError(
+                    f"Unsupported MCP server: {server_name}. "
+                    f"Supported servers: {list(self._connections.keys())}"
+                )
+        loop = self._ensure_loop()
+        for server_name in server_names:
+            asyncio.run_coroutine_threadsafe(self._server(server_name), loop)
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Report the health of every started server."""
+        return {
+            name: {
+                "connected": server.session is not None,
+                "restarts": server.restarts,
+                "last_error": server.last_error,
+            }
+            for name, server in self._servers.items()
+        }
+
+    def shutdown(self) -> None:
+        """Terminate all servers and stop the background loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def close_all() -> None:
+            await asyncio.gather(
+                *(server.close() for server in self._servers.values()), return_exceptions=True
+            )
+            self._servers.clear()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_all(), loop).result(
+                HEALTH_CHECK_TIMEOUT_SECONDS * 2
+            )
+        except Exception:
+            pass
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(HEALTH_CHECK_TIMEOUT_SECONDS)
+
+
+_pool: Optional[MCPSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool(
+    connections: dict[str, dict[str, Any]],
+    on_tools_listed: Optional[Callable[[str, list[dict[str, Any]]], None]] = None,
+) -> MCPSessionPool:
+    """Get the process-wide session pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MCPSessionPool(connections, on_tools_listed)
+            atexit.register(shutdown_session_pool)
+        return _pool
+
+
+def session_pool_status() -> dict[str, dict[str, Any]]:
+    """Report server health for the process-wide pool (empty if none was started)."""
+    with _pool_lock:
+        pool = _pool
+    return pool.status() if pool is not None else {}
+
+
+def shutdown_session_pool() -> None:
+    """Shut down the process-wide session pool, if one was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
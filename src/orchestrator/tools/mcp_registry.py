@@ -8,38 +8,63 @@ the nodes will use placeholder implementations.
 """
 
 import os
-from typing import Any
+import threading
+from typing import Any, Optional
 
-# Import is optional - gracefully degrade if not available
-try:
-    from langchain_mcp_adapters.client import load_mcp_tools, create_session
-    MCP_AVAILABLE = True
-except ImportError:
-    MCP_AVAILABLE = False
+from langchain_core.tools import BaseTool, StructuredTool
 
+from ..replay import get_recorder, wrap_tool
+from .mcp_cache import cache_key, get_result_cache
+from .mcp_manifest import has_manifest, load_manifest, save_manifest, server_fingerprint
+from .mcp_pool import MCP_AVAILABLE, MCPSessionPool, get_session_pool
 
-def get_mcp_tools(server_names: list[str]) -> list[Any]:
-    """Get tools from specified MCP servers.
+# Read-only tools whose results depend only on their arguments and the
+# repository revision. Tools annotated as read-only and idempotent by their
+# server are cached as well; any other tool (anything that may create or
+# change something) always runs.
+IDEMPOTENT_TOOLS: dict[str, frozenset[str]] = {
+    "scaffold": frozenset(
+        {
+            "get_project_structure",
+            "list_files",
+            "read_file",
+        }
+    ),
+    "repomix": frozenset(
+        {
+            "pack_codebase",
+            "read_repomix_output",
+            "grep_repomix_output",
+            "file_system_read_file",
+            "file_system_read_directory",
+        }
+    ),
+    "github": frozenset(
+        {
+            "get_file_contents",
+            "get_repository",
+            "list_branches",
+            "list_commits",
+            "search_code",
+            "search_repositories",
+        }
+    ),
+}
 
-    Args:
-        server_names: List of MCP server names to load tools from.
-                     Supported: 'scaffold', 'repomix', 'harness', 'github'
+# Servers whose cached schemas have already been checked in this process
+_checked_servers: set[str] = set()
+_checked_lock = threading.Lock()
 
-    Returns:
-        List of LangChain tools from the specified MCP servers.
-        Returns empty list if MCP adapters not available.
 
-    Raises:
-        ValueError: If an unsupported server name is provided
-        RuntimeError: If MCP server connection fails
-    """
-    if not MCP_AVAILABLE:
-        # Return empty list if MCP not available
-        # Nodes will use placeholder implementations
-        return []
+def get_server_configs() -> dict[str, dict[str, Any]]:
+    """Get the stdio connection settings for every supported MCP server.
 
-    server_configs = {
+    Returns:
+        Connection settings keyed by server name
+    """
+    return {
         "scaffold": {
+            "transport": "stdio",
             "command": "npx",
             "args": [
                 "-y",
@@ -48,6 +73,7 @@ def get_mcp_tools(server_names: list[str]) -> list[Any]:
             "env": {},
         },
         "repomix": {
+            "transport": "stdio",
             "command": "npx",
             "args": [
                 "-y",
@@ -56,6 +82,7 @@ def get_mcp_tools(server_names: list[str]) -> list[Any]:
             "env": {},
         },
         "harness": {
+            "transport": "stdio",
             "command": "python",
             "args": [
                 "-m",
@@ -70,6 +97,7 @@ def get_mcp_tools(server_names: list[str]) -> list[Any]:
             },
         },
         "github": {
+            "transport": "stdio",
             "command": "npx",
             "args": [
                 "-y",
@@ -81,6 +109,132 @@ def get_mcp_tools(server_names: list[str]) -> list[Any]:
         },
     }
 
+
+def _get_pool(server_configs: dict[str, dict[str, Any]]) -> MCPSessionPool:
+    """Get the session pool, storing each server's schemas whenever it connects."""
+    return get_session_pool(
+        server_configs,
+        on_tools_listed=lambda name, specs: save_manifest(
+            name, server_fingerprint(server_configs[name]), specs
+        ),
+    )
+
+
+def warm_mcp_servers(server_names: Optional[list[str]] = None) -> list[str]:
+    """Start MCP servers in the background so the first tool call is not a cold start.
+
+    Args:
+        server_names: Servers to start (defaults to every supported server)
+
+    Returns:
+        Names of the servers being started (empty if MCP is not installed)
+    """
+    if not MCP_AVAILABLE:
+        return []
+
+    server_configs = get_server_configs()
+    server_names = list(server_configs) if server_names is None else server_names
+    _get_pool(server_configs).start(server_names)
+    return server_names
+
+
+def _refresh_stale_manifest(
+    server_name: str, config: dict[str, Any], pool: MCPSessionPool
+) -> None:
+    """Refresh a server's cached schemas in the background if its version changed.
+
+    Runs at most once per server per process. When no manifest exists for
+    the server's current fingerprint, the server is started off the critical
+    path; the pool's listing callback then stores the fresh schemas.
+    """
+    with _checked_lock:
+        if server_name in _checked_servers:
+            return
+        _checked_servers.add(server_name)
+
+    def refresh() -> None:
+        try:
+            if not has_manifest(server_name, server_fingerprint(config)):
+                pool.list_tools(server_name)
+        except Exception as e:
+            print(f"Warning: Failed to refresh MCP tool schemas for '{server_name}': {str(e)}")
+
+    threading.Thread(target=refresh, name=f"mcp-refresh-{server_name}", daemon=True).start()
+
+
+def _is_idempotent(server_name: str, spec: dict[str, Any]) -> bool:
+    """Check whether a tool's results can be cached per repository revision."""
+    annotations = spec.get("annotations") or {}
+    if annotations.get("readOnlyHint") and annotations.get("idempotentHint"):
+        return True
+    return spec["name"] in IDEMPOTENT_TOOLS.get(server_name, frozenset())
+
+
+def _with_result_cache(tool: BaseTool, cache_scope: str) -> BaseTool:
+    """Wrap a pooled tool so repeated calls are answered from the result cache."""
+    cache = get_result_cache()
+
+    def call(**arguments: Any) -> str:
+        key = cache_key(tool.name, arguments, cache_scope)
+        result = cache.get(key)
+        if result is None:
+            result = tool.func(**arguments)
+            cache.put(key, result)
+        return result
+
+    async def acall(**arguments: Any) -> str:
+        key = cache_key(tool.name, arguments, cache_scope)
+        result = cache.get(key)
+        if result is None:
+            result = await tool.coroutine(**arguments)
+            cache.put(key, result)
+        return result
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=call,
+        coroutine=acall,
+        metadata={**(tool.metadata or {}), "cached": True},
+    )
+
+
+def get_mcp_tools(server_names: list[str], cache_scope: Optional[str] = None) -> list[Any]:
+    """Get tools from specified MCP servers.
+
+    Tools are lightweight proxies built from the on-disk schema cache: a
+    server is only started (once per process, by the shared session pool)
+    when one of its tools is actually invoked. Servers without cached
+    schemas are started immediately to discover their tools; cached schemas
+    are re-validated against the installed server version in the background.
+
+    When a cache scope is given, idempotent tools answer repeated calls with
+    the same arguments from the result cache instead of calling the server.
+
+    Args:
+        server_names: List of MCP server names to load tools from.
+                     Supported: 'scaffold', 'repomix', 'harness', 'github'
+        cache_scope: Repository revision results are valid for; no result
+                     caching when omitted
+
+    Returns:
+        List of LangChain tools from the specified MCP servers.
+        Returns empty list if MCP adapters not available.
+
+    Raises:
+        ValueError: If an unsupported server name is provided
+    """
+    recorder = get_recorder()
+    replaying = recorder is not None and recorder.replaying
+    if not MCP_AVAILABLE and not replaying:
+        # Return empty list if MCP not available
+        # Nodes will use placeholder implementations
+        return []
+
+    server_configs = get_server_configs()
+    pool = _get_pool(server_configs)
+
     tools = []
 
     for server_name in server_names:
@@ -90,13 +244,25 @@ def get_mcp_tools(server_names: list[str]) -> list[Any]:
                 f"Supported servers: {list(server_configs.keys())}"
             )
 
-        config = server_configs[server_name]
-
         try:
-            # Note: MCP tools require async context manager
-            # For now, return empty list and use placeholder implementations
-            # In production, this would use async context manager properly
-            pass
+            if replaying:
+                # Recorded tools are never invoked, so no server is started
+                specs = recorder.tool_specs(server_name)
+            else:
+                specs = load_manifest(server_name)
+                if specs is None:
+                    specs = pool.list_tools(server_name)
+                else:
+                    _refresh_stale_manifest(server_name, server_configs[server_name], pool)
+                if recorder is not None:
+                    recorder.record_tool_specs(server_name, specs)
+            for spec in specs:
+                tool = pool.make_tool(server_name, spec)
+                if cache_scope is not None and _is_idempotent(server_name, spec):
+                    tool = _with_result_cache(tool, cache_scope)
+                if recorder is not None:
+                    tool = wrap_tool(tool, server_name, recorder)
+                tools.append(tool)
 
         except Exception as e:
             # Non-fatal - just log and continue with empty tools
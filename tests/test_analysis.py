@@ -0,0 +1,454 @@
+"""Tests for the local single-pass repository scan."""
+
+import yaml
+
+from orchestrator.analysis import scan_repository
+from orchestrator.analysis.secrets import harness_identifier
+
+
+def _write(root, files):
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def test_scan_finds_secrets_and_cloud_usage(tmp_path):
+    """Test secrets referenced from code, CI, manifests and env files are detected."""
+    _write(
+        tmp_path,
+        {
+            "app/main.py": 'import boto3, os\nkey = os.getenv("STRIPE_API_KEY")\nhome = os.environ["HOME"]\n',
+            "web/index.js": "const dsn = process.env.SENTRY_DSN;\n",
+            ".github/workflows/ci.yml": "steps:\n  - run: login ${{ secrets.REGISTRY_PASSWORD }}\n",
+            "k8s/deploy.yaml": "valueFrom:\n  secretKeyRef:\n    name: db-credentials\n    key: password\n",
+            "docker-compose.yml": "services:\n  api:\n    environment:\n      - GITHUB_TOKEN=${GITHUB_TOKEN}\n",
+            ".env.example": "# comment\nDATABASE_URL=\nAUTHOR_NAME=x\n",
+            "node_modules/lib/index.js": "process.env.VENDORED_SECRET\n",
+        },
+    )
+
+    scan = scan_repository(str(tmp_path))
+
+    secrets = scan["secrets"]
+    assert secrets["secrets"] == [
+        "DATABASE_URL", "GITHUB_TOKEN", "REGISTRY_PASSWORD", "SENTRY_DSN", "STRIPE_API_KEY", "db-credentials",
+    ]
+    assert {"HOME", "AUTHOR_NAME"} <= set(secrets["env_vars"])
+    assert secrets["cloud_providers"] == ["aws"]
+    assert secrets["references"]["STRIPE_API_KEY"] == ["app/main.py"]
+    assert scan["inventory"]["ci_files"] == [".github/workflows/ci.yml"]
+    assert scan["inventory"]["compose_files"] == ["docker-compose.yml"]
+    assert scan["walk"]["skipped_dirs"] == 1
+
+
+def test_scan_ignores_docs_and_non_credential_names(tmp_path):
+    """Test docs are not searched and names only containing a credential word are not secrets."""
+    _write(
+        tmp_path,
+        {
+            "README.md": 'Set `os.getenv("STRIPE_API_KEY")` and ${{ secrets.DEPLOY_TOKEN }}\n',
+            "docs/setup.rst": "export GITHUB_TOKEN=${GITHUB_TOKEN}\n",
+            "app/model.py": 'import os\npath = os.getenv("TOKENIZER_PATH")\nauth = os.getenv("AUTH_ENABLED")\n',
+        },
+    )
+
+    secrets = scan_repository(str(tmp_path))["secrets"]
+
+    assert secrets["secrets"] == []
+    assert secrets["env_vars"] == ["AUTH_ENABLED", "TOKENIZER_PATH"]
+
+
+def test_harness_identifier():
+    """Test secret names are normalised to Harness identifiers."""
+    assert harness_identifier("DB_PASSWORD") == "db_password"
+    assert harness_identifier("db-credentials") == "db_credentials"
+    assert harness_identifier("1PASSWORD_TOKEN") == "secret_1password_token"
+
+
+def test_manifest_index_classifies_documents(tmp_path):
+    """Test multi-document manifests, Helm charts and Compose files are indexed."""
+    _write(
+        tmp_path,
+        {
+            "k8s/app.yaml": (
+                "apiVersion: apps/v1\nkind: Deployment\nmetadata:\n  labels: {kind: web}\n"
+                "---\napiVersion: v1\nkind: Service\n"
+                "---\napiVersion: autoscaling/v2\nkind: HorizontalPodAutoscaler\n"
+            ),
+            "charts/api/Chart.yaml": "apiVersion: v2\nname: api\nversion: 0.1.0\n",
+            "charts/api/templates/sts.yaml": (
+                "apiVersion: apps/v1\nkind: StatefulSet\nmetadata:\n  name: {{ .Release.Name }}\n"
+            ),
+            "docker-compose.yml": "services:\n  api:\n    image: api\n  db:\n    image: postgres\n",
+            ".github/workflows/ci.yml": "on: push\njobs:\n  test:\n    services:\n      - redis\n",
+        },
+    )
+
+    manifests = scan_repository(str(tmp_path))["manifests"]
+
+    assert manifests["kubernetes_manifests"] == ["charts/api/templates/sts.yaml", "k8s/app.yaml"]
+    assert manifests["resources"] == {
+        "Deployment": 1, "HorizontalPodAutoscaler": 1, "Service": 1, "StatefulSet": 1,
+    }
+    assert manifests["helm_charts"] == ["charts/api"]
+    assert manifests["compose_services"] == {"docker-compose.yml": ["api", "db"]}
+    assert manifests["deployment_patterns"] == [
+        "kubernetes", "helm", "docker_compose", "stateful_workloads", "autoscaling",
+    ]
+
+
+def test_ci_translation_skips_llm(tmp_path, monkeypatch):
+    """Test an existing GitHub workflow is translated into Harness stages without the LLM."""
+    from orchestrator.nodes import generate
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(generate, "get_chat_model", None)
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            ".github/workflows/ci.yml": (
+                "on: [push, workflow_dispatch]\njobs:\n"
+                "  deploy:\n    needs: test\n    steps:\n      - run: ./deploy.sh ${{ secrets.DEPLOY_KEY }}\n"
+                "  test:\n    steps:\n      - uses: actions/checkout@v4\n      - name: Test\n        run: make test\n"
+            ),
+        },
+    )
+    state = {
+        "repository_analysis": {
+            "repo_path": str(repo),
+            "ci_files_present": [".github/workflows/ci.yml"],
+        },
+        "extracted_patterns": {"connectors_required": []},
+    }
+
+    templates = generate.generate_templates(state)["generated_templates"]
+
+    assert templates["translated_from"] == [".github/workflows/ci.yml"]
+    assert templates["stages"] == [{"name": "test", "type": "CI"}, {"name": "deploy", "type": "CI"}]
+    assert templates["triggers"] == [{"type": "webhook", "event": "push"}, {"type": "manual"}]
+    assert '<+secrets.getValue("deploy_key")>' in templates["pipeline_yaml"]
+    assert list((tmp_path / "cache" / "ci_ir").iterdir())
+
+
+def test_ci_translation_reports_untranslated_steps_and_expressions(tmp_path, monkeypatch):
+    """Test matrix, github and inputs expressions are rewritten and the rest reported."""
+    from orchestrator.nodes import generate
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(generate, "get_chat_model", None)
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            ".github/workflows/ci.yml": (
+                "on:\n  push:\n  workflow_dispatch:\n"
+                "    inputs:\n      level:\n        default: fast\n"
+                "jobs:\n  test:\n    strategy:\n      matrix:\n        py: ['3.11', '3.12']\n"
+                "    steps:\n      - uses: actions/setup-python@v5\n"
+                "      - run: tox -e py${{ matrix.py }} -- ${{ inputs.level }} ${{ github.sha }}"
+                " ${{ steps.x.outputs.y }}\n"
+            ),
+        },
+    )
+    state = {
+        "repository_analysis": {
+            "repo_path": str(repo),
+            "ci_files_present": [".github/workflows/ci.yml"],
+        },
+        "extracted_patterns": {"connectors_required": []},
+    }
+
+    update = generate.generate_templates(state)
+    stage = yaml.safe_load(update["generated_templates"]["pipeline_yaml"])["pipeline"]["stages"][0]
+
+    assert stage["stage"]["spec"]["execution"]["steps"][0]["step"]["spec"]["command"] == (
+        "tox -e py<+matrix.py> -- <+pipeline.variables.level> <+codebase.commitSha>"
+        " ${{ steps.x.outputs.y }}"
+    )
+    assert stage["stage"]["strategy"] == {"matrix": {"py": ["3.11", "3.12"]}}
+    assert update["generated_templates"]["variables"] == {"level": "<+input>.default(fast)"}
+    assert update["warnings"] == [
+        ".github/workflows/ci.yml: not translated: test: actions/setup-python@v5",
+        ".github/workflows/ci.yml: expression kept as written: ${{ steps.x.outputs.y }}",
+    ]
+    assert "**Warnings:**" in update["messages"][0].content
+
+
+def test_skipped_deploy_step_falls_back_to_generation(tmp_path, monkeypatch):
+    """Test a workflow whose deploy step is an action is not translated without it."""
+    from orchestrator.nodes import generate
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("ORCHESTRATOR_REUSE", "0")
+    monkeypatch.setattr(generate, "_generate_with_llm", lambda analysis, patterns: "pipeline: {}\n")
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            ".github/workflows/ci.yml": (
+                "on: push\njobs:\n  build:\n    steps:\n      - run: make\n"
+                "      - uses: azure/webapps-deploy@v3\n"
+            ),
+        },
+    )
+    state = {
+        "repository_analysis": {
+            "repo_path": str(repo),
+            "ci_files_present": [".github/workflows/ci.yml"],
+        },
+        "extracted_patterns": {"connectors_required": []},
+    }
+
+    update = generate.generate_templates(state)
+
+    assert "translated_from" not in update["generated_templates"]
+    assert update["warnings"] == [
+        "Deploy step not translatable, pipeline generated instead: "
+        ".github/workflows/ci.yml: build: azure/webapps-deploy@v3"
+    ]
+
+
+def test_gitlab_triggers_come_from_rules_and_only():
+    """Test GitLab triggers are read from workflow rules and job conditions, not comments."""
+    from orchestrator.analysis.ci import parse_gitlab_ci
+
+    job = "build:\n  script: make\n"
+    # A schedule mentioned in a comment or job name is not a trigger
+    ir = parse_gitlab_ci("# runs on schedule\nschedule-docs:\n  script: make docs\n", "x")
+    assert ir["triggers"] == ["push", "pull_request"]
+
+    ir = parse_gitlab_ci(job + "nightly:\n  script: make e2e\n  only: [schedules]\n", "x")
+    assert ir["triggers"] == ["push", "pull_request", "schedule"]
+
+    workflow = (
+        "workflow:\n  rules:\n    - if: $CI_PIPELINE_SOURCE == 'merge_request_event'\n"
+        "    - if: $CI_PIPELINE_SOURCE == \"web\"\n"
+        "    - if: $CI_PIPELINE_SOURCE == \"schedule\"\n      when: never\n"
+    )
+    assert parse_gitlab_ci(workflow + job, "x")["triggers"] == ["pull_request", "manual"]
+
+
+def test_github_conditions_and_env_are_translated_or_reported(tmp_path, monkeypatch):
+    """Test job and step conditions and env reach the Harness pipeline and the rest is reported."""
+    from orchestrator.nodes import generate
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(generate, "get_chat_model", None)
+    repo = tmp_path / "repo"
+    _write(
+        repo,
+        {
+            ".github/workflows/ci.yml": (
+                "on: push\nenv:\n  REGION: eu\njobs:\n"
+                "  test:\n    services:\n      redis:\n        image: redis\n"
+                "    env:\n      MODE: ci\n"
+                "    steps:\n      - run: make test\n        working-directory: app\n"
+                "        env:\n          TOKEN: ${{ secrets.API_TOKEN }}\n"
+                "      - run: make report\n        if: always()\n"
+                "      - name: Notify\n        run: make notify\n        if: github.event.pull_request.draft\n"
+                "  publish:\n    needs: test\n    if: github.ref_name == 'main'\n"
+                "    steps:\n      - run: make publish\n"
+            ),
+        },
+    )
+    state = {
+        "repository_analysis": {
+            "repo_path": str(repo),
+            "ci_files_present": [".github/workflows/ci.yml"],
+        },
+        "extracted_patterns": {"connectors_required": []},
+    }
+
+    update = generate.generate_templates(state)
+    test, publish = yaml.safe_load(update["generated_templates"]["pipeline_yaml"])["pipeline"]["stages"]
+    make_test, make_report = (s["step"] for s in test["stage"]["spec"]["execution"]["steps"])
+
+    assert make_test["spec"]["command"] == 'cd "app"\nmake test'
+    assert make_test["spec"]["envVariables"] == {
+        "REGION": "<+pipeline.variables.REGION>",
+        "MODE": "ci",
+        "TOKEN": '<+secrets.getValue("api_token")>',
+    }
+    assert make_report["when"] == {"stageStatus": "All"}
+    assert publish["stage"]["when"] == {
+        "pipelineStatus": "Success",
+        "condition": '<+codebase.branch> == "main"',
+    }
+    assert update["warnings"] == [
+        ".github/workflows/ci.yml: not translated: test: services",
+        ".github/workflows/ci.yml: not translated: "
+        "test: Notify (if: github.event.pull_request.draft)",
+    ]
+
+
+def test_gitlab_conditions_extends_and_variables():
+    """Test GitLab extends and variables are resolved and conditional jobs reported, not dropped."""
+    from orchestrator.analysis.ci import parse_gitlab_ci
+
+    ir = parse_gitlab_ci(
+        "variables:\n  REGION: eu\n"
+        ".base:\n  image: python:3.12\n  variables: {MODE: ci}\n  before_script: [pip install .]\n"
+        "test:\n  extends: .base\n  script: pytest\n  after_script: [echo done]\n"
+        "cleanup:\n  script: make clean\n  when: always\n"
+        "release:\n  script: make release\n  when: manual\n"
+        "nightly:\n  script: make e2e\n  only: [schedules]\n"
+        "orphan:\n  extends: .missing\n  script: make\n",
+        "x",
+    )
+
+    test, cleanup = ir["stages"][0]["steps"]
+    assert test["command"] == "pip install .\npytest"
+    assert test["image"] == "python:3.12"
+    assert test["env"] == {"REGION": "<+pipeline.variables.REGION>", "MODE": "ci"}
+    assert cleanup["when"] == {"status": "All"}
+    assert ir["skipped"] == [
+        "test: after_script", "release (when: manual)", "nightly (only)", "orphan (extends: .missing)",
+    ]
+
+
+def test_jenkins_when_stages_and_interpolations_are_reported():
+    """Test Jenkins stages with when blocks are skipped and unknown interpolations reported."""
+    from orchestrator.analysis.ci import parse_jenkinsfile
+
+    ir = parse_jenkinsfile(
+        "pipeline {\n  environment { REGION = 'eu' }\n  stages {\n"
+        "    stage('Build') {\n      environment { MODE = 'ci' }\n"
+        '      steps { sh "make ${REGION} ${env.MODE} ${params.LEVEL} ${currentBuild.number}" }\n'
+        "    }\n"
+        "    stage('Deploy') {\n      when { branch 'main' }\n      steps { sh './deploy.sh' }\n    }\n"
+        "  }\n}\n",
+        "Jenkinsfile",
+    )
+
+    (build,) = ir["stages"]
+    assert build["steps"][0]["command"] == (
+        "make ${REGION} ${MODE} <+pipeline.variables.LEVEL> ${currentBuild.number}"
+    )
+    assert build["steps"][0]["env"] == {"REGION": "<+pipeline.variables.REGION>", "MODE": "ci"}
+    assert ir["variables"] == {"REGION": "eu"}
+    assert ir["skipped"] == ["Deploy (when)"]
+    assert ir["unresolved"] == ["${currentBuild.number}"]
+
+
+def test_approved_pipeline_reused_for_similar_repository(tmp_path, monkeypatch):
+    """Test an approved pipeline is found for a look-alike repository and not for a different one."""
+    from orchestrator import similarity
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    analysis = {
+        "repo_path": "/repos/billing",
+        "primary_language": "python",
+        "languages": ["python", "shell"],
+        "frameworks": ["fastapi"],
+        "deployment_patterns": ["kubernetes", "helm"],
+        "ci_files_present": [".github/workflows/ci.yml"],
+        "dockerfile_present": True,
+    }
+    patterns = {
+        "build_pattern": "container",
+        "deployment_target": "kubernetes",
+        "deployment_strategy": "rolling",
+        "environments": ["dev", "staging", "production"],
+        "connectors_required": [{"type": "github", "name": "github_connector"}],
+    }
+    templates = {"pipeline_yaml": "pipeline:\n  name: billing\n", "stages": [{"name": "Build", "type": "CI"}]}
+    similarity.record_pipeline("wf-1", analysis, patterns, templates)
+    similarity.record_pipeline("wf-1", analysis, patterns, templates)
+
+    look_alike = dict(analysis, repo_path="/repos/invoices", languages=["python"])
+    match = similarity.find_similar(look_alike, patterns)
+    assert match["workflow_id"] == "wf-1"
+    assert match["templates"]["pipeline_yaml"] == templates["pipeline_yaml"]
+    assert 0.8 <= match["similarity"] < 1
+
+    different = dict(analysis, primary_language="go", languages=["go"], frameworks=[], deployment_patterns=[])
+    assert similarity.find_similar(different, dict(patterns, deployment_target="vm")) is None
+    assert len((tmp_path / "similarity" / "index.jsonl").read_text().splitlines()) == 1
+
+
+def test_metrics_score_complexity_and_confidence(tmp_path, monkeypatch):
+    """Test per-file metrics drive languages, complexity and confidence."""
+    monkeypatch.setenv("ORCHESTRATOR_SCAN_MAX_FILE_BYTES", "60")
+    _write(
+        tmp_path,
+        {
+            "svc/app/main.py": "import os\nimport json\nfrom app import db\n\nprint(1)\n",
+            "svc/app/db.py": "x = 1\n",
+            "web/src/index.js": "const a = require('a');\n" * 3,  # Too large to read
+            "README.md": "# Demo\n",
+            "data.blob9": "unknown",
+            ".gitignore": "*.pyc\n",
+            ".env": "A=1\n",
+        },
+    )
+
+    metrics = scan_repository(str(tmp_path))["metrics"]
+
+    assert metrics["files"] == 7
+    assert metrics["source_files"] == 3
+    # 6 counted Python lines; JavaScript estimated from size at the default bytes per line
+    assert metrics["languages"] == {"python": 6, "javascript": 1}
+    assert metrics["lines_of_code"] == 8
+    # Dotfiles are recognised by their whole name
+    assert metrics["coverage"] == round(6 / 7, 3)
+    assert metrics["measured"] == round(57 / 129, 3)
+    assert metrics["complexity_score"] == 2
+    assert metrics["confidence_level"] == round(0.3 + 0.7 * 6 / 7 * 57 / 129, 2)
+
+
+def test_reused_pipeline_renames_only_repository_fields(tmp_path, monkeypatch):
+    """Test verified pipelines are recorded and reuse renames only name, identifier and repo."""
+    from orchestrator import similarity
+    from orchestrator.nodes import generate, setup, verify
+
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(generate, "get_chat_model", None)
+    monkeypatch.setattr(verify, "get_mcp_tools", lambda servers: [])
+    analysis = {"repo_path": "/repos/app", "primary_language": "python", "languages": ["python"]}
+    patterns = {"deployment_target": "kubernetes", "connectors_required": []}
+    pipeline_yaml = (
+        "pipeline:\n  name: app pipeline\n  identifier: app_pipeline\n"
+        "  properties:\n    ci:\n      codebase:\n        repoName: app\n"
+        "  stages:\n  - stage:\n      name: apps/v1 appVersion\n"
+    )
+    state = {
+        "workflow_id": "wf-1",
+        "started_at": "2026-01-01T00:00:00+00:00",
+        "harness_org_id": "org",
+        "harness_project_id": "proj",
+        "hitl_required": False,
+        "repository_analysis": analysis,
+        "extracted_patterns": patterns,
+        "generated_templates": {"pipeline_yaml": pipeline_yaml, "stages": []},
+        "harness_setup": {
+            "setup_status": "success",
+            "pipeline_created": {"id": "p1", "url": "https://h/p1"},
+        },
+    }
+    # Starting setup is not enough; a failed verification is not recorded either
+    assert setup.setup_harness(state) == {"current_phase": "setup"}
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            verify,
+            "_harness_runner",
+            lambda *args: lambda env, cancel, on_started: {"execution_status": "failed"},
+        )
+        assert verify.verify_deployment(state)["current_phase"] == "error"
+    assert similarity.find_similar(analysis, patterns) is None
+
+    assert verify.verify_deployment(state)["current_phase"] == "complete"
+
+    state = {
+        "repository_analysis": dict(analysis, repo_path="/repos/web"),
+        "extracted_patterns": patterns,
+    }
+    templates = generate.generate_templates(state)["generated_templates"]
+
+    assert templates["reused_from"] == "wf-1"
+    assert templates["pipeline_yaml"] == (
+        "pipeline:\n  name: web pipeline\n  identifier: web_pipeline\n"
+        "  properties:\n    ci:\n      codebase:\n        repoName: web\n"
+        "  stages:\n  - stage:\n      name: apps/v1 appVersion\n"
+    )
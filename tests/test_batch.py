@@ -0,0 +1,115 @@
+"""Tests for batch orchestration."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from orchestrator.batch import load_manifest, run_batch
+from orchestrator.memory import enter_degraded_mode, reset_degraded_mode
+
+
+class _FakeGraph:
+    """Graph stand-in whose behaviour depends on the job's repository."""
+
+    def stream(self, state, config, stream_mode):
+        repo = state["target_repo_path"]
+        if repo == "broken":
+            raise RuntimeError("analysis crashed")
+        yield {"init": {"current_phase": "analyze"}}
+        if repo == "slow":
+            time.sleep(2)
+        yield {"analyze": {"current_phase": "complete"}}
+
+    def get_state(self, config):
+        return SimpleNamespace(next=())
+
+
+def test_load_manifest_csv_and_jsonl(tmp_path):
+    """Test manifests are read from CSV (with column aliases) and JSONL."""
+    csv_path = tmp_path / "repos.csv"
+    csv_path.write_text("repo,org,project,url\n/src/a,org,proj,\n")
+    jsonl_path = tmp_path / "repos.jsonl"
+    jsonl_path.write_text('{"repo_path": "/src/b", "org_id": "org", "project_id": "proj"}\n\n')
+
+    assert load_manifest(str(csv_path)) == [
+        {"repo_path": "/src/a", "repo_url": None, "org_id": "org", "project_id": "proj"}
+    ]
+    assert load_manifest(str(jsonl_path))[0]["repo_path"] == "/src/b"
+
+
+def test_failing_and_hung_jobs_do_not_stall_batch(tmp_path):
+    """Test every job is reported even when others fail or time out."""
+    jobs = [
+        {"repo_path": repo, "org_id": "org", "project_id": "proj"}
+        for repo in ("ok", "broken", "slow")
+    ]
+    report = tmp_path / "report.jsonl"
+
+    results = asyncio.run(run_batch(_FakeGraph(), jobs, str(report), workers=2, timeout=0.5))
+
+    assert [r["status"] for r in results] == ["complete", "failed", "timeout"]
+    assert set(results[0]["phase_timings"]) == {"init", "analyze"}
+    assert len({r["workflow_id"] for r in results}) == 3
+    rows = [json.loads(line) for line in report.read_text().splitlines()]
+    assert sorted(r["repo_path"] for r in rows) == ["broken", "ok", "slow"]
+
+
+def test_timed_out_job_does_not_time_out_queued_jobs(tmp_path):
+    """Test jobs queued behind a timed-out job still run with their full timeout."""
+    jobs = [
+        {"repo_path": repo, "org_id": "org", "project_id": "proj"}
+        for repo in ("slow", "ok", "ok2")
+    ]
+
+    results = asyncio.run(
+        run_batch(_FakeGraph(), jobs, str(tmp_path / "report.jsonl"), workers=1, timeout=0.5)
+    )
+
+    assert [r["status"] for r in results] == ["timeout", "complete", "complete"]
+
+
+def test_degraded_slot_wait_does_not_count_against_timeout(tmp_path):
+    """Test a job waiting for the degraded-mode workflow slot keeps its full timeout."""
+    jobs = [{"repo_path": repo, "org_id": "org", "project_id": "proj"} for repo in ("slow", "ok")]
+    enter_degraded_mode("test")
+    try:
+        results = asyncio.run(
+            run_batch(_FakeGraph(), jobs, str(tmp_path / "report.jsonl"), workers=2, timeout=0.5)
+        )
+    finally:
+        reset_degraded_mode()
+
+    assert [r["status"] for r in results] == ["timeout", "complete"]
+
+
+def test_timeout_reaches_nodes_watching_the_cancel_event(tmp_path):
+    """Test a timed-out job's long-running node sees the cancel and frees its slot."""
+    from typing import TypedDict
+
+    from langgraph.graph import END, START, StateGraph
+
+    from orchestrator.cancellation import current_cancel_event
+
+    class State(TypedDict, total=False):
+        target_repo_path: str
+        current_phase: str
+
+    def poll(state):
+        # Stands in for the verify node polling Harness executions
+        current_cancel_event().wait(30)
+        return {"current_phase": "complete"}
+
+    workflow = StateGraph(State)
+    workflow.add_node("verify", poll)
+    workflow.add_edge(START, "verify")
+    workflow.add_edge("verify", END)
+    jobs = [{"repo_path": repo, "org_id": "org", "project_id": "proj"} for repo in ("a", "b")]
+
+    started = time.monotonic()
+    results = asyncio.run(
+        run_batch(workflow.compile(), jobs, str(tmp_path / "report.jsonl"), workers=1, timeout=0.3)
+    )
+
+    assert [r["status"] for r in results] == ["timeout", "timeout"]
+    assert time.monotonic() - started < 5
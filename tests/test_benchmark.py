@@ -0,0 +1,57 @@
+"""Tests for the end-to-end benchmark suite."""
+
+import pytest
+
+from benchmarks.run import compare, run_isolated
+from benchmarks.synthetic import synthetic_files
+
+
+def test_synthetic_repository_mix():
+    """Test generated repositories have the requested size and a realistic file mix."""
+    paths = [path for path, _ in synthetic_files(500)]
+
+    assert len(paths) == len(set(paths)) == 500
+    assert any(path.endswith("/Dockerfile") for path in paths)
+    assert any("/k8s/" in path for path in paths)
+    assert any("/node_modules/" in path or "/vendor/" in path for path in paths)
+    assert paths == [path for path, _ in synthetic_files(500)]
+
+
+@pytest.mark.slow
+def test_benchmark_runs_full_workflow():
+    """Test a small benchmark runs every phase and reports throughput and RSS."""
+    result = run_isolated(200)
+
+    assert result["status"] == "complete", result["errors"]
+    assert result["peak_rss_bytes"] > 0 and result["checkpoint_bytes"] > 0
+    assert result["phases"]["analyze"]["llm_calls"] == 2
+    assert result["phases"]["analyze"]["mcp_calls"] == 2
+    assert {"verify", "setup_pipeline"} <= set(result["phases"])
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    """Test regressions beyond tolerance and noise floors are reported."""
+    baseline = [
+        {
+            "files": 1000,
+            "workflow_seconds": 1.0,
+            "peak_rss_bytes": 100 * 2**20,
+            "checkpoint_bytes": 2**20,
+            "phases": {"analyze": {"wall_seconds": 0.5}},
+        }
+    ]
+    results = [
+        {
+            "files": 1000,
+            "workflow_seconds": 1.1,
+            "peak_rss_bytes": 200 * 2**20,
+            "checkpoint_bytes": 2**20,
+            "phases": {"analyze": {"wall_seconds": 0.9}},
+        }
+    ]
+
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("1000 files peak_rss_bytes")
+    assert regressions[1].startswith("1000 files analyze wall_seconds")
@@ -0,0 +1,34 @@
+"""Tests for the content-addressed blob store."""
+
+import pytest
+
+from orchestrator.blobs import get_blob, is_blob_ref, offload, put_blob, resolve
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Point the orchestrator cache at a temporary directory."""
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_blobs_are_content_addressed(cache_root):
+    """Test identical content maps to one reference and one file."""
+    ref = put_blob("pipeline: {}")
+
+    assert is_blob_ref(ref)
+    assert put_blob("pipeline: {}") == ref
+    assert get_blob(ref) == "pipeline: {}"
+    assert len(list((cache_root / "blobs").glob("*/*"))) == 1
+
+
+def test_offload_keeps_small_values_inline():
+    """Test only values above the threshold are replaced by references."""
+    small = offload("short", threshold=10)
+    large = offload("x" * 100, threshold=10)
+
+    assert small == "short"
+    assert is_blob_ref(large)
+    assert resolve(small) == "short"
+    assert resolve(large) == "x" * 100
+    assert resolve(None) is None
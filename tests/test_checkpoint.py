@@ -0,0 +1,108 @@
+"""Tests for the durable SQLite checkpointer."""
+
+import sqlite3
+import time
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from orchestrator.checkpoint import BatchedSqliteSaver, open_checkpointer, rewind_failed_run
+
+
+class _CounterState(TypedDict):
+    count: int
+
+
+def _counter_graph(checkpointer):
+    """Two-step graph that pauses between its nodes."""
+    workflow = StateGraph(_CounterState)
+    workflow.add_node("first", lambda state: {"count": state["count"] + 1})
+    workflow.add_node("second", lambda state: {"count": state["count"] + 10})
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=checkpointer, interrupt_before=["second"])
+
+
+def test_paused_run_resumes_from_new_process(tmp_path):
+    """Test a paused run survives closing the database and continues where it stopped."""
+    path = str(tmp_path / "checkpoints.sqlite")
+    config = {"configurable": {"thread_id": "workflow-1"}}
+
+    checkpointer = open_checkpointer(path)
+    _counter_graph(checkpointer).invoke({"count": 0}, config)
+    checkpointer.close()
+
+    checkpointer = open_checkpointer(path)
+    graph = _counter_graph(checkpointer)
+    assert graph.get_state(config).next == ("second",)
+    assert graph.invoke(None, config) == {"count": 11}
+    checkpointer.close()
+
+
+class _FailingState(TypedDict):
+    count: int
+    errors: list[str]
+
+
+def test_failed_run_resumes_from_failed_node(tmp_path):
+    """Test a run that recorded an error is rewound to retry only the failed node."""
+    attempts = []
+
+    def flaky(state):
+        attempts.append(state["count"])
+        if len(attempts) == 1:
+            return {"errors": ["flaky failed"]}
+        return {"count": state["count"] + 10}
+
+    workflow = StateGraph(_FailingState)
+    workflow.add_node("first", lambda state: {"count": state["count"] + 1})
+    workflow.add_node("flaky", flaky)
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "flaky")
+    workflow.add_edge("flaky", END)
+    checkpointer = open_checkpointer(str(tmp_path / "checkpoints.sqlite"))
+    graph = workflow.compile(checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "workflow-1"}}
+
+    assert graph.invoke({"count": 0, "errors": []}, config)["errors"] == ["flaky failed"]
+    assert not graph.get_state(config).next
+
+    assert rewind_failed_run(graph, config)
+    assert graph.get_state(config).next == ("flaky",)
+    assert graph.invoke(None, config) == {"count": 11, "errors": []}
+    assert attempts == [1, 1]
+    assert not rewind_failed_run(graph, config)
+    checkpointer.close()
+
+
+def test_database_uses_wal(tmp_path):
+    """Test the checkpoint database is opened in WAL mode."""
+    checkpointer = open_checkpointer(str(tmp_path / "checkpoints.sqlite"))
+    (mode,) = checkpointer.conn.execute("PRAGMA journal_mode").fetchone()
+    checkpointer.close()
+
+    assert mode == "wal"
+
+
+def test_batched_write_is_committed_after_interval_without_further_writes(tmp_path):
+    """Test the last batched checkpoint is committed even if no write follows it."""
+    path = str(tmp_path / "checkpoints.sqlite")
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    checkpointer = BatchedSqliteSaver(conn, commit_interval=0.05)
+    config = {"configurable": {"thread_id": "workflow-1"}}
+    _counter_graph(checkpointer).invoke({"count": 0}, config)
+
+    def committed_checkpoints():
+        reader = sqlite3.connect(path)
+        try:
+            return reader.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        finally:
+            reader.close()
+
+    deadline = time.monotonic() + 2
+    while not committed_checkpoints() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert committed_checkpoints() == len(list(checkpointer.list(config)))
+    checkpointer.close()
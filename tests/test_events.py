@@ -0,0 +1,56 @@
+"""Tests for compact workflow progress events."""
+
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage
+
+from orchestrator.events import compact, stream_events, update_event
+
+
+def test_update_event_is_compact():
+    """Test node updates are summarised: counts, sizes and blob references."""
+    ref = "blob:sha256:" + "a" * 64
+    update = {
+        "current_phase": "extract",
+        "messages": [AIMessage(content="✅ Repository analysis complete\n\n" + "details " * 500)],
+        "repository_analysis": {
+            "primary_language": "python",
+            "languages": ["python", "shell"],
+            "structure_analysis": ref,
+            "notes": "x" * 1000,
+            "dependencies": {"python": ["requests"]},
+        },
+    }
+
+    event = update_event("analyze", update)
+
+    assert event["phase"] == "extract"
+    assert event["message"] == "✅ Repository analysis complete"
+    assert event["fields"]["repository_analysis"] == {
+        "primary_language": "python",
+        "languages": {"count": 2},
+        "structure_analysis": ref,
+        "notes": {"bytes": 1000},
+        "dependencies": {"keys": 1},
+    }
+    assert compact(None) is None
+
+
+def test_stream_events_reports_pause():
+    """Test a run yields start, one event per node and a pause event."""
+
+    class _Graph:
+        def stream(self, graph_input, config, stream_mode):
+            assert stream_mode == "updates"
+            yield {"init": {"current_phase": "analyze"}}
+            yield {"generate": {"current_phase": "setup"}, "__interrupt__": ()}
+
+        def get_state(self, config):
+            return SimpleNamespace(next=("approval",))
+
+    events = list(stream_events(_Graph(), {}, {"configurable": {"thread_id": "wf-1"}}))
+
+    assert [e["event"] for e in events] == ["start", "node", "node", "paused"]
+    assert [e.get("node") for e in events[1:3]] == ["init", "generate"]
+    assert events[-1]["next"] == ["approval"]
+    assert all(e["workflow_id"] == "wf-1" for e in events)
@@ -0,0 +1,64 @@
+"""Tests for bounded message history."""
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from orchestrator.history import HISTORY_SUMMARY_ID, bounded_add_messages, trim_history
+
+
+def test_short_history_is_untouched():
+    """Test histories within the limits are returned as-is."""
+    messages = [AIMessage(content=f"step {i}", id=str(i)) for i in range(3)]
+
+    assert trim_history(messages, max_messages=5) == messages
+
+
+def test_old_messages_fold_into_summary():
+    """Test older messages are folded into one summary message."""
+    messages = [AIMessage(content=f"✅ Step {i}\n\ndetails", id=str(i)) for i in range(6)]
+
+    trimmed = trim_history(messages, max_messages=2)
+
+    assert trimmed[0].id == HISTORY_SUMMARY_ID
+    assert [m.id for m in trimmed[1:]] == ["4", "5"]
+    assert "- [ai] ✅ Step 0" in trimmed[0].content
+    assert "details" not in trimmed[0].content
+
+    # Folding again extends the existing summary instead of nesting it
+    again = trim_history([*trimmed, AIMessage(content="✅ Step 6", id="6")], max_messages=2)
+    assert "- [ai] ✅ Step 4" in again[0].content
+    assert "- [ai] ✅ Step 0" in again[0].content
+
+
+def test_byte_caps_bound_history_and_summary():
+    """Test byte caps apply to verbatim messages and to the summary itself."""
+    messages = [AIMessage(content=f"entry {i} " + "x" * 500, id=str(i)) for i in range(50)]
+
+    trimmed = trim_history(messages, max_messages=50, max_bytes=2000, summary_bytes=300)
+
+    assert len(trimmed) < 6
+    assert len(trimmed[0].content.encode("utf-8")) <= 300
+    assert trimmed[-1].id == "49"
+
+
+def test_tool_results_are_not_orphaned():
+    """Test a kept window never starts with a tool result."""
+    messages = [
+        AIMessage(content="call", id="a", tool_calls=[{"name": "t", "args": {}, "id": "c1"}]),
+        ToolMessage(content="result", tool_call_id="c1", id="b"),
+        AIMessage(content="done", id="c"),
+    ]
+
+    trimmed = trim_history(messages, max_messages=2)
+
+    assert [m.id for m in trimmed[1:]] == ["c"]
+
+
+def test_reducer_applies_environment_limits(monkeypatch):
+    """Test the state reducer honours the configured retention policy."""
+    monkeypatch.setenv("ORCHESTRATOR_HISTORY_MAX_MESSAGES", "3")
+    history = []
+    for i in range(10):
+        history = bounded_add_messages(history, [AIMessage(content=f"step {i}")])
+
+    assert len(history) == 4
+    assert history[0].id == HISTORY_SUMMARY_ID
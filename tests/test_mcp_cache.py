@@ -0,0 +1,66 @@
+"""Tests for the MCP tool result cache."""
+
+import os
+
+from orchestrator.tools.mcp_cache import ToolResultCache, cache_key
+
+
+def test_cache_key_is_canonical():
+    """Test argument order does not matter but scope and values do."""
+    key = cache_key("pack", {"path": "/repo", "style": "xml"}, "abc123")
+
+    assert key == cache_key("pack", {"style": "xml", "path": "/repo"}, "abc123")
+    assert key != cache_key("pack", {"path": "/repo", "style": "xml"}, "def456")
+    assert key != cache_key("pack", {"path": "/repo", "style": "md"}, "abc123")
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    """Test the memory tier stays under its byte cap."""
+    cache = ToolResultCache(tmp_path, memory_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    cache.get("a")
+    cache.put("c", "cccc")
+
+    assert list(cache._memory) == ["a", "c"]
+    # Evicted entries are still served from disk
+    assert cache.get("b") == "bbbb"
+
+
+def test_disk_tier_survives_restart_and_respects_cap(tmp_path):
+    """Test results persist across instances and old entries are evicted."""
+    cache = ToolResultCache(tmp_path, disk_bytes=150)
+    cache.put("0" * 64, "x" * 50)
+    os.utime(next(tmp_path.glob("*/*.json")), (0, 0))
+    cache.put("1" * 64, "y" * 50)
+    cache.put("2" * 64, "z" * 50)
+
+    fresh = ToolResultCache(tmp_path, disk_bytes=150)
+    assert fresh.get("0" * 64) is None
+    assert fresh.get("2" * 64) == "z" * 50
+
+
+def test_sizes_are_counted_in_bytes(tmp_path):
+    """Test non-ASCII results count their encoded size and overwrites replace theirs."""
+    cache = ToolResultCache(tmp_path, memory_bytes=10)
+    cache.put("a", "éééé")  # 8 bytes
+    cache.put("b", "éé")
+
+    assert list(cache._memory) == ["b"]
+
+    cache.put("c", "x" * 8)
+    cache.put("c", "x" * 8)
+    assert cache._disk_size == sum(p.stat().st_size for p in tmp_path.glob("*/*.json"))
+
+
+def test_only_read_only_tools_are_cached():
+    """Test tools are cacheable only when listed or annotated as read-only and idempotent."""
+    from orchestrator.tools.mcp_registry import _is_idempotent
+
+    assert _is_idempotent("repomix", {"name": "pack_codebase"})
+    assert not _is_idempotent("scaffold", {"name": "create_project"})
+    assert not _is_idempotent("harness", {"name": "create_pipeline"})
+    assert _is_idempotent(
+        "harness",
+        {"name": "get_pipeline", "annotations": {"readOnlyHint": True, "idempotentHint": True}},
+    )
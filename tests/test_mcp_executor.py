@@ -0,0 +1,57 @@
+"""Tests for concurrent tool execution."""
+
+import asyncio
+import time
+
+from langchain_core.tools import StructuredTool
+
+from orchestrator.tools.mcp_executor import execute_tool_calls
+
+
+def _slow_tool(name, delay, result):
+    """Build an async tool that sleeps before answering."""
+
+    async def run(**arguments):
+        await asyncio.sleep(delay)
+        return result
+
+    return StructuredTool(
+        name=name,
+        description=name,
+        args_schema={"type": "object", "properties": {}},
+        coroutine=run,
+    )
+
+
+def test_tool_calls_run_concurrently_in_order():
+    """Test a turn with several tool calls costs one tool latency."""
+    tools = [_slow_tool("listing", 0.2, "files"), _slow_tool("metadata", 0.2, "repo")]
+    calls = [
+        {"name": "metadata", "args": {}, "id": "call_1"},
+        {"name": "listing", "args": {}, "id": "call_2"},
+        {"name": "metadata", "args": {}, "id": "call_3"},
+    ]
+
+    started = time.monotonic()
+    messages = execute_tool_calls(calls, tools)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.4
+    assert [m.tool_call_id for m in messages] == ["call_1", "call_2", "call_3"]
+    assert [m.content for m in messages] == ["repo", "files", "repo"]
+
+
+def test_timeouts_and_unknown_tools_become_errors():
+    """Test failures are reported to the model instead of raised."""
+    tools = [_slow_tool("pack", 1.0, "packed"), _slow_tool("listing", 0.0, "files")]
+    calls = [
+        {"name": "pack", "args": {}, "id": "call_1"},
+        {"name": "missing", "args": {}, "id": "call_2"},
+        {"name": "listing", "args": {}, "id": "call_3"},
+    ]
+
+    messages = execute_tool_calls(calls, tools, timeouts={"pack": 0.05})
+
+    assert [m.status for m in messages] == ["error", "error", "success"]
+    assert "timed out" in messages[0].content
+    assert messages[2].content == "files"
@@ -0,0 +1,45 @@
+"""Tests for the on-disk MCP tool schema cache."""
+
+import os
+
+import pytest
+
+from orchestrator.tools.mcp_manifest import (
+    has_manifest,
+    load_manifest,
+    save_manifest,
+    server_fingerprint,
+)
+
+ECHO_SPEC = {"name": "echo", "description": "Echo", "inputSchema": {"type": "object"}}
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Point the orchestrator cache at a temporary directory."""
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_fingerprint_tracks_command_and_environment():
+    """Test fingerprints change with the server command and its environment."""
+    config = {"command": "npx", "args": ["-y", "@example/server"], "env": {"TOKEN": "a"}}
+
+    assert server_fingerprint(config) == server_fingerprint(dict(config))
+    assert server_fingerprint(config) != server_fingerprint({**config, "env": {"TOKEN": "b"}})
+    assert server_fingerprint(config) != server_fingerprint(
+        {**config, "args": ["-y", "@example/other"]}
+    )
+
+
+def test_load_returns_latest_entry(cache_root):
+    """Test binding uses the newest cached schemas regardless of fingerprint."""
+    assert load_manifest("scaffold") is None
+
+    save_manifest("scaffold", "old", [ECHO_SPEC])
+    os.utime(cache_root / "mcp" / "manifests" / "scaffold" / "old.json", (0, 0))
+    save_manifest("scaffold", "new", [ECHO_SPEC, {**ECHO_SPEC, "name": "list"}])
+
+    assert [spec["name"] for spec in load_manifest("scaffold")] == ["echo", "list"]
+    assert has_manifest("scaffold", "old")
+    assert not has_manifest("scaffold", "missing")
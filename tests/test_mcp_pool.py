@@ -0,0 +1,101 @@
+"""Tests for the warm MCP session pool."""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("mcp.server.fastmcp")
+
+from orchestrator.tools.mcp_pool import MCPSessionPool
+
+ECHO_SERVER = '''
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("echo")
+
+
+@server.tool()
+def echo(text: str) -> str:
+    """Echo text back in upper case."""
+    return text.upper()
+
+
+server.run()
+'''
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Pool with a local stdio echo server and a server that cannot start."""
+    script = tmp_path / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    pool = MCPSessionPool(
+        {
+            "echo": {"transport": "stdio", "command": sys.executable, "args": [str(script)]},
+            "broken": {
+                "transport": "stdio",
+                "command": sys.executable,
+                "args": ["-m", "no_such_mcp_server"],
+            },
+        }
+    )
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.integration
+def test_pool_reuses_server_across_calls(pool):
+    """Test tools from the pool share one long-lived server session."""
+    (tool,) = pool.get_tools("echo")
+
+    assert tool.invoke({"text": "hi"}) == "HI"
+    assert pool.get_tools("echo")[0].invoke({"text": "again"}) == "AGAIN"
+    assert pool.status()["echo"] == {"connected": True, "restarts": 0, "last_error": None}
+
+
+@pytest.mark.integration
+def test_pool_reports_startup_failures(pool):
+    """Test a server that cannot start raises instead of hanging."""
+    with pytest.raises(RuntimeError, match="failed to start"):
+        pool.get_tools("broken")
+
+    with pytest.raises(ValueError, match="Unsupported MCP server"):
+        pool.get_tools("unknown")
+
+
+@pytest.mark.integration
+def test_tools_from_spec_start_server_on_first_call(pool):
+    """Test a tool built from a cached spec only starts its server when invoked."""
+    listed = []
+    pool._on_tools_listed = lambda server, specs: listed.append((server, specs))
+    tool = pool.make_tool(
+        "echo",
+        {
+            "name": "echo",
+            "description": "Echo text back in upper case.",
+            "inputSchema": {"type": "object", "properties": {"text": {"type": "string"}}},
+        },
+    )
+
+    assert pool.status() == {}
+    assert tool.invoke({"text": "lazy"}) == "LAZY"
+    assert pool.status()["echo"]["connected"] is True
+    assert [spec["name"] for spec in listed[0][1]] == ["echo"]
+
+
+def test_timed_out_call_is_cancelled_on_the_pool_loop(pool):
+    """Test a call that times out does not keep running on the pool loop."""
+    cancelled = threading.Event()
+
+    async def hang():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        pool._run(hang(), 0.1)
+    assert cancelled.wait(5)
@@ -0,0 +1,50 @@
+"""Tests for input-hash node memoization."""
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from orchestrator.memo import memoize_node
+
+
+@pytest.fixture(autouse=True)
+def cache_root(tmp_path, monkeypatch):
+    """Point the orchestrator cache at a temporary directory."""
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _counting_node(calls, phase="generate"):
+    def extract_patterns(state):
+        calls.append(state["repository_analysis"])
+        return {"current_phase": phase, "messages": [AIMessage(content="done")]}
+
+    return extract_patterns
+
+
+def test_identical_inputs_replay_recorded_update():
+    """Test a node only runs once for the same state slice."""
+    calls = []
+    node = memoize_node(_counting_node(calls), reads=("repository_analysis",))
+
+    first = node({"repository_analysis": {"primary_language": "go"}, "workflow_id": "a"})
+    second = node({"repository_analysis": {"primary_language": "go"}, "workflow_id": "b"})
+    node({"repository_analysis": {"primary_language": "rust"}, "workflow_id": "c"})
+
+    assert len(calls) == 2
+    assert second["messages"][0].content == first["messages"][0].content
+
+
+def test_version_bump_and_errors_invalidate(monkeypatch):
+    """Test new node versions and error updates always re-run."""
+    calls = []
+    state = {"repository_analysis": {"primary_language": "go"}}
+
+    memoize_node(_counting_node(calls), reads=("repository_analysis",), version="1")(state)
+    memoize_node(_counting_node(calls), reads=("repository_analysis",), version="2")(state)
+    failing = memoize_node(_counting_node(calls, "error"), reads=("repository_analysis",), version="3")
+    failing(state)
+    failing(state)
+    monkeypatch.setenv("ORCHESTRATOR_MEMOIZE", "0")
+    memoize_node(_counting_node(calls), reads=("repository_analysis",), version="1")(state)
+
+    assert len(calls) == 5
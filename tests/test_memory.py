@@ -0,0 +1,69 @@
+"""Tests for per-node memory tracking and budgets."""
+
+import tracemalloc
+
+import pytest
+
+from orchestrator.memory import (
+    degraded_limit,
+    is_degraded,
+    reset_degraded_mode,
+    start_tracking,
+    stop_tracking,
+)
+from orchestrator.metrics import instrument_node
+from orchestrator.state import merge_metrics
+
+
+@pytest.fixture(autouse=True)
+def _restore_memory_state():
+    yield
+    reset_degraded_mode()
+    tracemalloc.stop()
+
+
+def _allocating_node(state):
+    buffer = bytearray(4 * 2**20)
+    return {"current_phase": "extract", "size": len(buffer)}
+
+
+def test_budget_overrun_enters_degraded_mode(monkeypatch):
+    """Test a node peaking over its budget is recorded and degrades the process."""
+    monkeypatch.setenv("ORCHESTRATOR_MEMORY_BUDGET_MB", "analyze=1,default=64")
+
+    update = instrument_node(_allocating_node, "analyze")({})
+
+    metrics = update["metrics"]["analyze"]
+    assert metrics["peak_alloc_bytes"] >= 4 * 2**20
+    assert metrics["budget_exceeded"] == 1
+    assert update["messages"][0].content.startswith("⚠️ Memory budget exceeded: analyze")
+    assert is_degraded()
+    assert degraded_limit(8) == 2 and degraded_limit(2) == 1
+
+
+def test_within_budget_and_peak_reducer(monkeypatch):
+    """Test nodes within budget keep full limits and peaks merge by maximum."""
+    monkeypatch.setenv("ORCHESTRATOR_MEMORY_BUDGET_MB", "64")
+
+    update = instrument_node(_allocating_node, "extract")({})
+
+    assert "budget_exceeded" not in update["metrics"]["extract"]
+    assert not is_degraded() and degraded_limit(8) == 8
+    merged = merge_metrics(
+        {"extract": {"runs": 1, "peak_alloc_bytes": 300}},
+        {"extract": {"runs": 1, "peak_alloc_bytes": 200}},
+    )
+    assert merged == {"extract": {"runs": 2, "peak_alloc_bytes": 300}}
+
+
+def test_overlapping_nodes_are_not_blamed(monkeypatch):
+    """Test budgets are not enforced for nodes that overlap another tracked node."""
+    monkeypatch.setenv("ORCHESTRATOR_MEMORY_BUDGET_MB", "1")
+
+    other = start_tracking()
+    update = instrument_node(_allocating_node, "analyze")({})
+    _, alone = stop_tracking(other)
+
+    assert update["metrics"]["analyze"]["peak_alloc_bytes"] >= 4 * 2**20
+    assert "budget_exceeded" not in update["metrics"]["analyze"]
+    assert not alone and not is_degraded()
@@ -0,0 +1,59 @@
+"""Tests for node instrumentation metrics."""
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from orchestrator.metrics import (
+    UsageCallbackHandler,
+    instrument_node,
+    record_mcp_call,
+    render_prometheus,
+)
+from orchestrator.state import merge_metrics
+
+MODEL = "claude-sonnet-4-5-20250929"
+
+
+def test_instrumented_node_records_usage():
+    """Test LLM tokens, cost and MCP calls made by a node land in its update."""
+    usage = {
+        "input_tokens": 1000,
+        "output_tokens": 200,
+        "total_tokens": 1200,
+        "input_token_details": {"cache_read": 400},
+    }
+    llm = GenericFakeChatModel(
+        messages=iter([AIMessage(content="done", usage_metadata=usage)]),
+        callbacks=[UsageCallbackHandler(MODEL)],
+    )
+
+    def analyze_repository(state):
+        llm.invoke("analyze")
+        record_mcp_call(0.5)
+        record_mcp_call(0.25, error=True)
+        return {"current_phase": "extract"}
+
+    update = instrument_node(analyze_repository, "analyze")({})
+
+    metrics = update["metrics"]["analyze"]
+    assert update["current_phase"] == "extract"
+    assert metrics["runs"] == 1 and metrics["wall_seconds"] >= 0
+    assert (metrics["llm_calls"], metrics["input_tokens"], metrics["output_tokens"]) == (1, 1000, 200)
+    assert metrics["cached_tokens"] == 400
+    assert round(metrics["cost_usd"], 6) == round((600 * 3 + 200 * 15 + 400 * 0.3) / 1e6, 6)
+    assert (metrics["mcp_calls"], metrics["mcp_errors"], metrics["mcp_seconds"]) == (2, 1, 0.75)
+    # Usage outside an instrumented node is not attributed anywhere
+    record_mcp_call(1.0)
+
+
+def test_metrics_reducer_and_prometheus_rendering():
+    """Test repeated executions are summed and rendered per node."""
+    merged = merge_metrics(
+        {"analyze": {"runs": 1, "wall_seconds": 2.0}},
+        {"analyze": {"runs": 1, "wall_seconds": 0.5}, "extract": {"runs": 1}},
+    )
+
+    assert merged == {"analyze": {"runs": 2, "wall_seconds": 2.5}, "extract": {"runs": 1}}
+    text = render_prometheus(merged)
+    assert 'orchestrator_node_runs_total{node="analyze"} 2' in text
+    assert "# TYPE orchestrator_node_wall_seconds_total counter" in text
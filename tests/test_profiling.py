@@ -0,0 +1,38 @@
+"""Tests for the per-node sampling profiler."""
+
+import time
+
+from orchestrator.profiling import hot_functions, profile_dir, profile_node, read_profile
+
+
+def _busy_node(state):
+    deadline = time.perf_counter() + 0.1
+    while time.perf_counter() < deadline:
+        pass
+    return {"current_phase": "extract"}
+
+
+def test_profiled_node_writes_folded_stacks(tmp_path, monkeypatch):
+    """Test enabled profiling writes the node's stacks and summarises hot functions."""
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("ORCHESTRATOR_PROFILE", "1")
+    monkeypatch.setenv("ORCHESTRATOR_PROFILE_INTERVAL_MS", "1")
+    node = profile_node(_busy_node, "analyze")
+
+    assert node({"workflow_id": "wf-1"}) == {"current_phase": "extract"}
+    node({"workflow_id": "wf-1"})
+
+    stacks = read_profile(profile_dir("wf-1") / "analyze.collapsed")
+    assert sum(count for stack, count in stacks.items() if "_busy_node" in stack) > 20
+    top = hot_functions("wf-1")[0]
+    assert top["function"].startswith("_busy_node") and top["nodes"] == ["analyze"]
+
+
+def test_profiling_disabled_by_default(tmp_path, monkeypatch):
+    """Test nodes run unprofiled unless profiling is enabled."""
+    monkeypatch.setenv("ORCHESTRATOR_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("ORCHESTRATOR_PROFILE", raising=False)
+
+    profile_node(_busy_node, "analyze")({"workflow_id": "wf-2"})
+
+    assert not (tmp_path / "profiles").exists()
@@ -0,0 +1,52 @@
+"""Tests for LLM and MCP record/replay."""
+
+import itertools
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from orchestrator.replay import Recorder, replay_chat_model
+
+
+def test_chat_exchanges_replay_in_order(tmp_path):
+    """Test recorded chat responses are replayed for identical requests."""
+    fixture = tmp_path / "fixture.jsonl"
+    responses = itertools.chain([AIMessage(content="first")], itertools.repeat(AIMessage(content="again")))
+    recording = replay_chat_model(
+        "model-x", GenericFakeChatModel(messages=responses), Recorder("record", fixture)
+    )
+    prompt = [HumanMessage(content="analyze the repo")]
+    assert recording.invoke(prompt).content == "first"
+    assert recording.invoke(prompt).content == "again"
+
+    replaying = replay_chat_model("model-x", None, Recorder("replay", fixture))
+
+    assert replaying.invoke(prompt).content == "first"
+    assert replaying.invoke(prompt).content == "again"
+    with pytest.raises(LookupError):
+        replaying.invoke([HumanMessage(content="never recorded")])
+
+
+def test_tool_calls_replay_without_server(tmp_path):
+    """Test recorded MCP tool results and errors are replayed without calling the tool."""
+    fixture = tmp_path / "fixture.jsonl"
+    recorder = Recorder("record", fixture)
+    recorder.record_tool_specs("github", [{"name": "get_repository"}])
+    assert recorder.call_tool("github", "get_repository", {"repo": "a"}, lambda: "repo a") == "repo a"
+
+    def fail():
+        raise RuntimeError("not found")
+
+    with pytest.raises(RuntimeError):
+        recorder.call_tool("github", "get_repository", {"repo": "b"}, fail)
+
+    replay = Recorder("replay", fixture)
+
+    def unreachable():
+        raise AssertionError("tool called during replay")
+
+    assert replay.tool_specs("github") == [{"name": "get_repository"}]
+    assert replay.call_tool("github", "get_repository", {"repo": "a"}, unreachable) == "repo a"
+    with pytest.raises(RuntimeError, match="not found"):
+        replay.call_tool("github", "get_repository", {"repo": "b"}, unreachable)
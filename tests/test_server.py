@@ -0,0 +1,79 @@
+"""Tests for the serve worker and its client."""
+
+import os
+import stat
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from orchestrator.client import OrchestratorClient
+from orchestrator.server import OrchestratorWorker, create_server
+
+
+class _ApprovalGraph:
+    """Graph stand-in that pauses for approval once, then completes."""
+
+    def __init__(self):
+        self.approved = set()
+
+    def stream(self, state, config, stream_mode):
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self.approved:
+            yield {"setup": {"current_phase": "complete"}}
+        else:
+            yield {"generate": {"current_phase": "setup"}}
+
+    def get_state(self, config):
+        paused = config["configurable"]["thread_id"] not in self.approved
+        return SimpleNamespace(next=("approval",) if paused else ())
+
+    def update_state(self, config, values):
+        self.approved.add(config["configurable"]["thread_id"])
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = str(tmp_path / "worker.sock")
+    worker = OrchestratorWorker(_ApprovalGraph(), workers=2)
+    server = create_server(worker, path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield OrchestratorClient(path)
+    server.shutdown()
+    server.server_close()
+    worker.shutdown()
+
+
+def test_submit_stream_and_approve(client):
+    """Test a job is submitted, pauses for approval and completes once approved."""
+    job = client.submit("/src/app", "org", "proj")
+
+    events = list(client.events(job["workflow_id"]))
+    assert [e["node"] for e in events if e["type"] == "node"] == ["generate"]
+    assert events[-1]["status"] == "awaiting_approval"
+
+    since = client.status(job["workflow_id"])["events"]
+    client.approve(job["workflow_id"], "looks good")
+    events = list(client.events(job["workflow_id"], since))
+    assert [e["node"] for e in events if e["type"] == "node"] == ["setup"]
+    assert client.status(job["workflow_id"])["status"] == "complete"
+
+
+def test_rejected_requests(client):
+    """Test invalid submissions and unknown jobs are reported as errors."""
+    with pytest.raises(RuntimeError, match="repo_path"):
+        client.submit("", "org", "proj")
+    with pytest.raises(RuntimeError, match="Unknown job"):
+        client.cancel("missing")
+
+
+def test_socket_is_private_and_approval_is_accepted_once(client):
+    """Test the socket is owner-only and a second approval of the same job is rejected."""
+    assert stat.S_IMODE(os.stat(client.path).st_mode) == 0o600
+
+    job = client.submit("/src/app", "org", "proj")
+    list(client.events(job["workflow_id"]))
+    client.approve(job["workflow_id"])
+    with pytest.raises(RuntimeError, match="not awaiting approval"):
+        client.approve(job["workflow_id"])
@@ -0,0 +1,51 @@
+"""Import-time regression tests for CLI startup."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Cumulative import time budget for the CLI module, in microseconds. Loading
+# LangGraph and the LLM/MCP clients eagerly costs several times this.
+CLI_IMPORT_BUDGET_US = 750_000
+
+# Heavy packages only commands that build or run the graph may load
+DEFERRED_PACKAGES = ("langgraph", "langchain_anthropic", "langchain_mcp_adapters", "mcp", "anthropic")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Import a module in a fresh interpreter and return cumulative import times."""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_defers_heavy_dependencies():
+    """Test importing the CLI does not load LangGraph or the LLM/MCP clients."""
+    times = _importtime("orchestrator.main")
+
+    loaded = {name.split(".")[0] for name in times}
+    assert loaded.isdisjoint(DEFERRED_PACKAGES)
+    assert times["orchestrator.main"] < CLI_IMPORT_BUDGET_US
+
+
+def test_graph_import_defers_node_dependencies():
+    """Test compiling the graph module does not load the LLM or MCP clients."""
+    loaded = {name.split(".")[0] for name in _importtime("orchestrator.graph")}
+
+    assert loaded.isdisjoint(("langchain_anthropic", "langchain_mcp_adapters", "mcp"))
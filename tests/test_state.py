@@ -4,6 +4,7 @@ from orchestrator.state import (
     OrchestratorState,
     RepositoryAnalysis,
     ExtractedPatterns,
+    merge_setup_results,
 )
 
 
@@ -87,3 +88,36 @@ def test_extracted_patterns_creation():
     assert patterns["build_pattern"] == "container"
     assert patterns["deployment_target"] == "kubernetes"
     assert len(patterns["environments"]) == 2
+
+
+def test_merge_setup_results():
+    """Test merging partial setup results from parallel setup branches."""
+    merged = merge_setup_results(None, {"connectors_created": [{"name": "gh"}]})
+    merged = merge_setup_results(
+        merged,
+        {"pipeline_created": {"id": "p1"}, "harness_urls": {"pipeline": "url"}},
+    )
+    merged = merge_setup_results(merged, {"harness_urls": {"project": "url"}})
+
+    assert merged["connectors_created"] == [{"name": "gh"}]
+    assert merged["pipeline_created"] == {"id": "p1"}
+    assert merged["harness_urls"] == {"pipeline": "url", "project": "url"}
+    assert merge_setup_results(merged, None) is merged
+
+
+def test_merge_setup_results_replaces_rerun_results():
+    """Test a re-run branch replaces its earlier result instead of adding to it."""
+    merged = merge_setup_results(
+        {"connectors_created": [{"name": "gh"}], "setup_errors": ["connectors timed out"]},
+        {"pipeline_created": {"id": "p1"}, "harness_urls": {"pipeline": "old", "project": "url"}},
+    )
+    merged = merge_setup_results(merged, {"connectors_created": [{"name": "gh"}]})
+    merged = merge_setup_results(
+        merged, {"pipeline_created": {"id": "p2"}, "harness_urls": {"pipeline": "new"}}
+    )
+    merged = merge_setup_results(merged, {"setup_status": "success", "setup_errors": []})
+
+    assert merged["connectors_created"] == [{"name": "gh"}]
+    assert merged["pipeline_created"] == {"id": "p2"}
+    assert merged["harness_urls"] == {"pipeline": "new", "project": "url"}
+    assert merged["setup_errors"] == []
@@ -0,0 +1,179 @@
+"""Tests for concurrent multi-environment verification."""
+
+import threading
+import time
+
+from orchestrator.nodes import verify
+from orchestrator.nodes.verify import (
+    EXECUTE_PIPELINE_TOOL,
+    GET_EXECUTION_TOOL,
+    _harness_runner,
+    run_environment_verifications,
+)
+
+
+def _runner(durations, failing=()):
+    """Build a runner that sleeps per environment and fails the given ones."""
+
+    def run(environment, cancel, on_started):
+        on_started(f"exec_{environment}")
+        if cancel.wait(durations[environment]):
+            return {"execution_status": "aborted"}
+        status = "failed" if environment in failing else "success"
+        return {"execution_id": f"exec_{environment}", "execution_status": status}
+
+    return run
+
+
+def test_environments_run_concurrently():
+    """Test independent environments overlap instead of running back to back."""
+    durations = {"dev": 0.2, "staging": 0.2, "qa": 0.2}
+
+    started = time.monotonic()
+    results = run_environment_verifications(
+        list(durations), _runner(durations), abort=lambda execution_id: None
+    )
+    elapsed = time.monotonic() - started
+
+    assert all(r["execution_status"] == "success" for r in results.values())
+    assert elapsed < 0.5
+
+
+def test_promotion_dependencies_are_honoured():
+    """Test production only starts once staging has passed."""
+    order = []
+    lock = threading.Lock()
+
+    def run(environment, cancel, on_started):
+        with lock:
+            order.append(environment)
+        time.sleep(0.05)
+        return {"execution_status": "success"}
+
+    results = run_environment_verifications(
+        ["dev", "staging", "production"], run, abort=lambda execution_id: None
+    )
+
+    assert order.index("production") > order.index("staging")
+    assert list(results) == ["dev", "staging", "production"]
+
+
+def test_blocking_failure_aborts_siblings():
+    """Test a blocking failure aborts running siblings and skips gated environments."""
+    durations = {"dev": 0.05, "staging": 5.0, "production": 0.05}
+    aborted = []
+
+    results = run_environment_verifications(
+        list(durations), _runner(durations, failing={"dev"}), abort=aborted.append
+    )
+
+    assert results["dev"]["execution_status"] == "failed"
+    assert results["staging"]["execution_status"] == "aborted"
+    assert results["production"]["execution_status"] == "skipped"
+    assert aborted == ["exec_staging"]
+
+
+def test_non_blocking_failure_does_not_cancel():
+    """Test failures in non-blocking environments leave siblings running."""
+    durations = {"preview": 0.05, "dev": 0.1}
+
+    results = run_environment_verifications(
+        list(durations),
+        _runner(durations, failing={"preview"}),
+        abort=lambda execution_id: None,
+    )
+
+    assert results["preview"]["execution_status"] == "failed"
+    assert results["preview"]["blocking"] is False
+    assert results["dev"]["execution_status"] == "success"
+
+
+def test_execution_without_final_status_blocks_promotion():
+    """Test an execution that never reports a final status fails and gates production."""
+
+    class Execute:
+        def invoke(self, arguments):
+            return {"execution_id": f"exec_{arguments['environment']}", "status": "Running"}
+
+    runner = _harness_runner(
+        {EXECUTE_PIPELINE_TOOL: Execute()},
+        {"id": "p1", "url": "https://h/p1"},
+        "org",
+        "proj",
+        abort=lambda execution_id: None,
+    )
+    results = run_environment_verifications(
+        ["staging", "production"], runner, abort=lambda execution_id: None
+    )
+
+    assert results["staging"]["execution_status"] == "failed"
+    assert "did not report a final status (Running)" in results["staging"]["error"]
+    assert results["production"]["execution_status"] == "skipped"
+
+
+def test_execution_started_after_cancellation_is_aborted():
+    """Test an execution reporting its ID after a blocking failure is aborted at once."""
+    aborted = []
+
+    def run(environment, cancel, on_started):
+        if environment == "dev":
+            time.sleep(0.05)
+            return {"execution_status": "failed"}
+        cancel.wait(5)
+        on_started(f"exec_{environment}")
+        return {"execution_status": "aborted"}
+
+    results = run_environment_verifications(
+        ["dev", "qa"], run, abort=aborted.append, dependencies={}
+    )
+
+    assert results["qa"]["execution_status"] == "aborted"
+    assert aborted == ["exec_qa"]
+
+
+def test_cancelled_runner_aborts_its_own_execution(monkeypatch):
+    """Test a runner cancelled while polling aborts its execution before reporting it."""
+    monkeypatch.setattr(verify, "EXECUTION_POLL_INTERVAL_SECONDS", 0.01)
+
+    class Tool:
+        def __init__(self, status):
+            self.status = status
+
+        def invoke(self, arguments):
+            return {"execution_id": "exec_qa", "status": self.status}
+
+    aborted = []
+    runner = _harness_runner(
+        {EXECUTE_PIPELINE_TOOL: Tool("Running"), GET_EXECUTION_TOOL: Tool("Running")},
+        {"id": "p1", "url": "https://h/p1"},
+        "org",
+        "proj",
+        abort=aborted.append,
+    )
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+
+    result = runner("qa", cancel, lambda execution_id: None)
+
+    assert result["execution_status"] == "aborted"
+    assert aborted == ["exec_qa"]
+
+
+def test_workflow_cancel_aborts_running_executions(monkeypatch):
+    """Test cancelling the workflow aborts executions in flight and skips the rest."""
+    monkeypatch.setattr(verify, "CANCEL_CHECK_SECONDS", 0.01)
+    durations = {"dev": 5.0, "staging": 5.0, "production": 0.05}
+    aborted = []
+    cancelled = threading.Event()
+    threading.Timer(0.1, cancelled.set).start()
+
+    started = time.monotonic()
+    results = run_environment_verifications(
+        list(durations), _runner(durations), abort=aborted.append, cancelled=cancelled
+    )
+
+    assert time.monotonic() - started < 2
+    assert sorted(aborted) == ["exec_dev", "exec_staging"]
+    assert results["production"] == dict(
+        results["production"], execution_status="skipped", error="Workflow cancelled"
+    )